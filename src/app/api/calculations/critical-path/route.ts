@@ -1,5 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server'
+import { format, isValid } from 'date-fns'
 import { ScopeItem } from '@/types/rehab'
+import { WorkingCalendar, parseIsoDate, parseIsoDates } from '@/lib/timeline/calendar'
 
 interface TaskTiming {
   taskId: string
@@ -11,12 +13,14 @@ interface TaskTiming {
   slack: number
   isCritical: boolean
   duration: number
+  startDate?: string
+  finishDate?: string
 }
 
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json()
-    const { scopeItems } = body
+    const { scopeItems, projectStartDate, holidayDates } = body
 
     if (!scopeItems || !Array.isArray(scopeItems)) {
       return NextResponse.json(
@@ -25,6 +29,26 @@ export async function POST(request: NextRequest) {
       )
     }
 
+    // Optional calendar dates for day numbers (day 1 = first working day)
+    const projectStart = projectStartDate ? parseIsoDate(projectStartDate) : null
+    if (projectStart && !isValid(projectStart)) {
+      return NextResponse.json(
+        { error: 'Invalid project start date provided' },
+        { status: 400 }
+      )
+    }
+
+    const holidays = holidayDates === undefined ? [] : parseIsoDates(holidayDates)
+    if (!holidays) {
+      return NextResponse.json(
+        { error: 'Holiday dates must be an array of ISO date strings' },
+        { status: 400 }
+      )
+    }
+    const calendar = WorkingCalendar.forHolidays(holidays)
+    const dayToDate = (day: number) =>
+      projectStart ? format(calendar.dateForWorkingDay(projectStart, day), 'yyyy-MM-dd') : undefined
+
     const includedItems: ScopeItem[] = scopeItems.filter((item: ScopeItem) => item.included)
 
     if (includedItems.length === 0) {
@@ -151,7 +175,9 @@ export async function POST(request: NextRequest) {
         latestFinish: lf,
         slack,
         isCritical: slack === 0,
-        duration: item.daysRequired
+        duration: item.daysRequired,
+        startDate: dayToDate(es),
+        finishDate: dayToDate(ef)
       }
     })
 
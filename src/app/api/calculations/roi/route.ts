@@ -1,4 +1,26 @@
 import { NextRequest, NextResponse } from 'next/server'
+import {
+  simulateDealRisk,
+  validateRiskDistributions,
+  validateSimulationPercentiles
+} from '@/lib/financing/risk-simulation'
+import type { RiskDealModel, RiskDistributions } from '@/lib/financing/types'
+
+// Requests simulate in-process (no worker threads in route handlers), so keep
+// runs to a few hundred milliseconds; larger runs belong in background jobs
+const MAX_DRAWS_PER_REQUEST = 250_000
+
+// Options for the opt-in risk simulation (body.mode === 'simulation')
+interface SimulationRequest {
+  draws?: number
+  seed?: number
+  holdPeriodMonths?: number
+  loanAmount?: number
+  interestRate?: number
+  loanTermMonths?: number
+  distributions?: Partial<RiskDistributions>
+  percentiles?: number[]
+}
 
 export async function POST(request: NextRequest) {
   try {
@@ -10,7 +32,9 @@ export async function POST(request: NextRequest) {
       holdingCosts = 0,
       closingCosts = 0,
       sellingCosts = 0,
-      investmentStrategy = 'flip'
+      investmentStrategy = 'flip',
+      mode = 'standard',
+      simulation: simulationRequest = {}
     } = body
 
     if (!purchasePrice || !rehabCost || !arv) {
@@ -87,6 +111,33 @@ export async function POST(request: NextRequest) {
       })
     }
 
+    if (mode === 'simulation') {
+      const invalid =
+        validateDealInputs({ purchasePrice, rehabCost, arv, holdingCosts, closingCosts, sellingCosts }) ??
+        validateSimulationRequest(simulationRequest)
+      if (invalid) {
+        return NextResponse.json({ error: invalid }, { status: 400 })
+      }
+
+      const { draws, seed, distributions, percentiles }: SimulationRequest = simulationRequest
+      const simulation = simulateDealRisk(
+        toRiskModel(simulationRequest, {
+          purchasePrice,
+          rehabCost,
+          arv,
+          holdingCosts,
+          closingCosts,
+          sellingCosts: calculatedSellingCosts
+        }),
+        { draws, seed, distributions, percentiles }
+      )
+
+      return NextResponse.json({
+        success: true,
+        data: { ...roiAnalysis, simulation }
+      })
+    }
+
     return NextResponse.json({
       success: true,
       data: roiAnalysis
@@ -100,3 +151,94 @@ export async function POST(request: NextRequest) {
   }
 }
 
+function isNumberInRange(value: unknown, min: number, max: number): boolean {
+  return typeof value === 'number' && Number.isFinite(value) && value >= min && value <= max
+}
+
+// The simulation needs every deal input as a finite number (the standard
+// calculation above tolerates missing optional costs)
+function validateDealInputs(deal: Record<string, unknown>): string | null {
+  for (const field of ['purchasePrice', 'rehabCost', 'arv']) {
+    if (!isNumberInRange(deal[field], Number.MIN_VALUE, Number.MAX_SAFE_INTEGER)) {
+      return `${field} must be a positive number`
+    }
+  }
+  for (const field of ['holdingCosts', 'closingCosts', 'sellingCosts']) {
+    if (!isNumberInRange(deal[field], 0, Number.MAX_SAFE_INTEGER)) {
+      return `${field} must be a non-negative number`
+    }
+  }
+  return null
+}
+
+// Validate the untrusted simulation options; returns an error message or null
+function validateSimulationRequest(value: unknown): string | null {
+  if (!value || typeof value !== 'object' || Array.isArray(value)) {
+    return 'simulation must be an object'
+  }
+  const request = value as Record<string, unknown>
+
+  const { draws, loanTermMonths } = request
+  if (draws !== undefined && !(Number.isInteger(draws) && isNumberInRange(draws, 1, MAX_DRAWS_PER_REQUEST))) {
+    return `simulation.draws must be an integer between 1 and ${MAX_DRAWS_PER_REQUEST}`
+  }
+  if (request.seed !== undefined && !Number.isInteger(request.seed)) {
+    return 'simulation.seed must be an integer'
+  }
+  if (request.holdPeriodMonths !== undefined && !isNumberInRange(request.holdPeriodMonths, 1, 120)) {
+    return 'simulation.holdPeriodMonths must be between 1 and 120'
+  }
+  if (request.loanAmount !== undefined && !isNumberInRange(request.loanAmount, 0, Number.MAX_SAFE_INTEGER)) {
+    return 'simulation.loanAmount must be a non-negative number'
+  }
+  if (request.interestRate !== undefined && !isNumberInRange(request.interestRate, 0, 100)) {
+    return 'simulation.interestRate must be between 0 and 100'
+  }
+  if (loanTermMonths !== undefined && !(Number.isInteger(loanTermMonths) && isNumberInRange(loanTermMonths, 1, 600))) {
+    return 'simulation.loanTermMonths must be an integer between 1 and 600'
+  }
+  if (request.distributions !== undefined) {
+    const error = validateRiskDistributions(request.distributions)
+    if (error) return `simulation.distributions: ${error}`
+  }
+  if (request.percentiles !== undefined) {
+    const error = validateSimulationPercentiles(request.percentiles)
+    if (error) return `simulation.percentiles ${error}`
+  }
+  return null
+}
+
+// Deal model whose base case reproduces the figures above; the lump-sum
+// holding costs are spread over the holding period so longer holds cost more
+function toRiskModel(
+  request: SimulationRequest,
+  deal: {
+    purchasePrice: number
+    rehabCost: number
+    arv: number
+    holdingCosts: number
+    closingCosts: number
+    sellingCosts: number
+  }
+): RiskDealModel {
+  const holdMonths = Math.max(1, request.holdPeriodMonths ?? 6)
+  const loanAmount = request.loanAmount ?? 0
+
+  return {
+    purchasePrice: deal.purchasePrice,
+    arv: deal.arv,
+    rehabCost: deal.rehabCost,
+    holdMonths,
+    loanAmount,
+    interestRate: request.interestRate ?? 0,
+    loanTermMonths: request.loanTermMonths ?? 360,
+    loanPayment: loanAmount > 0 ? 'amortized' : 'none',
+    upfrontCosts: deal.closingCosts,
+    monthlyCarry: deal.holdingCosts / holdMonths,
+    monthlyIncome: 0,
+    saleShare: 1,
+    sellingCostsRate: deal.sellingCosts / deal.arv,
+    investmentBasis: 'all_in',
+    cashInvested: 0
+  }
+}
@@ -1,10 +1,12 @@
 import { NextRequest, NextResponse } from 'next/server'
+import { format, isValid } from 'date-fns'
 import { ScopeItem, ActionPlanPhase, ActionTask } from '@/types/rehab'
+import { WorkingCalendar, parseIsoDate, parseIsoDates } from '@/lib/timeline/calendar'
 
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json()
-    const { scopeItems } = body
+    const { scopeItems, projectStartDate, holidayDates } = body
 
     if (!scopeItems || !Array.isArray(scopeItems)) {
       return NextResponse.json(
@@ -13,7 +15,28 @@ export async function POST(request: NextRequest) {
       )
     }
 
+    // Optional calendar dates for day numbers (day 1 = first working day)
+    const projectStart = projectStartDate ? parseIsoDate(projectStartDate) : null
+    if (projectStart && !isValid(projectStart)) {
+      return NextResponse.json(
+        { error: 'Invalid project start date provided' },
+        { status: 400 }
+      )
+    }
+
+    const holidays = holidayDates === undefined ? [] : parseIsoDates(holidayDates)
+    if (!holidays) {
+      return NextResponse.json(
+        { error: 'Holiday dates must be an array of ISO date strings' },
+        { status: 400 }
+      )
+    }
+    const calendar = WorkingCalendar.forHolidays(holidays)
+    const dayToDate = (day: number) =>
+      projectStart ? format(calendar.dateForWorkingDay(projectStart, day), 'yyyy-MM-dd') : undefined
+
     const includedItems: ScopeItem[] = scopeItems.filter((item: ScopeItem) => item.included)
+    const itemsById = new Map(includedItems.map(item => [item.id, item]))
 
     if (includedItems.length === 0) {
       return NextResponse.json({
@@ -54,7 +77,7 @@ export async function POST(request: NextRequest) {
       if (item.dependsOn.length > 0) {
         // Find the latest end time of all dependencies
         item.dependsOn.forEach(depId => {
-          const dep = includedItems.find(i => i.id === depId)
+          const dep = itemsById.get(depId)
           if (dep) {
             const depTiming = calculateTaskTiming(dep)
             earliestStart = Math.max(earliestStart, depTiming.end + 1)
@@ -115,7 +138,7 @@ export async function POST(request: NextRequest) {
     const totalDays = Math.max(...Array.from(taskDays.values()).map(t => t.end), 0)
 
     // Calculate critical path
-    const criticalPath = calculateCriticalPathTasks(includedItems, taskDays)
+    const criticalPath = calculateCriticalPathTasks(itemsById, taskDays)
 
     // Mark phases on critical path
     phases.forEach(phase => {
@@ -162,7 +185,9 @@ export async function POST(request: NextRequest) {
         warnings,
         taskTimeline: Array.from(taskDays.entries()).map(([id, timing]) => ({
           taskId: id,
-          ...timing
+          ...timing,
+          startDate: dayToDate(timing.start),
+          endDate: dayToDate(timing.end)
         }))
       }
     })
@@ -192,7 +217,7 @@ function determineContractor(item: ScopeItem): string {
 
 // Calculate critical path tasks
 function calculateCriticalPathTasks(
-  items: ScopeItem[],
+  itemsById: Map<string, ScopeItem>,
   taskDays: Map<string, { start: number; end: number }>
 ): string[] {
   const criticalPath: string[] = []
@@ -201,7 +226,7 @@ function calculateCriticalPathTasks(
   let lastTask: ScopeItem | null = null
   let latestEnd = 0
   
-  items.forEach(item => {
+  itemsById.forEach(item => {
     const timing = taskDays.get(item.id)
     if (timing && timing.end > latestEnd) {
       latestEnd = timing.end
@@ -221,7 +246,7 @@ function calculateCriticalPathTasks(
       let latestDepEnd = 0
       
       item.dependsOn.forEach(depId => {
-        const dep = items.find(i => i.id === depId)
+        const dep = itemsById.get(depId)
         if (dep) {
           const timing = taskDays.get(dep.id)
           if (timing && timing.end > latestDepEnd) {
@@ -6,7 +6,7 @@ import { useProjectData } from "@/lib/scheduler/use-project-data";
 import { Filters, useFilteredTasks } from "@/components/scheduler/filters";
 import { Avatar } from "@/components/scheduler/primitives";
 import { TASK_STATUS_META, TRADE_META, type Person, type Task } from "@/lib/scheduler/types";
-import { daysBetween, durationDays, toDate, TODAY } from "@/lib/scheduler/dates";
+import { daysBetween, durationDays, isWorkingDay, toDate, TODAY } from "@/lib/scheduler/dates";
 import { cn } from "@/lib/utils";
 
 const DAY_W = 30; // px per day
@@ -68,7 +68,7 @@ export function TimelineView({ projectId }: { projectId: string }) {
                 {days.map((day, i) => {
                   const isMonthStart = day.getDate() === 1 || i === 0;
                   const isToday = format(day, "yyyy-MM-dd") === TODAY;
-                  const weekend = day.getDay() === 0 || day.getDay() === 6;
+                  const weekend = !isWorkingDay(day);
                   return (
                     <div
                       key={i}
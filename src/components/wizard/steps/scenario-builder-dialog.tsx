@@ -99,6 +99,8 @@ const scenarioBuilderSchema = z.object({
 
 type ScenarioBuilderFormData = z.infer<typeof scenarioBuilderSchema>;
 
+const BUDGET_STEP = 1000;
+
 // =============================================================================
 // LIVE PREVIEW COMPONENT
 // =============================================================================
@@ -106,12 +108,14 @@ type ScenarioBuilderFormData = z.infer<typeof scenarioBuilderSchema>;
 function LivePreview({ 
   items, 
   budget, 
+  budgetStops,
   strategy, 
   customItemIds,
   isGenerating 
 }: {
   items: OptimizableItem[];
   budget: number;
+  budgetStops: number[];
   strategy: ScenarioStrategy;
   customItemIds?: string[];
   isGenerating: boolean;
@@ -119,6 +123,14 @@ function LivePreview({
   const [preview, setPreview] = useState<ScenarioResult | null>(null);
   const [error, setError] = useState<string | null>(null);
 
+  // One batch per strategy covers every slider stop, so dragging is a lookup
+  const frontier = useMemo(() => {
+    if (strategy === SCENARIO_STRATEGIES.CUSTOM || items.length === 0 || budgetStops.length === 0) {
+      return null;
+    }
+    return ScenarioEngine.generateScenarioBatch({ items, budgets: budgetStops, strategies: [strategy] });
+  }, [items, strategy, budgetStops]);
+
   // Generate preview when parameters change
   useEffect(() => {
     if (budget < 1000 || items.length === 0) {
@@ -129,13 +141,14 @@ function LivePreview({
     const generatePreview = async () => {
       try {
         setError(null);
-        const result = ScenarioEngine.generateScenario({
-          budgetAmount: budget,
-          strategy,
-          items,
-          customItemIds,
-          respectDependencies: true
-        });
+        const result = frontier?.scenarios[strategy]?.[budgetStops.indexOf(budget)] ??
+          ScenarioEngine.generateScenario({
+            budgetAmount: budget,
+            strategy,
+            items,
+            customItemIds,
+            respectDependencies: true
+          });
         setPreview(result);
       } catch (err) {
         setError(err instanceof Error ? err.message : 'Failed to generate preview');
@@ -145,7 +158,7 @@ function LivePreview({
 
     const debounceTimeout = setTimeout(generatePreview, 300);
     return () => clearTimeout(debounceTimeout);
-  }, [budget, strategy, customItemIds, items]);
+  }, [budget, budgetStops, frontier, strategy, customItemIds, items]);
 
   if (isGenerating) {
     return (
@@ -398,6 +411,14 @@ export function ScenarioBuilderDialog({
   // Calculate budget range
   const minBudget = Math.min(1000, currentBudget * 0.5);
   const maxBudget = currentBudget * 2;
+
+  const budgetStops = useMemo(() => {
+    const stops: number[] = [];
+    for (let stop = minBudget; stop <= maxBudget; stop += BUDGET_STEP) {
+      stops.push(stop);
+    }
+    return stops;
+  }, [minBudget, maxBudget]);
   
   const form = useForm<ScenarioBuilderFormData>({
     resolver: zodResolver(scenarioBuilderSchema),
@@ -537,7 +558,7 @@ export function ScenarioBuilderDialog({
                             onValueChange={(value) => field.onChange(value[0])}
                             max={maxBudget}
                             min={minBudget}
-                            step={1000}
+                            step={BUDGET_STEP}
                             className="w-full"
                           />
                           <div className="flex justify-between text-xs text-muted-foreground">
@@ -612,6 +633,7 @@ export function ScenarioBuilderDialog({
                 <LivePreview
                   items={items}
                   budget={watchedValues.budgetAmount}
+                  budgetStops={budgetStops}
                   strategy={watchedValues.priorityStrategy}
                   customItemIds={watchedValues.customItemIds}
                   isGenerating={isGenerating}
@@ -456,16 +456,15 @@ export const useScenarioStore = create<ScenarioStore>()(
 
         getDetailedComparison: (scenarioIds: string[], items: OptimizableItem[]): ScenarioItemComparison[] => {
           const scenarios = get().scenarios.filter(s => scenarioIds.includes(s.id));
+          const selectedSets = scenarios.map(s => new Set(s.selectedItemIds));
           const itemComparisons: ScenarioItemComparison[] = [];
 
           for (const item of items) {
-            const includedIn = scenarios
-              .filter(s => s.selectedItemIds.includes(item.id))
-              .map(s => s.id);
-            
-            const excludedFrom = scenarios
-              .filter(s => !s.selectedItemIds.includes(item.id))
-              .map(s => s.id);
+            const includedIn: string[] = [];
+            const excludedFrom: string[] = [];
+            scenarios.forEach((s, index) => {
+              (selectedSets[index].has(item.id) ? includedIn : excludedFrom).push(s.id);
+            });
 
             // Calculate impact level based on cost and value
             let impact: 'high' | 'medium' | 'low' = 'low';
@@ -1,12 +1,16 @@
 /**
- * Server-side caching utilities using Next.js unstable_cache
+ * Server-side caching utilities backed by the shared tiered cache
  * 
  * Provides cached versions of expensive database queries and API calls.
- * Cache is automatically invalidated based on TTL or can be manually revalidated.
+ * Entries live in a bounded per-process LRU in front of Redis (shared by every
+ * Next instance and worker), concurrent misses share one load, and entries are
+ * served briefly past their TTL while they refresh. Caches expire on TTL or
+ * can be invalidated by tag with the helpers below.
  */
 
-import { unstable_cache } from 'next/cache'
+import { revalidateTag } from 'next/cache'
 import { createClient } from '@/lib/supabase/server'
+import { getSharedCache, withSharedCache } from '@/lib/tiered-cache'
 
 // ============================================================================
 // CACHE CONFIGURATION
@@ -33,6 +37,9 @@ export const CACHE_TTL = {
   AI_RESPONSES: 86400, // 24 hours
 } as const
 
+/** Extra seconds an expired entry is served while it refreshes in the background */
+const STALE_WHILE_REVALIDATE = 60
+
 // ============================================================================
 // MATERIAL PRICES CACHE
 // ============================================================================
@@ -41,7 +48,7 @@ export const CACHE_TTL = {
  * Get cached material prices for a region
  * Falls back to 'national' if no region-specific prices exist
  */
-export const getCachedMaterialPrices = unstable_cache(
+export const getCachedMaterialPrices = withSharedCache(
   async (region: string = 'national') => {
     const supabase = await createClient()
     
@@ -58,9 +65,10 @@ export const getCachedMaterialPrices = unstable_cache(
     
     return data
   },
-  ['material-prices'],
-  { 
-    revalidate: CACHE_TTL.MATERIAL_PRICES,
+  {
+    namespace: 'material-prices',
+    ttlSeconds: CACHE_TTL.MATERIAL_PRICES,
+    staleSeconds: STALE_WHILE_REVALIDATE,
     tags: ['material-prices'],
   }
 )
@@ -72,7 +80,7 @@ export const getCachedMaterialPrices = unstable_cache(
 /**
  * Get cached labor rates by trade type
  */
-export const getCachedLaborRates = unstable_cache(
+export const getCachedLaborRates = withSharedCache(
   async (region: string = 'national') => {
     const supabase = await createClient()
     
@@ -89,9 +97,10 @@ export const getCachedLaborRates = unstable_cache(
     
     return data
   },
-  ['labor-rates'],
-  { 
-    revalidate: CACHE_TTL.LABOR_RATES,
+  {
+    namespace: 'labor-rates',
+    ttlSeconds: CACHE_TTL.LABOR_RATES,
+    staleSeconds: STALE_WHILE_REVALIDATE,
     tags: ['labor-rates'],
   }
 )
@@ -103,7 +112,7 @@ export const getCachedLaborRates = unstable_cache(
 /**
  * Get cached scope catalog items by category
  */
-export const getCachedScopeCatalog = unstable_cache(
+export const getCachedScopeCatalog = withSharedCache(
   async (category?: string) => {
     const supabase = await createClient()
     
@@ -127,9 +136,10 @@ export const getCachedScopeCatalog = unstable_cache(
     
     return data
   },
-  ['scope-catalog'],
-  { 
-    revalidate: CACHE_TTL.SCOPE_CATALOG,
+  {
+    namespace: 'scope-catalog',
+    ttlSeconds: CACHE_TTL.SCOPE_CATALOG,
+    staleSeconds: STALE_WHILE_REVALIDATE,
     tags: ['scope-catalog'],
   }
 )
@@ -141,7 +151,7 @@ export const getCachedScopeCatalog = unstable_cache(
 /**
  * Get cached vendor directory with ratings
  */
-export const getCachedVendorDirectory = unstable_cache(
+export const getCachedVendorDirectory = withSharedCache(
   async (tradeType?: string) => {
     const supabase = await createClient()
     
@@ -174,9 +184,10 @@ export const getCachedVendorDirectory = unstable_cache(
     
     return data
   },
-  ['vendor-directory'],
-  { 
-    revalidate: CACHE_TTL.VENDORS,
+  {
+    namespace: 'vendor-directory',
+    ttlSeconds: CACHE_TTL.VENDORS,
+    staleSeconds: STALE_WHILE_REVALIDATE,
     tags: ['vendors'],
   }
 )
@@ -189,140 +200,145 @@ export const getCachedVendorDirectory = unstable_cache(
  * Get cached project statistics
  * Uses project ID as part of cache key for per-project caching
  */
-export const getCachedProjectStats = (projectId: string) => 
-  unstable_cache(
-    async () => {
-      const supabase = await createClient()
-      
-      // Get project with aggregated stats
-      const { data, error } = await supabase
-        .from('rehab_projects')
-        .select(`
-          id,
-          project_name,
-          phase,
-          tasks_total,
-          tasks_completed,
-          total_estimated_cost,
-          total_actual_cost,
-          max_budget,
-          days_ahead_behind
-        `)
-        .eq('id', projectId)
-        .single()
-      
-      if (error) {
-        console.error('Error fetching project stats:', error)
-        return null
-      }
-      
-      return {
-        ...data,
-        completion_percentage: data.tasks_total > 0 
-          ? Math.round((data.tasks_completed / data.tasks_total) * 100) 
-          : 0,
-        budget_remaining: data.max_budget 
-          ? data.max_budget - (data.total_actual_cost || 0)
-          : null,
-        budget_variance: data.total_estimated_cost && data.total_actual_cost
-          ? data.total_actual_cost - data.total_estimated_cost
-          : null,
-      }
-    },
-    [`project-stats-${projectId}`],
-    { 
-      revalidate: CACHE_TTL.PROJECT_STATS,
-      tags: [`project-${projectId}`, 'project-stats'],
+export const getCachedProjectStats = withSharedCache(
+  async (projectId: string) => {
+    const supabase = await createClient()
+    
+    // Get project with aggregated stats
+    const { data, error } = await supabase
+      .from('rehab_projects')
+      .select(`
+        id,
+        project_name,
+        phase,
+        tasks_total,
+        tasks_completed,
+        total_estimated_cost,
+        total_actual_cost,
+        max_budget,
+        days_ahead_behind
+      `)
+      .eq('id', projectId)
+      .single()
+    
+    if (error) {
+      console.error('Error fetching project stats:', error)
+      return null
     }
-  )()
+    
+    return {
+      ...data,
+      completion_percentage: data.tasks_total > 0 
+        ? Math.round((data.tasks_completed / data.tasks_total) * 100) 
+        : 0,
+      budget_remaining: data.max_budget 
+        ? data.max_budget - (data.total_actual_cost || 0)
+        : null,
+      budget_variance: data.total_estimated_cost && data.total_actual_cost
+        ? data.total_actual_cost - data.total_estimated_cost
+        : null,
+    }
+  },
+  {
+    namespace: 'project-stats',
+    ttlSeconds: CACHE_TTL.PROJECT_STATS,
+    staleSeconds: STALE_WHILE_REVALIDATE,
+    tags: (projectId) => [`project-${projectId}`, 'project-stats'],
+  }
+)
 
 // ============================================================================
 // AI RESPONSE CACHE
 // ============================================================================
 
-/**
- * Cache key generator for AI responses
- * Creates a deterministic key from prompt + context
- */
-function generateAICacheKey(prompt: string, context: Record<string, unknown>): string {
-  const contextStr = JSON.stringify(context, Object.keys(context).sort())
-  return `ai-${Buffer.from(prompt + contextStr).toString('base64').slice(0, 32)}`
-}
-
 /**
  * Get cached AI response or generate new one
- * Useful for common prompts like cost estimates, scope suggestions
+ * Useful for common prompts like cost estimates, scope suggestions.
+ * The cache key is a hash of the full prompt and context (with sorted keys),
+ * so prompts that share a prefix no longer collide.
  */
 export const getCachedAIResponse = (
   prompt: string, 
   context: Record<string, unknown>,
   generator: () => Promise<string>
 ) => 
-  unstable_cache(
-    generator,
-    [generateAICacheKey(prompt, context)],
-    { 
-      revalidate: CACHE_TTL.AI_RESPONSES,
-      tags: ['ai-responses'],
-    }
-  )()
+  getSharedCache().getOrLoad([prompt, context], generator, {
+    namespace: 'ai-responses',
+    ttlSeconds: CACHE_TTL.AI_RESPONSES,
+    tags: ['ai-responses'],
+  })
 
 // ============================================================================
 // CACHE INVALIDATION HELPERS
 // ============================================================================
 
-import { revalidateTag } from 'next/cache'
+/**
+ * Invalidate tags in the shared cache (every instance) and Next's data cache
+ */
+async function invalidateTags(tags: string[]) {
+  tags.forEach((tag) => revalidateTag(tag))
+  await getSharedCache().invalidateTags(tags)
+}
 
 /**
  * Invalidate all caches for a specific project
  */
 export function invalidateProjectCache(projectId: string) {
-  revalidateTag(`project-${projectId}`)
+  return invalidateTags([`project-${projectId}`])
 }
 
 /**
  * Invalidate material prices cache (e.g., after admin update)
  */
 export function invalidateMaterialPricesCache() {
-  revalidateTag('material-prices')
+  return invalidateTags(['material-prices'])
 }
 
 /**
  * Invalidate labor rates cache
  */
 export function invalidateLaborRatesCache() {
-  revalidateTag('labor-rates')
+  return invalidateTags(['labor-rates'])
 }
 
 /**
  * Invalidate scope catalog cache
  */
 export function invalidateScopeCatalogCache() {
-  revalidateTag('scope-catalog')
+  return invalidateTags(['scope-catalog'])
 }
 
 /**
  * Invalidate vendor directory cache
  */
 export function invalidateVendorCache() {
-  revalidateTag('vendors')
+  return invalidateTags(['vendors'])
 }
 
 /**
  * Invalidate all AI response caches
  */
 export function invalidateAICache() {
-  revalidateTag('ai-responses')
+  return invalidateTags(['ai-responses'])
 }
 
 /**
  * Invalidate all caches (nuclear option)
  */
 export function invalidateAllCaches() {
-  revalidateTag('material-prices')
-  revalidateTag('labor-rates')
-  revalidateTag('scope-catalog')
-  revalidateTag('vendors')
-  revalidateTag('project-stats')
-  revalidateTag('ai-responses')
+  return invalidateTags([
+    'material-prices',
+    'labor-rates',
+    'scope-catalog',
+    'vendors',
+    'project-stats',
+    'ai-responses',
+  ])
+}
+
+/**
+ * Hit/miss/latency counters for each cache namespace in this process
+ */
+export function getCacheStats() {
+  return getSharedCache().stats()
 }
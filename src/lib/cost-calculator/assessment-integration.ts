@@ -5,6 +5,9 @@ import {
   getCostItemsByCategory, 
   getCostItemsBySubcategory 
 } from './index'
+import { CostBatchLine, CostCalculationResult } from './types'
+
+type ItemEstimator = (line: CostBatchLine) => CostCalculationResult
 
 /**
  * Assessment to Scope Generation Service
@@ -22,12 +25,15 @@ export class AssessmentScopeGenerator {
   ): ScopeItem[] {
     const scopeItems: ScopeItem[] = []
     
+    // Resolve location and quality multipliers once for every generated item
+    const estimate = CostCalculationEngine.createEstimator(location, qualityTier)
+    
     // Process each room assessment
     Object.entries(assessments).forEach(([roomId, assessment]) => {
       if (!assessment.condition) return // Skip unassessed rooms
       
       // Generate items based on overall room condition
-      const roomItems = this.generateItemsForRoom(roomId, assessment, location, qualityTier)
+      const roomItems = this.generateItemsForRoom(roomId, assessment, estimate)
       scopeItems.push(...roomItems)
       
       // Generate items based on specific component conditions
@@ -36,8 +42,7 @@ export class AssessmentScopeGenerator {
           roomId, 
           assessment.components, 
           assessment.condition,
-          location, 
-          qualityTier
+          estimate
         )
         scopeItems.push(...componentItems)
       }
@@ -53,8 +58,7 @@ export class AssessmentScopeGenerator {
   private static generateItemsForRoom(
     roomId: string,
     assessment: any,
-    location: { zipCode: string; state: string },
-    qualityTier: 'budget' | 'standard' | 'premium' | 'luxury'
+    estimate: ItemEstimator
   ): ScopeItem[] {
     const items: ScopeItem[] = []
     const condition = assessment.condition
@@ -71,11 +75,9 @@ export class AssessmentScopeGenerator {
         const priority = rule.priority
         
         // Calculate costs using our engine
-        const costResult = CostCalculationEngine.calculateItemCost({
+        const costResult = estimate({
           item: costItem,
           quantity,
-          qualityTier,
-          location,
           projectConditions: {
             urgency: this.mapConditionToUrgency(condition),
             complexity: rule.complexity || 'moderate',
@@ -119,8 +121,7 @@ export class AssessmentScopeGenerator {
     roomId: string,
     components: Record<string, any>,
     roomCondition: string,
-    location: { zipCode: string; state: string },
-    qualityTier: 'budget' | 'standard' | 'premium' | 'luxury'
+    estimate: ItemEstimator
   ): ScopeItem[] {
     const items: ScopeItem[] = []
     const roomName = this.getRoomDisplayName(roomId)
@@ -137,11 +138,9 @@ export class AssessmentScopeGenerator {
         const quantity = this.getComponentQuantity(componentId, roomId)
         
         // Calculate costs
-        const costResult = CostCalculationEngine.calculateItemCost({
+        const costResult = estimate({
           item: costItem,
           quantity,
-          qualityTier,
-          location,
           projectConditions: {
             urgency: action === 'replace' ? 'high' : 'medium',
             complexity: this.getComponentComplexity(componentId),
@@ -301,9 +300,12 @@ export class AssessmentScopeGenerator {
     const allMatches = searchTerms.flatMap(term => searchCostItems(term))
     
     // Remove duplicates and return top matches
-    const uniqueMatches = allMatches.filter((item, index, self) => 
-      index === self.findIndex(i => i.id === item.id)
-    )
+    const seenIds = new Set<string>()
+    const uniqueMatches = allMatches.filter(item => {
+      if (seenIds.has(item.id)) return false
+      seenIds.add(item.id)
+      return true
+    })
     
     return uniqueMatches.slice(0, 2) // Return top 2 matches per search
   }
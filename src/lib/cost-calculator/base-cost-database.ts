@@ -404,39 +404,149 @@ export const BASE_COST_DATABASE: BaseCostItem[] = [
   }
 ]
 
+// =============================================================================
+// CATALOG INDEX
+// =============================================================================
+
+// The catalog is static, so it is indexed once at module load
+interface CostCatalogIndex {
+  byId: Map<string, BaseCostItem>
+  byCategory: Map<string, BaseCostItem[]>
+  /** Keyed by `${category}/${subcategory}` */
+  bySubcategory: Map<string, BaseCostItem[]>
+  subcategoriesByCategory: Map<string, string[]>
+  categories: string[]
+  /** Lowercased searchable fields per item, in catalog order */
+  searchFields: string[][]
+  /** Alphanumeric token -> ascending item indexes */
+  postings: Map<string, number[]>
+}
+
+// Search results are reused for repeated terms (assessment rules repeat a lot)
+const MAX_CACHED_SEARCHES = 500
+
+const TOKEN_SPLIT = /[^a-z0-9]+/
+
+function buildCatalogIndex(items: BaseCostItem[]): CostCatalogIndex {
+  const index: CostCatalogIndex = {
+    byId: new Map(),
+    byCategory: new Map(),
+    bySubcategory: new Map(),
+    subcategoriesByCategory: new Map(),
+    categories: [],
+    searchFields: [],
+    postings: new Map()
+  }
+
+  items.forEach((item, position) => {
+    // First entry wins, as with a linear find
+    if (!index.byId.has(item.id)) index.byId.set(item.id, item)
+
+    let categoryItems = index.byCategory.get(item.category)
+    if (!categoryItems) {
+      categoryItems = []
+      index.byCategory.set(item.category, categoryItems)
+      index.categories.push(item.category)
+      index.subcategoriesByCategory.set(item.category, [])
+    }
+    categoryItems.push(item)
+
+    const subcategoryKey = `${item.category}/${item.subcategory}`
+    let subcategoryItems = index.bySubcategory.get(subcategoryKey)
+    if (!subcategoryItems) {
+      subcategoryItems = []
+      index.bySubcategory.set(subcategoryKey, subcategoryItems)
+      index.subcategoriesByCategory.get(item.category)!.push(item.subcategory)
+    }
+    subcategoryItems.push(item)
+
+    const fields = [item.itemName, item.description, item.category, item.subcategory]
+      .filter((field): field is string => !!field)
+      .map(field => field.toLowerCase())
+    index.searchFields.push(fields)
+
+    for (const field of fields) {
+      for (const token of field.split(TOKEN_SPLIT)) {
+        if (!token) continue
+        const posting = index.postings.get(token)
+        if (!posting) index.postings.set(token, [position])
+        else if (posting[posting.length - 1] !== position) posting.push(position)
+      }
+    }
+  })
+
+  return index
+}
+
+const catalogIndex = buildCatalogIndex(BASE_COST_DATABASE)
+const searchCache = new Map<string, BaseCostItem[]>()
+const tokenMatchCache = new Map<string, number[]>()
+
+function rememberBounded<T>(cache: Map<string, T>, key: string, value: T) {
+  if (cache.size >= MAX_CACHED_SEARCHES) {
+    const oldest = cache.keys().next().value
+    if (oldest !== undefined) cache.delete(oldest)
+  }
+  cache.set(key, value)
+}
+
+/**
+ * Item indexes with a token containing `fragment`. Any item whose field
+ * contains the search term has a token containing each of the term's
+ * alphanumeric runs, so this never drops a match.
+ */
+function itemsWithTokenContaining(fragment: string): number[] {
+  let positions = tokenMatchCache.get(fragment)
+  if (!positions) {
+    const matched = new Set<number>()
+    catalogIndex.postings.forEach((posting, token) => {
+      if (token.includes(fragment)) posting.forEach(position => matched.add(position))
+    })
+    positions = [...matched].sort((a, b) => a - b)
+    rememberBounded(tokenMatchCache, fragment, positions)
+  }
+  return positions
+}
+
 // Helper functions for querying the database
 export function getCostItemsByCategory(category: string): BaseCostItem[] {
-  return BASE_COST_DATABASE.filter(item => item.category === category)
+  return [...(catalogIndex.byCategory.get(category) ?? [])]
 }
 
 export function getCostItemsBySubcategory(category: string, subcategory: string): BaseCostItem[] {
-  return BASE_COST_DATABASE.filter(item => 
-    item.category === category && item.subcategory === subcategory
-  )
+  return [...(catalogIndex.bySubcategory.get(`${category}/${subcategory}`) ?? [])]
 }
 
 export function getCostItemById(id: string): BaseCostItem | undefined {
-  return BASE_COST_DATABASE.find(item => item.id === id)
+  return catalogIndex.byId.get(id)
 }
 
 export function searchCostItems(searchTerm: string): BaseCostItem[] {
   const term = searchTerm.toLowerCase()
-  return BASE_COST_DATABASE.filter(item =>
-    item.itemName.toLowerCase().includes(term) ||
-    item.description?.toLowerCase().includes(term) ||
-    item.category.toLowerCase().includes(term) ||
-    item.subcategory.toLowerCase().includes(term)
-  )
+
+  const cached = searchCache.get(term)
+  if (cached) return [...cached]
+
+  // Narrow to items sharing the term's longest alphanumeric run, then verify
+  const fragment = term
+    .split(TOKEN_SPLIT)
+    .reduce((longest, part) => (part.length > longest.length ? part : longest), '')
+  const candidates = fragment
+    ? itemsWithTokenContaining(fragment)
+    : BASE_COST_DATABASE.map((_, position) => position)
+
+  const results = candidates
+    .filter(position => catalogIndex.searchFields[position].some(field => field.includes(term)))
+    .map(position => BASE_COST_DATABASE[position])
+
+  rememberBounded(searchCache, term, results)
+  return [...results]
 }
 
 export function getAllCategories(): string[] {
-  return [...new Set(BASE_COST_DATABASE.map(item => item.category))]
+  return [...catalogIndex.categories]
 }
 
 export function getSubcategoriesByCategory(category: string): string[] {
-  return [...new Set(
-    BASE_COST_DATABASE
-      .filter(item => item.category === category)
-      .map(item => item.subcategory)
-  )]
+  return [...(catalogIndex.subcategoriesByCategory.get(category) ?? [])]
 }
@@ -1,11 +1,14 @@
 import { 
   CostCalculationInput, 
   CostCalculationResult, 
+  CostBatchLine,
+  CostBatchOptions,
+  CostBatchResult,
+  CostSummary,
   QUALITY_TIERS,
   MarketConditions 
 } from './types'
-import { getCostItemById } from './base-cost-database'
-import { getRegionalMultipliersByZip, getStateAverage } from './regional-data'
+import { resolveRegionalMultipliers } from './regional-data'
 
 /**
  * Main cost calculation engine
@@ -17,84 +20,101 @@ export class CostCalculationEngine {
    * Calculate cost for a single item with all applicable factors
    */
   static calculateItemCost(input: CostCalculationInput): CostCalculationResult {
-    const { item, quantity, qualityTier, location, projectConditions } = input
-    
-    // Get base cost breakdown
-    const baseCost = item.basePrice * quantity
-    const materialCost = baseCost * item.materialRatio
-    const laborCost = baseCost * (1 - item.materialRatio)
-    
-    // Apply regional multipliers
-    const regionalData = getRegionalMultipliersByZip(location.zipCode)
-    if (regionalData.zipCode === '00000') {
-      // Fallback to state average if zip not found
-      const stateAverage = getStateAverage(location.state)
-      regionalData.laborMultiplier = stateAverage.laborMultiplier || 1.0
-      regionalData.materialMultiplier = stateAverage.materialMultiplier || 1.0
-    }
+    return this.createEstimator(input.location, input.qualityTier)(input)
+  }
+  
+  /**
+   * Create a pricing function bound to one location and quality tier.
+   * Regional and quality multipliers are resolved once and condition
+   * multipliers are cached per combination, so pricing each line is pure
+   * arithmetic. Use this when pricing many items for the same project.
+   */
+  static createEstimator(
+    location: CostCalculationInput['location'],
+    qualityTier: CostCalculationInput['qualityTier']
+  ): (line: CostBatchLine) => CostCalculationResult {
+    // Apply regional multipliers (zip, then zip prefix, then state average)
+    const regionalData = resolveRegionalMultipliers(location).multipliers
     
     // Apply quality tier multipliers
     const qualityMultipliers = QUALITY_TIERS[qualityTier]
     
-    // Apply difficulty multiplier
-    const difficultyFactor = item.difficultyMultiplier
-    
-    // Apply project condition multipliers
-    const conditionMultipliers = this.calculateConditionMultipliers(projectConditions)
+    const conditionCache = new Map<string, ReturnType<typeof CostCalculationEngine.calculateConditionMultipliers>>()
+    const now = Date.now()
     
-    // Calculate final costs
-    const adjustedMaterialCost = materialCost * 
-      regionalData.materialMultiplier * 
-      qualityMultipliers.materials
+    return ({ item, quantity, projectConditions }) => {
+      // Get base cost breakdown
+      const baseCost = item.basePrice * quantity
+      const materialCost = baseCost * item.materialRatio
+      const laborCost = baseCost * (1 - item.materialRatio)
       
-    const adjustedLaborCost = laborCost * 
-      regionalData.laborMultiplier * 
-      qualityMultipliers.labor * 
-      difficultyFactor * 
-      conditionMultipliers.complexity * 
-      conditionMultipliers.accessibility * 
-      conditionMultipliers.urgency
-    
-    const totalCost = adjustedMaterialCost + adjustedLaborCost
-    
-    // Calculate timeline estimate
-    const baseTimelineHours = item.laborHours * quantity
-    const timelineMultiplier = qualityMultipliers.timeline * 
-      conditionMultipliers.complexity * 
-      conditionMultipliers.accessibility
-    const timelineEstimate = Math.ceil((baseTimelineHours * timelineMultiplier) / 8) // Convert to days
-    
-    // Calculate confidence level based on data quality
-    const confidenceLevel = this.calculateConfidenceLevel(item, regionalData, qualityTier)
-    
-    // Calculate cost range (±15% for standard confidence)
-    const variance = 0.15 * (1 - confidenceLevel) + 0.05 // Min 5% variance
-    const costRange = {
-      min: Math.round(totalCost * (1 - variance)),
-      max: Math.round(totalCost * (1 + variance))
-    }
-    
-    return {
-      itemId: item.id,
-      itemName: item.itemName,
-      quantity,
-      unit: item.unit,
-      baseCost,
-      materialCost: Math.round(adjustedMaterialCost),
-      laborCost: Math.round(adjustedLaborCost),
-      totalCost: Math.round(totalCost),
-      regionalMultiplier: regionalData.laborMultiplier,
-      qualityMultiplier: qualityMultipliers.materials,
-      marketAdjustment: 1.0, // TODO: Implement market conditions
-      timelineEstimate,
-      confidenceLevel,
-      costRange,
-      calculatedAt: new Date(),
-      factors: {
-        difficulty: difficultyFactor,
-        regional: regionalData.laborMultiplier,
-        market: 1.0, // TODO: Implement market conditions
-        quality: qualityMultipliers.materials
+      // Apply difficulty multiplier
+      const difficultyFactor = item.difficultyMultiplier
+      
+      // Apply project condition multipliers
+      const conditionKey = projectConditions
+        ? `${projectConditions.urgency}|${projectConditions.complexity}|${projectConditions.accessibility}`
+        : ''
+      let conditionMultipliers = conditionCache.get(conditionKey)
+      if (!conditionMultipliers) {
+        conditionMultipliers = this.calculateConditionMultipliers(projectConditions)
+        conditionCache.set(conditionKey, conditionMultipliers)
+      }
+      
+      // Calculate final costs
+      const adjustedMaterialCost = materialCost * 
+        regionalData.materialMultiplier * 
+        qualityMultipliers.materials
+        
+      const adjustedLaborCost = laborCost * 
+        regionalData.laborMultiplier * 
+        qualityMultipliers.labor * 
+        difficultyFactor * 
+        conditionMultipliers.complexity * 
+        conditionMultipliers.accessibility * 
+        conditionMultipliers.urgency
+      
+      const totalCost = adjustedMaterialCost + adjustedLaborCost
+      
+      // Calculate timeline estimate
+      const baseTimelineHours = item.laborHours * quantity
+      const timelineMultiplier = qualityMultipliers.timeline * 
+        conditionMultipliers.complexity * 
+        conditionMultipliers.accessibility
+      const timelineEstimate = Math.ceil((baseTimelineHours * timelineMultiplier) / 8) // Convert to days
+      
+      // Calculate confidence level based on data quality
+      const confidenceLevel = this.calculateConfidenceLevel(item, regionalData, qualityTier, now)
+      
+      // Calculate cost range (±15% for standard confidence)
+      const variance = 0.15 * (1 - confidenceLevel) + 0.05 // Min 5% variance
+      const costRange = {
+        min: Math.round(totalCost * (1 - variance)),
+        max: Math.round(totalCost * (1 + variance))
+      }
+      
+      return {
+        itemId: item.id,
+        itemName: item.itemName,
+        quantity,
+        unit: item.unit,
+        baseCost,
+        materialCost: Math.round(adjustedMaterialCost),
+        laborCost: Math.round(adjustedLaborCost),
+        totalCost: Math.round(totalCost),
+        regionalMultiplier: regionalData.laborMultiplier,
+        qualityMultiplier: qualityMultipliers.materials,
+        marketAdjustment: 1.0, // TODO: Implement market conditions
+        timelineEstimate,
+        confidenceLevel,
+        costRange,
+        calculatedAt: new Date(now),
+        factors: {
+          difficulty: difficultyFactor,
+          regional: regionalData.laborMultiplier,
+          market: 1.0, // TODO: Implement market conditions
+          quality: qualityMultipliers.materials
+        }
       }
     }
   }
@@ -102,32 +122,58 @@ export class CostCalculationEngine {
   /**
    * Calculate multiple items and provide project-level summary
    */
-  static calculateProjectCosts(inputs: CostCalculationInput[]): {
-    items: CostCalculationResult[]
-    summary: {
-      totalMaterialCost: number
-      totalLaborCost: number
-      totalCost: number
-      totalTimeline: number
-      averageConfidence: number
-      costRange: { min: number; max: number }
-    }
-  } {
+  static calculateProjectCosts(inputs: CostCalculationInput[]): CostBatchResult {
     const items = inputs.map(input => this.calculateItemCost(input))
+    return { items, summary: this.summarize(items) }
+  }
+  
+  /**
+   * Price a whole scope list for one location and quality tier.
+   * Same results as calling calculateItemCost per line, without re-resolving
+   * the location and multipliers for every item.
+   */
+  static calculateBatch(lines: CostBatchLine[], options: CostBatchOptions): CostBatchResult {
+    const estimate = this.createEstimator(options.location, options.qualityTier)
+    const items = lines.map(line => estimate({
+      ...line,
+      projectConditions: line.projectConditions ?? options.projectConditions
+    }))
+    return { items, summary: this.summarize(items) }
+  }
+  
+  /**
+   * Project-level totals for a set of priced items
+   */
+  private static summarize(items: CostCalculationResult[]): CostSummary {
+    let totalMaterialCost = 0
+    let totalLaborCost = 0
+    let totalCost = 0
+    let totalTimeline = -Infinity
+    let confidenceSum = 0
+    let minCost = 0
+    let maxCost = 0
     
-    const summary = {
-      totalMaterialCost: items.reduce((sum, item) => sum + item.materialCost, 0),
-      totalLaborCost: items.reduce((sum, item) => sum + item.laborCost, 0),
-      totalCost: items.reduce((sum, item) => sum + item.totalCost, 0),
-      totalTimeline: Math.max(...items.map(item => item.timelineEstimate)),
-      averageConfidence: items.reduce((sum, item) => sum + item.confidenceLevel, 0) / items.length,
+    for (const item of items) {
+      totalMaterialCost += item.materialCost
+      totalLaborCost += item.laborCost
+      totalCost += item.totalCost
+      totalTimeline = Math.max(totalTimeline, item.timelineEstimate)
+      confidenceSum += item.confidenceLevel
+      minCost += item.costRange.min
+      maxCost += item.costRange.max
+    }
+    
+    return {
+      totalMaterialCost,
+      totalLaborCost,
+      totalCost,
+      totalTimeline,
+      averageConfidence: confidenceSum / items.length,
       costRange: {
-        min: items.reduce((sum, item) => sum + item.costRange.min, 0),
-        max: items.reduce((sum, item) => sum + item.costRange.max, 0)
+        min: minCost,
+        max: maxCost
       }
     }
-    
-    return { items, summary }
   }
   
   /**
@@ -170,11 +216,11 @@ export class CostCalculationEngine {
   /**
    * Calculate confidence level based on data quality and factors
    */
-  private static calculateConfidenceLevel(item: any, regionalData: any, qualityTier: string): number {
+  private static calculateConfidenceLevel(item: any, regionalData: any, qualityTier: string, now: number = Date.now()): number {
     let confidence = 0.8 // Base confidence
     
     // Adjust based on data freshness
-    const daysSinceUpdate = Math.floor((Date.now() - item.lastUpdated.getTime()) / (1000 * 60 * 60 * 24))
+    const daysSinceUpdate = Math.floor((now - item.lastUpdated.getTime()) / (1000 * 60 * 60 * 24))
     if (daysSinceUpdate < 30) confidence += 0.1
     else if (daysSinceUpdate > 90) confidence -= 0.1
     
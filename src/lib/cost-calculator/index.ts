@@ -27,7 +27,8 @@ export {
 export {
   getRegionalMultipliersByZip,
   getRegionalMultipliersByState,
-  getStateAverage
+  getStateAverage,
+  resolveRegionalMultipliers
 } from './regional-data'
 
 export {
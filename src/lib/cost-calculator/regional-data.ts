@@ -212,13 +212,29 @@ export const DEFAULT_REGIONAL_MULTIPLIERS: RegionalMultipliers = {
   lastUpdated: new Date('2024-12-01')
 }
 
+// Lookup maps built once at module load. First entry wins, as with a linear find.
+const REGIONS_BY_ZIP = new Map<string, RegionalMultipliers>()
+const REGIONS_BY_ZIP3 = new Map<string, RegionalMultipliers>()
+const REGIONS_BY_STATE = new Map<string, RegionalMultipliers[]>()
+
+REGIONAL_MULTIPLIERS.forEach(region => {
+  if (!REGIONS_BY_ZIP.has(region.zipCode)) REGIONS_BY_ZIP.set(region.zipCode, region)
+
+  const zip3 = region.zipCode.slice(0, 3)
+  if (!REGIONS_BY_ZIP3.has(zip3)) REGIONS_BY_ZIP3.set(zip3, region)
+
+  const stateRegions = REGIONS_BY_STATE.get(region.state)
+  if (stateRegions) stateRegions.push(region)
+  else REGIONS_BY_STATE.set(region.state, [region])
+})
+
 // Helper functions
 export function getRegionalMultipliersByZip(zipCode: string): RegionalMultipliers {
-  return REGIONAL_MULTIPLIERS.find(rm => rm.zipCode === zipCode) || DEFAULT_REGIONAL_MULTIPLIERS
+  return REGIONS_BY_ZIP.get(zipCode) || DEFAULT_REGIONAL_MULTIPLIERS
 }
 
 export function getRegionalMultipliersByState(state: string): RegionalMultipliers[] {
-  return REGIONAL_MULTIPLIERS.filter(rm => rm.state === state)
+  return [...(REGIONS_BY_STATE.get(state) ?? [])]
 }
 
 export function getRegionalMultipliersByMetro(metroArea: string): RegionalMultipliers[] {
@@ -227,6 +243,47 @@ export function getRegionalMultipliersByMetro(metroArea: string): RegionalMultip
   )
 }
 
+export type RegionalMatch = 'zip' | 'zip3' | 'state'
+
+export interface ResolvedRegionalMultipliers {
+  multipliers: RegionalMultipliers
+  matchedBy: RegionalMatch
+}
+
+const stateFallbacks = new Map<string, RegionalMultipliers>()
+
+/**
+ * Resolve multipliers for a location: exact zip, then the first region
+ * sharing the 3-digit zip prefix (same sectional center), then the state
+ * average. Fallbacks are fresh objects - shared data is never mutated.
+ */
+export function resolveRegionalMultipliers(location: {
+  zipCode: string
+  state: string
+}): ResolvedRegionalMultipliers {
+  const exact = REGIONS_BY_ZIP.get(location.zipCode)
+  if (exact) return { multipliers: exact, matchedBy: 'zip' }
+
+  const zip3 = /^\d{3}/.test(location.zipCode)
+    ? REGIONS_BY_ZIP3.get(location.zipCode.slice(0, 3))
+    : undefined
+  if (zip3) return { multipliers: zip3, matchedBy: 'zip3' }
+
+  // Unknown states all share the national default
+  const stateKey = STATE_AVERAGES[location.state] ? location.state : ''
+  let fallback = stateFallbacks.get(stateKey)
+  if (!fallback) {
+    const stateAverage = getStateAverage(location.state)
+    fallback = {
+      ...DEFAULT_REGIONAL_MULTIPLIERS,
+      laborMultiplier: stateAverage.laborMultiplier || 1.0,
+      materialMultiplier: stateAverage.materialMultiplier || 1.0
+    }
+    stateFallbacks.set(stateKey, fallback)
+  }
+  return { multipliers: fallback, matchedBy: 'state' }
+}
+
 // State-level averages for fallback
 export const STATE_AVERAGES: Record<string, Partial<RegionalMultipliers>> = {
   'CA': {
@@ -1,7 +1,7 @@
 import { ScopeItem } from '@/types/rehab'
 import { CostCalculationEngine, CostUtils } from './cost-engine'
 import { getCostItemById, searchCostItems } from './base-cost-database'
-import { CostCalculationInput, CostCalculationResult } from './types'
+import { CostBatchLine, CostCalculationResult } from './types'
 
 /**
  * Integration layer between the cost calculation engine and existing scope builder
@@ -16,30 +16,36 @@ export class ScopeIntegration {
     location: { zipCode: string; state: string },
     qualityTier: 'budget' | 'standard' | 'premium' | 'luxury' = 'standard'
   ): ScopeItem[] {
+    // Try to find matching cost items in database
+    const costItems = scopeItems.map(scopeItem => this.findMatchingCostItem(scopeItem))
     
-    return scopeItems.map(scopeItem => {
-      // Try to find matching cost item in database
-      const costItem = this.findMatchingCostItem(scopeItem)
-      
-      if (!costItem) {
-        // Return original item if no cost data found
-        return scopeItem
-      }
-      
-      // Calculate cost using the cost engine
-      const input: CostCalculationInput = {
+    // Price every matched item in one batch for this location
+    const lines: CostBatchLine[] = []
+    scopeItems.forEach((scopeItem, index) => {
+      const costItem = costItems[index]
+      if (!costItem) return
+      lines.push({
         item: costItem,
         quantity: scopeItem.quantity,
-        qualityTier,
-        location,
         projectConditions: {
           urgency: scopeItem.priority === 'must' ? 'high' : 'medium',
           complexity: this.mapComplexity(scopeItem.category),
           accessibility: 'moderate' // Default, could be enhanced
         }
+      })
+    })
+    const costResults = CostCalculationEngine.calculateBatch(lines, { location, qualityTier }).items
+    
+    let resultIndex = 0
+    return scopeItems.map((scopeItem, index) => {
+      const costItem = costItems[index]
+      
+      if (!costItem) {
+        // Return original item if no cost data found
+        return scopeItem
       }
       
-      const costResult = CostCalculationEngine.calculateItemCost(input)
+      const costResult = costResults[resultIndex++]
       
       // Update scope item with calculated costs
       return {
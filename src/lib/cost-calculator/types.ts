@@ -93,6 +93,32 @@ export interface CostCalculationResult {
   }
 }
 
+/**
+ * One line of a batch priced for a single location and quality tier
+ */
+export type CostBatchLine = Pick<CostCalculationInput, 'item' | 'quantity' | 'projectConditions'>
+
+export interface CostBatchOptions {
+  location: CostCalculationInput['location']
+  qualityTier: CostCalculationInput['qualityTier']
+  /** Used for lines that don't set their own conditions */
+  projectConditions?: CostCalculationInput['projectConditions']
+}
+
+export interface CostSummary {
+  totalMaterialCost: number
+  totalLaborCost: number
+  totalCost: number
+  totalTimeline: number
+  averageConfidence: number
+  costRange: { min: number; max: number }
+}
+
+export interface CostBatchResult {
+  items: CostCalculationResult[]
+  summary: CostSummary
+}
+
 export interface CostCategory {
   id: string
   name: string
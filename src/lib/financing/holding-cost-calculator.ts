@@ -176,6 +176,9 @@ export function calculateFinancing(
 
 /**
  * Calculate principal paid over a given period
+ * 
+ * Principal payments grow geometrically, so the total after k payments is
+ * (M - P*r) * [(1+r)^k - 1] / r (no month-by-month schedule needed).
  */
 function calculatePrincipalPaid(
   principal: number,
@@ -187,18 +190,9 @@ function calculatePrincipalPaid(
   
   const monthlyPayment = calculateMonthlyPayment(principal, annualInterestRate, termMonths)
   const monthlyRate = annualInterestRate / 100 / 12
+  const payments = Math.max(0, Math.ceil(Math.min(periodMonths, termMonths)))
   
-  let balance = principal
-  let totalPrincipalPaid = 0
-  
-  for (let month = 0; month < Math.min(periodMonths, termMonths); month++) {
-    const interestPayment = balance * monthlyRate
-    const principalPayment = monthlyPayment - interestPayment
-    totalPrincipalPaid += principalPayment
-    balance -= principalPayment
-  }
-  
-  return totalPrincipalPaid
+  return (monthlyPayment - principal * monthlyRate) * (Math.pow(1 + monthlyRate, payments) - 1) / monthlyRate
 }
 
 /**
@@ -6,3 +6,4 @@
 
 export * from './types'
 export * from './holding-cost-calculator'
+export * from './risk-simulation'
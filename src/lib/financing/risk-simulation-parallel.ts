@@ -0,0 +1,107 @@
+/**
+ * Parallel Risk Simulation
+ *
+ * Splits large Monte Carlo runs across worker_threads. Node-only, so it is
+ * not re-exported from the financing index (which client components import).
+ *
+ * For scripts and the background job worker only: route handlers should call
+ * simulateDealRisk, since Next.js builds do not ship the worker entry and each
+ * request would start its own pool.
+ */
+
+import { availableParallelism } from 'os'
+import { Worker } from 'worker_threads'
+import {
+  DEFAULT_SIMULATION_SEED,
+  SIMULATION_CHUNK_SIZE,
+  createSimulationColumns,
+  resolveDistributions,
+  resolveDrawCount,
+  simulateDealRisk,
+  summarizeSimulation,
+  type SimulationColumns
+} from './risk-simulation'
+import type { RiskDealModel, RiskSimulationOptions, RiskSimulationResult } from './types'
+import type { RiskSimulationWorkerData } from './risk-simulation.worker'
+
+// Below this many draws, worker start-up costs more than it saves
+export const PARALLEL_SIMULATION_THRESHOLD = 250_000
+
+// Compiled output runs the .js worker next to this module; tsx runs the .ts source
+const WORKER_URL = new URL(
+  import.meta.url.endsWith('.ts') ? './risk-simulation.worker.ts' : './risk-simulation.worker.js',
+  import.meta.url
+)
+
+export interface ParallelRiskSimulationOptions extends RiskSimulationOptions {
+  // Defaults to available cores - 1 (at least 1); 1 runs in-process
+  workers?: number
+}
+
+function runWorker(data: RiskSimulationWorkerData): Promise<SimulationColumns> {
+  return new Promise((resolve, reject) => {
+    const worker = new Worker(WORKER_URL, { workerData: data })
+    worker.once('message', (columns: SimulationColumns) => {
+      resolve(columns)
+      void worker.terminate()
+    })
+    worker.once('error', reject)
+    worker.once('exit', (code) => {
+      if (code !== 0) reject(new Error(`Risk simulation worker exited with code ${code}`))
+    })
+  })
+}
+
+/**
+ * Run a risk simulation, splitting large runs across worker threads.
+ * Results are identical to simulateDealRisk for the same seed and draws.
+ */
+export async function runRiskSimulation(
+  model: RiskDealModel,
+  options: ParallelRiskSimulationOptions = {}
+): Promise<RiskSimulationResult> {
+  const draws = resolveDrawCount(options.draws)
+  const chunks = Math.ceil(draws / SIMULATION_CHUNK_SIZE)
+  const workers = Math.min(chunks, options.workers ?? Math.max(1, availableParallelism() - 1))
+
+  if (workers <= 1 || draws < PARALLEL_SIMULATION_THRESHOLD) {
+    return simulateDealRisk(model, options)
+  }
+
+  const started = performance.now()
+  const seed = options.seed ?? DEFAULT_SIMULATION_SEED
+  const distributions = resolveDistributions(options.distributions)
+
+  // Contiguous, chunk-aligned ranges so every draw keeps its chunk seed
+  const chunksPerWorker = Math.ceil(chunks / workers)
+  const ranges: Array<{ start: number; count: number }> = []
+  for (let chunk = 0; chunk < chunks; chunk += chunksPerWorker) {
+    const start = chunk * SIMULATION_CHUNK_SIZE
+    ranges.push({ start, count: Math.min(chunksPerWorker * SIMULATION_CHUNK_SIZE, draws - start) })
+  }
+
+  let parts: SimulationColumns[]
+  try {
+    parts = await Promise.all(
+      ranges.map(({ start, count }) => runWorker({ model, distributions, seed, start, count }))
+    )
+  } catch (error) {
+    console.warn('Risk simulation workers failed, running in-process:', error)
+    return simulateDealRisk(model, options)
+  }
+
+  const columns = createSimulationColumns(draws)
+  parts.forEach((part, index) => {
+    const { start } = ranges[index]
+    columns.profit.set(part.profit, start)
+    columns.roi.set(part.roi, start)
+    columns.annualizedROI.set(part.annualizedROI, start)
+    columns.totalInterest.set(part.totalInterest, start)
+  })
+
+  return summarizeSimulation(model, distributions, columns, {
+    seed,
+    percentiles: options.percentiles,
+    elapsedMs: performance.now() - started
+  })
+}
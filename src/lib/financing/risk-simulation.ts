@@ -0,0 +1,610 @@
+/**
+ * Risk Simulation
+ *
+ * Monte Carlo engine for deal risk. Draws thousands to millions of deals
+ * (ARV, rehab overrun, holding months, interest rate) and evaluates them in
+ * typed-array columns, using closed-form amortization instead of
+ * month-by-month schedules.
+ *
+ * Draws are generated in fixed-size chunks, each seeded from (seed, chunk
+ * index), so a run gives the same result in-process or split across workers.
+ */
+
+import type {
+  FinancingInputs,
+  MonthlyHoldingCosts,
+  RiskDealModel,
+  RiskDistribution,
+  RiskDistributions,
+  RiskSimulationOptions,
+  RiskSimulationResult,
+  RiskVariable,
+  DistributionSummary,
+  SensitivityBar
+} from './types'
+import { DEFAULT_RISK_DISTRIBUTIONS } from './types'
+
+export const DEFAULT_SIMULATION_DRAWS = 10_000
+export const DEFAULT_SIMULATION_SEED = 0x5eed
+export const MAX_SIMULATION_DRAWS = 5_000_000
+export const SIMULATION_CHUNK_SIZE = 65_536
+export const DEFAULT_SIMULATION_PERCENTILES = [5, 10, 25, 50, 75, 90, 95]
+
+const MIN_HOLD_MONTHS = 1
+const SENSITIVITY_LOW = 0.1
+const SENSITIVITY_HIGH = 0.9
+// z-score of the 90th percentile of a standard normal
+const Z_90 = 1.2815515655446004
+const HISTOGRAM_BUCKETS = 65_536
+
+const RISK_VARIABLES: RiskVariable[] = ['arvChange', 'rehabOverrun', 'holdMonthsChange', 'interestRateChange']
+
+// ============================================================================
+// Output Columns
+// ============================================================================
+
+/**
+ * Per-draw outputs, one typed array per metric
+ */
+export interface SimulationColumns {
+  profit: Float64Array
+  roi: Float64Array
+  annualizedROI: Float64Array
+  totalInterest: Float64Array
+}
+
+export function createSimulationColumns(length: number): SimulationColumns {
+  return {
+    profit: new Float64Array(length),
+    roi: new Float64Array(length),
+    annualizedROI: new Float64Array(length),
+    totalInterest: new Float64Array(length)
+  }
+}
+
+// ============================================================================
+// Sampling
+// ============================================================================
+
+/**
+ * Small, fast seeded PRNG (mulberry32)
+ */
+function createRandom(seed: number): () => number {
+  let state = seed >>> 0
+  return () => {
+    state = (state + 0x6d2b79f5) | 0
+    let t = Math.imul(state ^ (state >>> 15), 1 | state)
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296
+  }
+}
+
+function chunkSeed(seed: number, chunkIndex: number): number {
+  return (Math.imul(seed ^ 0x9e3779b9, 0x85ebca6b) + Math.imul(chunkIndex + 1, 0xc2b2ae35)) >>> 0
+}
+
+/**
+ * Fill a column with draws from a distribution
+ */
+function fillColumn(
+  column: Float64Array,
+  count: number,
+  distribution: RiskDistribution,
+  random: () => number
+): void {
+  switch (distribution.type) {
+    case 'fixed':
+      column.fill(distribution.value, 0, count)
+      break
+
+    case 'uniform': {
+      const { min } = distribution
+      const range = distribution.max - min
+      for (let i = 0; i < count; i++) column[i] = min + random() * range
+      break
+    }
+
+    case 'triangular': {
+      const { min, mode, max } = distribution
+      const range = max - min
+      if (range <= 0) {
+        column.fill(mode, 0, count)
+        break
+      }
+      const split = (mode - min) / range
+      const lower = range * (mode - min)
+      const upper = range * (max - mode)
+      for (let i = 0; i < count; i++) {
+        const u = random()
+        column[i] = u < split ? min + Math.sqrt(u * lower) : max - Math.sqrt((1 - u) * upper)
+      }
+      break
+    }
+
+    case 'normal': {
+      // Box-Muller, two draws per pair of uniforms
+      const { mean, stdDev } = distribution
+      for (let i = 0; i < count; i += 2) {
+        const radius = stdDev * Math.sqrt(-2 * Math.log(1 - random()))
+        const angle = 2 * Math.PI * random()
+        column[i] = mean + radius * Math.cos(angle)
+        if (i + 1 < count) column[i + 1] = mean + radius * Math.sin(angle)
+      }
+      break
+    }
+  }
+}
+
+/**
+ * Central value of a distribution (used for the base case)
+ */
+function centralValue(distribution: RiskDistribution): number {
+  switch (distribution.type) {
+    case 'fixed':
+      return distribution.value
+    case 'uniform':
+      return (distribution.min + distribution.max) / 2
+    case 'triangular':
+      return distribution.mode
+    case 'normal':
+      return distribution.mean
+  }
+}
+
+/**
+ * Value at the 10th or 90th percentile of a distribution
+ */
+function tailValue(distribution: RiskDistribution, p: number): number {
+  switch (distribution.type) {
+    case 'fixed':
+      return distribution.value
+    case 'uniform':
+      return distribution.min + p * (distribution.max - distribution.min)
+    case 'triangular': {
+      const { min, mode, max } = distribution
+      const range = max - min
+      if (range <= 0) return mode
+      return p < (mode - min) / range
+        ? min + Math.sqrt(p * range * (mode - min))
+        : max - Math.sqrt((1 - p) * range * (max - mode))
+    }
+    case 'normal':
+      return distribution.mean + (p < 0.5 ? -Z_90 : Z_90) * distribution.stdDev
+  }
+}
+
+function isFiniteNumber(value: unknown): value is number {
+  return typeof value === 'number' && Number.isFinite(value)
+}
+
+/**
+ * Check one distribution from untrusted input; returns an error message or null
+ */
+export function validateRiskDistribution(value: unknown): string | null {
+  if (!value || typeof value !== 'object') return 'must be an object'
+  const distribution = value as Record<string, unknown>
+  switch (distribution.type) {
+    case 'fixed':
+      return isFiniteNumber(distribution.value) ? null : 'fixed needs a numeric value'
+    case 'uniform': {
+      const { min, max } = distribution
+      return isFiniteNumber(min) && isFiniteNumber(max) && min <= max ? null : 'uniform needs numeric min <= max'
+    }
+    case 'triangular': {
+      const { min, mode, max } = distribution
+      return isFiniteNumber(min) && isFiniteNumber(mode) && isFiniteNumber(max) && min <= mode && mode <= max
+        ? null
+        : 'triangular needs numeric min <= mode <= max'
+    }
+    case 'normal': {
+      const { mean, stdDev } = distribution
+      return isFiniteNumber(mean) && isFiniteNumber(stdDev) && stdDev >= 0
+        ? null
+        : 'normal needs a numeric mean and stdDev >= 0'
+    }
+    default:
+      return 'type must be fixed, uniform, triangular or normal'
+  }
+}
+
+/**
+ * Check distribution overrides from untrusted input; returns an error message or null
+ */
+export function validateRiskDistributions(value: unknown): string | null {
+  if (!value || typeof value !== 'object' || Array.isArray(value)) return 'must be an object'
+  for (const [variable, distribution] of Object.entries(value)) {
+    if (!RISK_VARIABLES.includes(variable as RiskVariable)) {
+      return `unknown distribution "${variable}" (expected ${RISK_VARIABLES.join(', ')})`
+    }
+    const error = validateRiskDistribution(distribution)
+    if (error) return `${variable}: ${error}`
+  }
+  return null
+}
+
+/**
+ * Check requested percentiles from untrusted input; returns an error message or null
+ */
+export function validateSimulationPercentiles(value: unknown): string | null {
+  if (!Array.isArray(value) || value.length === 0 || value.length > 99) {
+    return 'must be a non-empty array of up to 99 numbers'
+  }
+  return value.every((p) => isFiniteNumber(p) && p >= 0 && p <= 100)
+    ? null
+    : 'must be numbers between 0 and 100'
+}
+
+export function resolveDistributions(overrides: Partial<RiskDistributions> = {}): RiskDistributions {
+  return { ...DEFAULT_RISK_DISTRIBUTIONS, ...overrides }
+}
+
+// ============================================================================
+// Evaluation
+// ============================================================================
+
+/**
+ * Evaluate deals for columns of input changes, writing outputs at `offset`.
+ * Loan costs use closed-form amortization, so each draw is O(1).
+ */
+function evaluateDraws(
+  model: RiskDealModel,
+  arvChange: Float64Array,
+  rehabOverrun: Float64Array,
+  holdMonthsChange: Float64Array,
+  interestRateChange: Float64Array,
+  count: number,
+  out: SimulationColumns,
+  offset: number
+): void {
+  const {
+    purchasePrice,
+    loanAmount,
+    loanTermMonths,
+    upfrontCosts,
+    monthlyCarry,
+    monthlyIncome,
+    cashInvested
+  } = model
+  const saleMargin = model.saleShare - model.sellingCostsRate
+  const amortized = loanAmount > 0 && model.loanPayment === 'amortized'
+  const interestOnly = loanAmount > 0 && model.loanPayment === 'interest_only'
+  const cashBasis = model.investmentBasis === 'cash'
+  const { profit, roi, annualizedROI, totalInterest } = out
+
+  for (let i = 0; i < count; i++) {
+    const arv = model.arv * (1 + arvChange[i])
+    const rehab = Math.max(0, model.rehabCost * (1 + rehabOverrun[i]))
+    const months = Math.max(MIN_HOLD_MONTHS, model.holdMonths + holdMonthsChange[i])
+    const monthlyRate = Math.max(0, model.interestRate + interestRateChange[i]) / 1200
+
+    let payment = 0
+    let interest = 0
+    if (amortized) {
+      if (monthlyRate > 0) {
+        const growth = Math.pow(1 + monthlyRate, loanTermMonths)
+        payment = (loanAmount * monthlyRate * growth) / (growth - 1)
+        // Interest = payments made - principal repaid after `paid` months
+        const paid = Math.min(months, loanTermMonths)
+        const principalPaid =
+          ((payment - loanAmount * monthlyRate) * (Math.pow(1 + monthlyRate, paid) - 1)) / monthlyRate
+        interest = payment * paid - principalPaid
+      } else {
+        payment = loanAmount / loanTermMonths
+      }
+    } else if (interestOnly) {
+      payment = loanAmount * monthlyRate
+      interest = payment * months
+    }
+
+    const holding = (monthlyCarry + payment) * months
+    const netProfit =
+      arv * saleMargin + monthlyIncome * months - purchasePrice - upfrontCosts - rehab - holding
+    const basis = cashBasis ? cashInvested + rehab : purchasePrice + upfrontCosts + rehab + holding
+    const roiPercentage = basis > 0 ? (netProfit / basis) * 100 : 0
+
+    const j = offset + i
+    profit[j] = netProfit
+    roi[j] = roiPercentage
+    annualizedROI[j] = (roiPercentage * 12) / months
+    totalInterest[j] = interest
+  }
+}
+
+/**
+ * Evaluate a single deal with the given input changes
+ */
+function evaluateOne(
+  model: RiskDealModel,
+  changes: Record<RiskVariable, number>
+): { profit: number; roi: number; annualizedROI: number } {
+  const out = createSimulationColumns(1)
+  evaluateDraws(
+    model,
+    Float64Array.of(changes.arvChange),
+    Float64Array.of(changes.rehabOverrun),
+    Float64Array.of(changes.holdMonthsChange),
+    Float64Array.of(changes.interestRateChange),
+    1,
+    out,
+    0
+  )
+  return { profit: out.profit[0], roi: out.roi[0], annualizedROI: out.annualizedROI[0] }
+}
+
+/**
+ * Simulate draws [start, start + count) into `out` at `offset`.
+ * `start` must be a multiple of SIMULATION_CHUNK_SIZE.
+ */
+export function simulateDrawRange(
+  model: RiskDealModel,
+  distributions: RiskDistributions,
+  seed: number,
+  start: number,
+  count: number,
+  out: SimulationColumns,
+  offset: number = 0
+): void {
+  const size = Math.min(SIMULATION_CHUNK_SIZE, count)
+  const arvChange = new Float64Array(size)
+  const rehabOverrun = new Float64Array(size)
+  const holdMonthsChange = new Float64Array(size)
+  const interestRateChange = new Float64Array(size)
+
+  for (let done = 0; done < count; done += SIMULATION_CHUNK_SIZE) {
+    const chunkCount = Math.min(SIMULATION_CHUNK_SIZE, count - done)
+    const random = createRandom(chunkSeed(seed, (start + done) / SIMULATION_CHUNK_SIZE))
+
+    fillColumn(arvChange, chunkCount, distributions.arvChange, random)
+    fillColumn(rehabOverrun, chunkCount, distributions.rehabOverrun, random)
+    fillColumn(holdMonthsChange, chunkCount, distributions.holdMonthsChange, random)
+    fillColumn(interestRateChange, chunkCount, distributions.interestRateChange, random)
+
+    evaluateDraws(
+      model,
+      arvChange,
+      rehabOverrun,
+      holdMonthsChange,
+      interestRateChange,
+      chunkCount,
+      out,
+      offset + done
+    )
+  }
+}
+
+// ============================================================================
+// Summaries
+// ============================================================================
+
+/**
+ * Exact order statistics in two linear passes: bucket the values by a
+ * 65,536-bucket histogram, then sort only the buckets holding a wanted rank.
+ * Bucketing is monotonic, so ranks within a bucket are preserved.
+ */
+function orderStatistics(column: Float64Array, min: number, max: number, ranks: number[]): Map<number, number> {
+  const n = column.length
+  const scale = max > min ? HISTOGRAM_BUCKETS / (max - min) : 0
+  const last = HISTOGRAM_BUCKETS - 1
+
+  const counts = new Uint32Array(HISTOGRAM_BUCKETS)
+  for (let i = 0; i < n; i++) {
+    counts[Math.min(last, Math.floor((column[i] - min) * scale))]++
+  }
+
+  // Bucket holding each wanted rank, and the first rank in that bucket
+  const bucketOfRank = new Map<number, number>()
+  const firstRank = new Map<number, number>()
+  let bucket = 0
+  let before = 0
+  for (const rank of [...ranks].sort((a, b) => a - b)) {
+    while (before + counts[bucket] <= rank) before += counts[bucket++]
+    bucketOfRank.set(rank, bucket)
+    firstRank.set(bucket, before)
+  }
+
+  // Gather the wanted buckets (slot -1 = not wanted)
+  const slotOf = new Int32Array(HISTOGRAM_BUCKETS).fill(-1)
+  const members: Float64Array[] = []
+  const sizes: number[] = []
+  for (const b of firstRank.keys()) {
+    slotOf[b] = members.length
+    members.push(new Float64Array(counts[b]))
+    sizes.push(0)
+  }
+  for (let i = 0; i < n; i++) {
+    const value = column[i]
+    const slot = slotOf[Math.min(last, Math.floor((value - min) * scale))]
+    if (slot >= 0) members[slot][sizes[slot]++] = value
+  }
+  members.forEach((values) => values.sort())
+
+  const result = new Map<number, number>()
+  bucketOfRank.forEach((b, rank) => {
+    result.set(rank, members[slotOf[b]][rank - firstRank.get(b)!])
+  })
+  return result
+}
+
+/**
+ * Mean, spread and percentiles of a column
+ */
+function summarizeColumn(column: Float64Array, percentiles: number[]): DistributionSummary {
+  const n = column.length
+  let sum = 0
+  let sumSquares = 0
+  let min = Infinity
+  let max = -Infinity
+  for (let i = 0; i < n; i++) {
+    const value = column[i]
+    sum += value
+    sumSquares += value * value
+    if (value < min) min = value
+    if (value > max) max = value
+  }
+  const mean = n > 0 ? sum / n : 0
+  const variance = n > 1 ? Math.max(0, (sumSquares - n * mean * mean) / (n - 1)) : 0
+
+  // Linear interpolation between closest ranks
+  const ranks = percentiles.map((p) => (Math.min(100, Math.max(0, p)) / 100) * Math.max(0, n - 1))
+  const values =
+    n > 0 ? orderStatistics(column, min, max, [...new Set(ranks.flatMap((r) => [Math.floor(r), Math.ceil(r)]))]) : null
+
+  const bands: Record<string, number> = {}
+  percentiles.forEach((p, index) => {
+    const rank = ranks[index]
+    const lower = values ? values.get(Math.floor(rank))! : 0
+    const upper = values ? values.get(Math.ceil(rank))! : 0
+    bands[`p${p}`] = lower + (upper - lower) * (rank - Math.floor(rank))
+  })
+
+  return {
+    mean,
+    stdDev: Math.sqrt(variance),
+    min: n > 0 ? min : 0,
+    max: n > 0 ? max : 0,
+    percentiles: bands
+  }
+}
+
+/**
+ * Tornado sensitivities: profit with each input at its 10th / 90th
+ * percentile while the others stay at their central value
+ */
+export function calculateSensitivity(
+  model: RiskDealModel,
+  distributions: RiskDistributions
+): SensitivityBar[] {
+  const base = {} as Record<RiskVariable, number>
+  for (const variable of RISK_VARIABLES) base[variable] = centralValue(distributions[variable])
+
+  return RISK_VARIABLES.map((variable) => {
+    const lowInput = tailValue(distributions[variable], SENSITIVITY_LOW)
+    const highInput = tailValue(distributions[variable], SENSITIVITY_HIGH)
+    const lowProfit = evaluateOne(model, { ...base, [variable]: lowInput }).profit
+    const highProfit = evaluateOne(model, { ...base, [variable]: highInput }).profit
+    return {
+      variable,
+      lowInput,
+      highInput,
+      lowProfit,
+      highProfit,
+      swing: Math.abs(highProfit - lowProfit)
+    }
+  }).sort((a, b) => b.swing - a.swing)
+}
+
+/**
+ * Build the result from simulated columns
+ */
+export function summarizeSimulation(
+  model: RiskDealModel,
+  distributions: RiskDistributions,
+  columns: SimulationColumns,
+  options: { seed: number; percentiles?: number[]; elapsedMs: number }
+): RiskSimulationResult {
+  const percentiles = options.percentiles ?? DEFAULT_SIMULATION_PERCENTILES
+  const draws = columns.profit.length
+
+  let losses = 0
+  for (let i = 0; i < draws; i++) {
+    if (columns.profit[i] < 0) losses++
+  }
+
+  const base = {} as Record<RiskVariable, number>
+  for (const variable of RISK_VARIABLES) base[variable] = centralValue(distributions[variable])
+
+  return {
+    draws,
+    seed: options.seed,
+    baseCase: evaluateOne(model, base),
+    profit: summarizeColumn(columns.profit, percentiles),
+    roi: summarizeColumn(columns.roi, percentiles),
+    annualizedROI: summarizeColumn(columns.annualizedROI, percentiles),
+    totalInterest: summarizeColumn(columns.totalInterest, percentiles),
+    probabilityOfLoss: draws > 0 ? losses / draws : 0,
+    sensitivity: calculateSensitivity(model, distributions),
+    elapsedMs: options.elapsedMs
+  }
+}
+
+// ============================================================================
+// Entry Points
+// ============================================================================
+
+export function resolveDrawCount(draws: number | undefined): number {
+  const count = Math.floor(draws ?? DEFAULT_SIMULATION_DRAWS)
+  if (!Number.isFinite(count) || count < 1 || count > MAX_SIMULATION_DRAWS) {
+    throw new Error(`Simulation draws must be between 1 and ${MAX_SIMULATION_DRAWS.toLocaleString()}`)
+  }
+  return count
+}
+
+/**
+ * Run a Monte Carlo risk simulation in the current thread
+ */
+export function simulateDealRisk(
+  model: RiskDealModel,
+  options: RiskSimulationOptions = {}
+): RiskSimulationResult {
+  const started = performance.now()
+  const draws = resolveDrawCount(options.draws)
+  const seed = options.seed ?? DEFAULT_SIMULATION_SEED
+  const distributions = resolveDistributions(options.distributions)
+
+  const columns = createSimulationColumns(draws)
+  simulateDrawRange(model, distributions, seed, 0, draws, columns)
+
+  return summarizeSimulation(model, distributions, columns, {
+    seed,
+    percentiles: options.percentiles,
+    elapsedMs: performance.now() - started
+  })
+}
+
+/**
+ * Deal model matching calculateFinancing (profit and cash-on-cash ROI)
+ */
+export function toFinancingRiskModel(
+  inputs: FinancingInputs,
+  holdingCosts: MonthlyHoldingCosts
+): RiskDealModel {
+  const downPayment = inputs.purchasePrice * (inputs.downPaymentPercent / 100)
+  const loanAmount = inputs.purchasePrice - downPayment
+  const closingCosts = inputs.purchasePrice * (inputs.closingCostsPercent / 100)
+  const pointsCost = loanAmount * (inputs.points / 100)
+
+  return {
+    purchasePrice: inputs.purchasePrice,
+    arv: inputs.arv,
+    rehabCost: inputs.rehabBudget,
+    holdMonths: inputs.holdingPeriodMonths,
+    loanAmount,
+    interestRate: inputs.interestRate,
+    loanTermMonths: inputs.loanTermMonths,
+    loanPayment:
+      inputs.loanType === 'hard_money' ? 'interest_only' : inputs.loanType === 'cash' ? 'none' : 'amortized',
+    upfrontCosts: closingCosts,
+    monthlyCarry:
+      holdingCosts.propertyTaxes +
+      holdingCosts.insurance +
+      holdingCosts.utilities +
+      holdingCosts.hoaFees +
+      holdingCosts.maintenance,
+    monthlyIncome: 0,
+    saleShare: 1,
+    sellingCostsRate: inputs.sellingCostsPercent / 100,
+    investmentBasis: 'cash',
+    cashInvested: downPayment + closingCosts + pointsCost
+  }
+}
+
+/**
+ * Monte Carlo risk analysis of a financed deal
+ */
+export function simulateFinancingRisk(
+  inputs: FinancingInputs,
+  holdingCosts: MonthlyHoldingCosts,
+  options: RiskSimulationOptions = {}
+): RiskSimulationResult {
+  return simulateDealRisk(toFinancingRiskModel(inputs, holdingCosts), options)
+}
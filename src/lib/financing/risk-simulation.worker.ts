@@ -0,0 +1,29 @@
+/**
+ * Risk Simulation Worker
+ *
+ * Simulates one chunk-aligned range of draws and posts the output columns
+ * back (buffers are transferred, not copied).
+ */
+
+import { parentPort, workerData } from 'worker_threads'
+import { createSimulationColumns, simulateDrawRange } from './risk-simulation'
+import type { RiskDealModel, RiskDistributions } from './types'
+
+export interface RiskSimulationWorkerData {
+  model: RiskDealModel
+  distributions: RiskDistributions
+  seed: number
+  start: number
+  count: number
+}
+
+const { model, distributions, seed, start, count } = workerData as RiskSimulationWorkerData
+const columns = createSimulationColumns(count)
+simulateDrawRange(model, distributions, seed, start, count, columns)
+
+parentPort?.postMessage(columns, [
+  columns.profit.buffer,
+  columns.roi.buffer,
+  columns.annualizedROI.buffer,
+  columns.totalInterest.buffer
+])
@@ -150,6 +150,108 @@ export interface DealAnalysis {
   }
 }
 
+// ============================================================================
+// Risk Simulation Types
+// ============================================================================
+
+/**
+ * Distribution of one uncertain deal input
+ */
+export type RiskDistribution =
+  | { type: 'fixed'; value: number }
+  | { type: 'uniform'; min: number; max: number }
+  | { type: 'triangular'; min: number; mode: number; max: number }
+  | { type: 'normal'; mean: number; stdDev: number }
+
+/**
+ * Uncertain inputs drawn for every simulated deal
+ */
+export interface RiskDistributions {
+  arvChange: RiskDistribution // relative, -0.1 = ARV 10% below estimate
+  rehabOverrun: RiskDistribution // relative, 0.2 = rehab 20% over budget
+  holdMonthsChange: RiskDistribution // months added to the holding period
+  interestRateChange: RiskDistribution // percentage points added to the rate
+}
+
+export type RiskVariable = keyof RiskDistributions
+
+/**
+ * Deterministic deal the simulation perturbs.
+ *
+ * Profit = ARV * (saleShare - sellingCostsRate) + monthlyIncome * months
+ *        - purchasePrice - upfrontCosts - rehabCost - (monthlyCarry + loan payment) * months
+ */
+export interface RiskDealModel {
+  purchasePrice: number
+  arv: number
+  rehabCost: number
+  holdMonths: number
+  loanAmount: number
+  interestRate: number // annual percentage
+  loanTermMonths: number
+  loanPayment: 'amortized' | 'interest_only' | 'none'
+  upfrontCosts: number // closing / acquisition costs counted against profit
+  monthlyCarry: number // taxes, insurance, utilities... excluding the loan payment
+  monthlyIncome: number // net income while held (rentals)
+  saleShare: number // share of ARV realised at exit
+  sellingCostsRate: number // fraction of ARV
+  investmentBasis: 'cash' | 'all_in' // ROI denominator
+  cashInvested: number // cash basis excluding rehab (down payment, closing, points)
+}
+
+/**
+ * Options for a risk simulation run
+ */
+export interface RiskSimulationOptions {
+  draws?: number
+  seed?: number
+  distributions?: Partial<RiskDistributions>
+  percentiles?: number[]
+}
+
+/**
+ * Summary of one simulated output column
+ */
+export interface DistributionSummary {
+  mean: number
+  stdDev: number
+  min: number
+  max: number
+  percentiles: Record<string, number> // keyed p5, p50, ...
+}
+
+/**
+ * Tornado bar: profit with one input at its 10th / 90th percentile, others at base
+ */
+export interface SensitivityBar {
+  variable: RiskVariable
+  lowInput: number
+  highInput: number
+  lowProfit: number
+  highProfit: number
+  swing: number
+}
+
+/**
+ * Result of a risk simulation
+ */
+export interface RiskSimulationResult {
+  draws: number
+  seed: number
+  baseCase: {
+    profit: number
+    roi: number
+    annualizedROI: number
+  }
+  profit: DistributionSummary
+  roi: DistributionSummary
+  annualizedROI: DistributionSummary
+  totalInterest: DistributionSummary
+  probabilityOfLoss: number
+  sensitivity: SensitivityBar[]
+  elapsedMs: number
+}
+
 // ============================================================================
 // Presets and Defaults
 // ============================================================================
@@ -188,3 +290,13 @@ export const DEFAULT_MONTHLY_COSTS = {
   hoaFees: 0,
   maintenance: 100
 }
+
+/**
+ * Default input uncertainty for risk simulations
+ */
+export const DEFAULT_RISK_DISTRIBUTIONS: RiskDistributions = {
+  arvChange: { type: 'triangular', min: -0.15, mode: 0, max: 0.1 },
+  rehabOverrun: { type: 'triangular', min: -0.05, mode: 0.05, max: 0.4 },
+  holdMonthsChange: { type: 'triangular', min: -1, mode: 0, max: 4 },
+  interestRateChange: { type: 'normal', mean: 0, stdDev: 0.75 }
+}
@@ -1,4 +1,5 @@
 import { FixedWindowRateLimiter } from '@/lib/rate-limit';
+import { getSharedCache, type CachePolicy } from '@/lib/tiered-cache';
 
 export interface PlacesSuggestion {
   placeId: string;
@@ -58,29 +59,18 @@ type GoogleFindPlaceFromTextResponse = {
 
 const KEY = process.env.GOOGLE_PLACES_API_KEY;
 
-// Basic in-process caching to reduce external calls (MVP).
-const CACHE_TTL_MS = 1000 * 60 * 60; // 1 hour
+// Google results are cached in the shared tiered cache (bounded in-process LRU
+// + Redis), so every instance reuses them and concurrent lookups of the same
+// input make one Google call.
+const CACHE_TTL_SECONDS = 60 * 60; // 1 hour
 
-type CacheEntry<T> = { expiresAt: number; value: T };
-const cache = {
-  autocomplete: new Map<string, CacheEntry<PlacesSuggestion[]>>(),
-  placeDetails: new Map<string, CacheEntry<ValidatedAddress>>(),
-  findPlace: new Map<string, CacheEntry<{ placeId: string; formattedAddress?: string; lat?: number; lng?: number }>>(),
-};
-
-function getCached<T>(m: Map<string, CacheEntry<T>>, key: string): T | null {
-  const hit = m.get(key);
-  if (!hit) return null;
-  if (Date.now() > hit.expiresAt) {
-    m.delete(key);
-    return null;
-  }
-  return hit.value;
-}
+type FoundPlace = { placeId: string; formattedAddress?: string; lat?: number; lng?: number };
 
-function setCached<T>(m: Map<string, CacheEntry<T>>, key: string, value: T) {
-  m.set(key, { value, expiresAt: Date.now() + CACHE_TTL_MS });
-}
+const CACHE_POLICIES = {
+  autocomplete: { namespace: 'places-autocomplete', ttlSeconds: CACHE_TTL_SECONDS, tags: ['google-places'] },
+  placeDetails: { namespace: 'places-details', ttlSeconds: CACHE_TTL_SECONDS, tags: ['google-places'] },
+  findPlace: { namespace: 'places-find', ttlSeconds: CACHE_TTL_SECONDS, tags: ['google-places'] },
+} satisfies Record<string, CachePolicy<unknown[]>>;
 
 function requireKey() {
   if (!KEY) {
@@ -165,9 +155,14 @@ export async function placesAutocomplete(input: string, opts?: { country?: strin
 
   const country = opts?.country ?? 'us';
   const cacheKey = `${country}:${normalized.toLowerCase()}`;
-  const cached = getCached(cache.autocomplete, cacheKey);
-  if (cached) return cached;
+  return getSharedCache().getOrLoad(
+    [cacheKey],
+    () => fetchAutocomplete(normalized, country),
+    CACHE_POLICIES.autocomplete
+  );
+}
 
+async function fetchAutocomplete(normalized: string, country: string): Promise<PlacesSuggestion[]> {
   const url = new URL('https://maps.googleapis.com/maps/api/place/autocomplete/json');
   url.searchParams.set('input', normalized);
   url.searchParams.set('types', 'address');
@@ -191,7 +186,6 @@ export async function placesAutocomplete(input: string, opts?: { country?: strin
       secondaryText: p.structured_formatting?.secondary_text || '',
     })) ?? [];
 
-  setCached(cache.autocomplete, cacheKey, suggestions);
   return suggestions;
 }
 
@@ -203,9 +197,14 @@ export async function placeDetails(placeId: string): Promise<ValidatedAddress> {
     throw new PlacesError('placeId is required', 'MISSING_PLACE_ID');
   }
 
-  const cached = getCached(cache.placeDetails, normalized);
-  if (cached) return cached;
+  return getSharedCache().getOrLoad(
+    [normalized],
+    () => fetchPlaceDetails(normalized),
+    CACHE_POLICIES.placeDetails
+  );
+}
 
+async function fetchPlaceDetails(normalized: string): Promise<ValidatedAddress> {
   const url = new URL('https://maps.googleapis.com/maps/api/place/details/json');
   url.searchParams.set('place_id', normalized);
   url.searchParams.set('fields', 'place_id,formatted_address,address_component,geometry');
@@ -226,11 +225,10 @@ export async function placeDetails(placeId: string): Promise<ValidatedAddress> {
     ...parsed,
   };
 
-  setCached(cache.placeDetails, normalized, validated);
   return validated;
 }
 
-export async function findPlaceFromText(text: string): Promise<{ placeId: string; formattedAddress?: string; lat?: number; lng?: number }> {
+export async function findPlaceFromText(text: string): Promise<FoundPlace> {
   requireKey();
 
   const normalized = text.trim();
@@ -238,10 +236,14 @@ export async function findPlaceFromText(text: string): Promise<{ placeId: string
     throw new PlacesError('Address text is required', 'MISSING_ADDRESS_TEXT');
   }
 
-  const cacheKey = normalized.toLowerCase();
-  const cached = getCached(cache.findPlace, cacheKey);
-  if (cached) return cached;
+  return getSharedCache().getOrLoad(
+    [normalized.toLowerCase()],
+    () => fetchFindPlace(normalized),
+    CACHE_POLICIES.findPlace
+  );
+}
 
+async function fetchFindPlace(normalized: string): Promise<FoundPlace> {
   const url = new URL('https://maps.googleapis.com/maps/api/place/findplacefromtext/json');
   url.searchParams.set('input', normalized);
   url.searchParams.set('inputtype', 'textquery');
@@ -257,14 +259,13 @@ export async function findPlaceFromText(text: string): Promise<{ placeId: string
   }
 
   const c = data.candidates[0];
-  const result = {
+  const result: FoundPlace = {
     placeId: c.place_id,
     formattedAddress: c.formatted_address,
     lat: c.geometry?.location?.lat,
     lng: c.geometry?.location?.lng,
   };
 
-  setCached(cache.findPlace, cacheKey, result);
   return result;
 }
 
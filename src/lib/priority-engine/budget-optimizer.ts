@@ -3,8 +3,12 @@
  * 
  * Implements a knapsack-style optimization algorithm to maximize ROI
  * within budget constraints. Uses dynamic programming for optimal selection.
+ * The `exact` solver mode delegates to ExactKnapsackSolver, which stays
+ * exact and memory-bounded at full-project budgets.
  */
 
+import { ExactKnapsackSolver, type ExactSolverMethod } from './knapsack-solver';
+
 // =============================================================================
 // TYPES
 // =============================================================================
@@ -31,14 +35,33 @@ interface OptimizationResult {
     averageROI: number;
     mustHavesCovered: boolean;
   };
+  /** Populated by the `exact` solver */
+  solver?: {
+    method: ExactSolverMethod;
+    granularity: number;
+    provenOptimal: boolean;
+  };
 }
 
+/**
+ * - `dp`: cent-level DP, falls back to greedy above a $10k optional budget
+ * - `greedy`: value/cost ratio ordering
+ * - `exact`: bucketed typed-array DP, or branch-and-bound when dependencies apply
+ */
+type OptimizationSolver = 'dp' | 'greedy' | 'exact';
+
 interface OptimizationOptions {
   budget: number;
   prioritizeMustHaves?: boolean;
   maxItems?: number;
   categoryWeights?: Record<string, number>;
+  /** Per-item value multiplier for the objective; reported values stay unweighted */
+  valueWeight?: (item: OptimizableItem) => number;
   respectDependencies?: boolean;
+  /** Defaults to `dp`. Category and value weights are only applied by `exact`. */
+  solver?: OptimizationSolver;
+  /** Dollar bucket size for the `exact` solver; chosen automatically when omitted */
+  granularity?: number;
 }
 
 // =============================================================================
@@ -54,7 +77,13 @@ export class BudgetOptimizer {
     items: OptimizableItem[],
     options: OptimizationOptions
   ): OptimizationResult {
-    const { budget, prioritizeMustHaves = true, maxItems, respectDependencies = true } = options;
+    const {
+      budget,
+      prioritizeMustHaves = true,
+      maxItems,
+      respectDependencies = true,
+      solver = 'dp',
+    } = options;
 
     // Separate must-haves (these are non-negotiable)
     const mustHaves = items.filter((item) => item.priority === 'must');
@@ -66,34 +95,133 @@ export class BudgetOptimizer {
 
     // If must-haves exceed budget, we have a problem
     if (remainingBudget < 0 && prioritizeMustHaves) {
-      return {
-        selectedItems: mustHaves,
-        totalCost: mustHaveCost,
-        totalValue: mustHaves.reduce((sum, item) => sum + item.value, 0),
-        unselectedItems: optionalItems,
-        summary: {
-          itemCount: mustHaves.length,
-          budgetUsed: mustHaveCost,
-          budgetRemaining: remainingBudget,
-          averageROI: mustHaves.length > 0
-            ? mustHaves.reduce((sum, item) => sum + item.value, 0) / mustHaves.length
-            : 0,
-          mustHavesCovered: false, // Budget exceeded
-        },
+      return this.mustHavesOverBudget(mustHaves, optionalItems, remainingBudget);
+    }
+
+    let optimalSelection: OptimizableItem[];
+    let solverInfo: OptimizationResult['solver'];
+
+    if (solver === 'exact') {
+      // Dependencies, item limits and category weights are handled inside the search
+      const exact = ExactKnapsackSolver.solve(
+        prioritizeMustHaves ? optionalItems : items,
+        {
+          budget: prioritizeMustHaves ? remainingBudget : budget,
+          maxItems,
+          categoryWeights: options.categoryWeights,
+          valueWeight: options.valueWeight,
+          respectDependencies,
+          granularity: options.granularity,
+        }
+      );
+      optimalSelection = exact.selectedItems;
+      solverInfo = {
+        method: exact.method,
+        granularity: exact.granularity,
+        provenOptimal: exact.provenOptimal,
       };
+    } else {
+      // Apply dependency ordering
+      const orderedOptionals = respectDependencies
+        ? this.orderByDependencies(optionalItems, mustHaves)
+        : optionalItems;
+
+      const optimizeSubset = (subset: OptimizableItem[], subsetBudget: number) =>
+        solver === 'greedy'
+          ? this.greedyOptimize(subset, subsetBudget, maxItems)
+          : this.knapsackOptimize(subset, subsetBudget, maxItems);
+
+      // Apply knapsack optimization to optional items
+      optimalSelection = prioritizeMustHaves
+        ? optimizeSubset(orderedOptionals, remainingBudget)
+        : optimizeSubset([...mustHaves, ...orderedOptionals], budget);
     }
 
-    // Apply dependency ordering
-    let orderedOptionals = respectDependencies
-      ? this.orderByDependencies(optionalItems, mustHaves)
-      : optionalItems;
+    return this.buildResult(items, mustHaves, optimalSelection, budget, prioritizeMustHaves, solverInfo);
+  }
 
-    // Apply knapsack optimization to optional items
-    const optimalSelection = prioritizeMustHaves
-      ? this.knapsackOptimize(orderedOptionals, remainingBudget, maxItems)
-      : this.knapsackOptimize([...mustHaves, ...orderedOptionals], budget, maxItems);
+  /**
+   * Optimize one item set at several budgets with a single exact solve.
+   * The exact solver's DP answers every budget up to the largest one, so
+   * each extra budget point costs a backtrack rather than a new solve.
+   * Results are returned in the order of `budgets`.
+   */
+  static optimizeForBudgets(
+    items: OptimizableItem[],
+    budgets: number[],
+    options: Omit<OptimizationOptions, 'budget' | 'solver'> = {}
+  ): OptimizationResult[] {
+    if (budgets.length === 0) return [];
+
+    const { prioritizeMustHaves = true, maxItems, respectDependencies = true } = options;
+
+    const mustHaves = items.filter((item) => item.priority === 'must');
+    const optionalItems = items.filter((item) => item.priority !== 'must');
+    const mustHaveCost = mustHaves.reduce((sum, item) => sum + item.cost, 0);
 
-    // Combine results
+    // Must-haves are fixed costs when prioritized, so the curve only covers optionals
+    const offset = prioritizeMustHaves ? mustHaveCost : 0;
+    const curve = ExactKnapsackSolver.solveCurve(prioritizeMustHaves ? optionalItems : items, {
+      budget: Math.max(...budgets) - offset,
+      maxItems,
+      categoryWeights: options.categoryWeights,
+      valueWeight: options.valueWeight,
+      respectDependencies,
+      granularity: options.granularity,
+    });
+
+    return budgets.map((budget) => {
+      const remainingBudget = budget - mustHaveCost;
+      if (remainingBudget < 0 && prioritizeMustHaves) {
+        return this.mustHavesOverBudget(mustHaves, optionalItems, remainingBudget);
+      }
+
+      const exact = curve.select(budget - offset);
+      return this.buildResult(items, mustHaves, exact.selectedItems, budget, prioritizeMustHaves, {
+        method: exact.method,
+        granularity: exact.granularity,
+        provenOptimal: exact.provenOptimal,
+      });
+    });
+  }
+
+  /**
+   * Result returned when must-haves alone exceed the budget
+   */
+  private static mustHavesOverBudget(
+    mustHaves: OptimizableItem[],
+    optionalItems: OptimizableItem[],
+    remainingBudget: number
+  ): OptimizationResult {
+    const mustHaveCost = mustHaves.reduce((sum, item) => sum + item.cost, 0);
+    const mustHaveValue = mustHaves.reduce((sum, item) => sum + item.value, 0);
+
+    return {
+      selectedItems: mustHaves,
+      totalCost: mustHaveCost,
+      totalValue: mustHaveValue,
+      unselectedItems: optionalItems,
+      summary: {
+        itemCount: mustHaves.length,
+        budgetUsed: mustHaveCost,
+        budgetRemaining: remainingBudget,
+        averageROI: mustHaves.length > 0 ? mustHaveValue / mustHaves.length : 0,
+        mustHavesCovered: false, // Budget exceeded
+      },
+    };
+  }
+
+  /**
+   * Combine must-haves with the optimized selection and compute the summary
+   */
+  private static buildResult(
+    items: OptimizableItem[],
+    mustHaves: OptimizableItem[],
+    optimalSelection: OptimizableItem[],
+    budget: number,
+    prioritizeMustHaves: boolean,
+    solverInfo?: OptimizationResult['solver']
+  ): OptimizationResult {
     const selectedItems = prioritizeMustHaves
       ? [...mustHaves, ...optimalSelection]
       : optimalSelection;
@@ -114,10 +242,9 @@ export class BudgetOptimizer {
         budgetUsed: totalCost,
         budgetRemaining: budget - totalCost,
         averageROI: selectedItems.length > 0 ? totalValue / selectedItems.length : 0,
-        mustHavesCovered: mustHaves.every((must) =>
-          selectedItems.some((sel) => sel.id === must.id)
-        ),
+        mustHavesCovered: mustHaves.every((must) => selectedIds.has(must.id)),
       },
+      ...(solverInfo && { solver: solverInfo }),
     };
   }
 
@@ -372,4 +499,4 @@ export class BudgetOptimizer {
 // EXPORTS
 // =============================================================================
 
-export type { OptimizableItem, OptimizationResult, OptimizationOptions };
+export type { OptimizableItem, OptimizationResult, OptimizationOptions, OptimizationSolver };
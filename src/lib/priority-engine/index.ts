@@ -2,6 +2,7 @@
 export * from './types'
 export * from './priority-scoring'
 export * from './budget-optimizer'
+export * from './knapsack-solver'
 
 // Re-export commonly used functions
 export { 
@@ -14,6 +15,10 @@ export {
   BudgetOptimizer 
 } from './budget-optimizer'
 
+export { 
+  ExactKnapsackSolver 
+} from './knapsack-solver'
+
 export { 
   ScenarioEngine 
 } from './scenario-engine'
@@ -0,0 +1,586 @@
+/**
+ * Exact Knapsack Solver
+ *
+ * Memory-bounded exact solver behind BudgetOptimizer's `exact` mode.
+ * Costs are quantized into dollar buckets sized to keep the DP under a fixed
+ * cell budget, DP rows live in typed arrays and the keep-table is a packed
+ * bitset. Item limits, value weights and dependencies are enforced inside
+ * the search instead of by truncating the selection afterwards.
+ */
+
+import type { OptimizableItem } from './budget-optimizer';
+
+// =============================================================================
+// TYPES
+// =============================================================================
+
+interface ExactSolverOptions {
+  budget: number;
+  maxItems?: number;
+  categoryWeights?: Record<string, number>;
+  /** Per-item value multiplier, applied on top of category weights */
+  valueWeight?: (item: OptimizableItem) => number;
+  respectDependencies?: boolean;
+  /** Dollar size of a cost bucket. Picked from GRANULARITY_LADDER when omitted. */
+  granularity?: number;
+  /** Upper bound on keep-table bits (items × item slots × budget buckets). */
+  maxCells?: number;
+  /** Branch-and-bound node limit before the incumbent is returned unproven. */
+  maxNodes?: number;
+}
+
+type ExactSolverMethod = 'dp' | 'branch-and-bound';
+
+interface ExactSolverResult {
+  selectedItems: OptimizableItem[];
+  totalCost: number;
+  weightedValue: number;
+  method: ExactSolverMethod;
+  /** Bucket size used by the DP; 0 when the search ran on exact costs. */
+  granularity: number;
+  /** True when the selection is optimal for the true (unbucketed) costs. */
+  provenOptimal: boolean;
+}
+
+/**
+ * Result of a single solve that can be read at any budget up to `maxBudget`.
+ */
+interface BudgetCurve {
+  method: ExactSolverMethod;
+  granularity: number;
+  maxBudget: number;
+  select(budget: number): ExactSolverResult;
+}
+
+/** Filled DP state retained by a BudgetCurve for backtracking */
+interface BucketTable {
+  items: OptimizableItem[];
+  costs: Int32Array;
+  values: Float64Array;
+  keep: Uint8Array;
+  granularity: number;
+  capacity: number;
+  width: number;
+  slotLayers: number;
+  limitedTo: number | undefined;
+  bucketsExact: boolean;
+}
+
+// =============================================================================
+// CONSTANTS
+// =============================================================================
+
+/** Bucket sizes tried in order, from exact-dollar up to $1k */
+const GRANULARITY_LADDER = [1, 5, 10, 25, 50, 100, 250, 500, 1000];
+
+/** Keep-table bit budget (~16MB) */
+const DEFAULT_MAX_CELLS = 1 << 27;
+
+/** DP row budget in Float64 entries (~32MB) */
+const MAX_ROW_CELLS = 1 << 22;
+
+const DEFAULT_MAX_NODES = 2_000_000;
+
+const EPSILON = 1e-9;
+
+// =============================================================================
+// EXACT KNAPSACK SOLVER CLASS
+// =============================================================================
+
+export class ExactKnapsackSolver {
+  /**
+   * Select the value-maximizing subset of items within budget.
+   * Uses the bucketed DP when items are independent, and branch-and-bound
+   * on exact costs when dependencies between candidates must be honoured.
+   */
+  static solve(items: OptimizableItem[], options: ExactSolverOptions): ExactSolverResult {
+    return this.solveCurve(items, options).select(options.budget);
+  }
+
+  /**
+   * Solve once for `options.budget` and answer any smaller budget from the
+   * same solve. The DP keep-table already covers every bucket up to the
+   * budget, so each extra budget point costs one backtrack. When dependencies
+   * force branch-and-bound, each budget point is searched separately.
+   * Budgets above `options.budget` are clamped to it.
+   */
+  static solveCurve(items: OptimizableItem[], options: ExactSolverOptions): BudgetCurve {
+    const { budget: maxBudget, categoryWeights, valueWeight, respectDependencies = true } = options;
+    const maxItems =
+      options.maxItems !== undefined && options.maxItems >= 0 ? Math.floor(options.maxItems) : undefined;
+
+    const weightOf = (item: OptimizableItem) =>
+      item.value * (categoryWeights?.[item.category] ?? 1) * (valueWeight?.(item) ?? 1);
+
+    if (items.length === 0 || maxBudget <= 0 || maxItems === 0) {
+      return { method: 'dp', granularity: 0, maxBudget, select: () => this.emptyResult() };
+    }
+
+    const candidates = this.pruneCandidates(items, maxBudget, respectDependencies);
+
+    if (respectDependencies && this.hasInternalDependencies(candidates)) {
+      const maxNodes = options.maxNodes ?? DEFAULT_MAX_NODES;
+      return {
+        method: 'branch-and-bound',
+        granularity: 0,
+        maxBudget,
+        select: (budget: number) => {
+          const capped = Math.min(budget, maxBudget);
+          if (capped <= 0) return this.emptyResult();
+          return this.branchAndBound(
+            this.pruneCandidates(items, capped, true),
+            capped,
+            maxItems,
+            weightOf,
+            maxNodes
+          );
+        },
+      };
+    }
+
+    const table = this.buildBucketTable(
+      candidates.filter((item) => weightOf(item) > 0),
+      maxBudget,
+      maxItems,
+      weightOf,
+      options.granularity,
+      options.maxCells ?? DEFAULT_MAX_CELLS
+    );
+    return {
+      method: 'dp',
+      granularity: table.granularity,
+      maxBudget,
+      select: (budget: number) => {
+        const capped = Math.min(budget, maxBudget);
+        return capped <= 0 ? this.emptyResult() : this.selectFromTable(table, capped);
+      },
+    };
+  }
+
+  // ---------------------------------------------------------------------------
+  // Candidate preparation
+  // ---------------------------------------------------------------------------
+
+  /**
+   * Drop items that can never be selected: anything over budget, and (when
+   * dependencies are respected) anything depending on such an item.
+   * Dependencies on ids outside the item set are treated as satisfied.
+   */
+  private static pruneCandidates(
+    items: OptimizableItem[],
+    budget: number,
+    respectDependencies: boolean
+  ): OptimizableItem[] {
+    let candidates = items.filter((item) => item.cost <= budget + EPSILON);
+    if (!respectDependencies || candidates.length === items.length) return candidates;
+
+    const allIds = new Set(items.map((item) => item.id));
+    let changed = true;
+    while (changed) {
+      const available = new Set(candidates.map((item) => item.id));
+      const next = candidates.filter(
+        (item) => !item.dependencies?.some((depId) => allIds.has(depId) && !available.has(depId))
+      );
+      changed = next.length !== candidates.length;
+      candidates = next;
+    }
+    return candidates;
+  }
+
+  private static hasInternalDependencies(items: OptimizableItem[]): boolean {
+    const ids = new Set(items.map((item) => item.id));
+    return items.some((item) => item.dependencies?.some((depId) => depId !== item.id && ids.has(depId)));
+  }
+
+  // ---------------------------------------------------------------------------
+  // Bucketed dynamic programming
+  // ---------------------------------------------------------------------------
+
+  /**
+   * 0/1 knapsack over bucketed costs.
+   * Costs round up and the budget rounds down, so every selection is feasible
+   * for the true costs. When maxItems binds, a count dimension is added so the
+   * limit is part of the optimization: dp[k][w] = best value with at most k
+   * items and at most w buckets.
+   */
+  private static buildBucketTable(
+    items: OptimizableItem[],
+    budget: number,
+    maxItems: number | undefined,
+    weightOf: (item: OptimizableItem) => number,
+    requestedGranularity: number | undefined,
+    maxCells: number
+  ): BucketTable {
+    const n = items.length;
+    const limited = maxItems !== undefined && maxItems < n;
+    const slotLayers = limited ? maxItems : 1;
+    const granularity = this.chooseGranularity(budget, Math.max(n, 1), slotLayers, requestedGranularity, maxCells);
+
+    const capacity = Math.floor(budget / granularity + EPSILON);
+    const width = capacity + 1;
+    const costs = new Int32Array(n);
+    const values = new Float64Array(n);
+    let bucketsExact = true;
+    for (let i = 0; i < n; i++) {
+      const units = items[i].cost / granularity;
+      costs[i] = Math.max(0, Math.ceil(units - EPSILON));
+      values[i] = weightOf(items[i]);
+      if (Math.abs(units - Math.round(units)) > EPSILON) bucketsExact = false;
+    }
+
+    // Layer 0 stays all-zero in limited mode so layer k can read layer k-1.
+    const layers = limited ? slotLayers + 1 : 1;
+    const firstLayer = limited ? 1 : 0;
+    const dp = new Float64Array(layers * width);
+    const keep = new Uint8Array(Math.ceil((n * slotLayers * width) / 8));
+
+    for (let i = 0; i < n; i++) {
+      const cost = costs[i];
+      const value = values[i];
+      if (cost > capacity) continue;
+
+      for (let k = layers - 1; k >= firstLayer; k--) {
+        const writeBase = k * width;
+        const readBase = (limited ? k - 1 : k) * width;
+        const keepBase = (i * slotLayers + (k - firstLayer)) * width;
+        for (let w = capacity; w >= cost; w--) {
+          const withItem = dp[readBase + w - cost] + value;
+          if (withItem > dp[writeBase + w] + EPSILON) {
+            dp[writeBase + w] = withItem;
+            const bit = keepBase + w;
+            keep[bit >> 3] |= 1 << (bit & 7);
+          }
+        }
+      }
+    }
+
+    return {
+      items,
+      costs,
+      values,
+      keep,
+      granularity,
+      capacity,
+      width,
+      slotLayers,
+      limitedTo: limited ? maxItems : undefined,
+      bucketsExact,
+    };
+  }
+
+  /**
+   * Backtrack the keep-table from the bucket matching `budget`.
+   */
+  private static selectFromTable(table: BucketTable, budget: number): ExactSolverResult {
+    const { items, costs, values, keep, granularity, width, slotLayers, limitedTo } = table;
+    const limited = limitedTo !== undefined;
+    const firstLayer = limited ? 1 : 0;
+
+    const chosen = new Uint8Array(items.length);
+    let w = Math.min(table.capacity, Math.floor(budget / granularity + EPSILON));
+    let k = limited ? slotLayers : 0;
+    for (let i = items.length - 1; i >= 0 && k >= firstLayer; i--) {
+      const bit = (i * slotLayers + (k - firstLayer)) * width + w;
+      if (keep[bit >> 3] & (1 << (bit & 7))) {
+        chosen[i] = 1;
+        w -= costs[i];
+        if (limited) k--;
+      }
+    }
+
+    if (!table.bucketsExact) {
+      this.fillSlack(items, chosen, values, budget, limitedTo);
+    }
+
+    return this.buildResult(items, chosen, values, 'dp', granularity, table.bucketsExact);
+  }
+
+  /**
+   * Pick the smallest bucket size that keeps the keep-table and DP rows
+   * inside their memory budgets.
+   */
+  private static chooseGranularity(
+    budget: number,
+    itemCount: number,
+    slotLayers: number,
+    requested: number | undefined,
+    maxCells: number
+  ): number {
+    const fits = (granularity: number) => {
+      const width = Math.floor(budget / granularity + EPSILON) + 1;
+      return (
+        itemCount * slotLayers * width <= maxCells &&
+        (slotLayers + 1) * width <= MAX_ROW_CELLS
+      );
+    };
+
+    const minimum = requested && requested > 0 ? requested : GRANULARITY_LADDER[0];
+    if (fits(minimum)) return minimum;
+    for (const granularity of GRANULARITY_LADDER) {
+      if (granularity > minimum && fits(granularity)) return granularity;
+    }
+
+    let granularity = Math.max(minimum, GRANULARITY_LADDER[GRANULARITY_LADDER.length - 1]);
+    while (!fits(granularity)) granularity *= 2;
+    return granularity;
+  }
+
+  /**
+   * Bucketing rounds costs up, which can strand a little budget. Spend it on
+   * the most efficient unselected items that still fit at their true cost.
+   */
+  private static fillSlack(
+    items: OptimizableItem[],
+    chosen: Uint8Array,
+    values: Float64Array,
+    budget: number,
+    maxItems: number | undefined
+  ): void {
+    let spent = 0;
+    let count = 0;
+    for (let i = 0; i < items.length; i++) {
+      if (chosen[i]) {
+        spent += items[i].cost;
+        count++;
+      }
+    }
+
+    const order = this.ratioOrder(items, values);
+    for (const i of order) {
+      if (maxItems !== undefined && count >= maxItems) break;
+      if (chosen[i] || spent + items[i].cost > budget + EPSILON) continue;
+      chosen[i] = 1;
+      spent += items[i].cost;
+      count++;
+    }
+  }
+
+  // ---------------------------------------------------------------------------
+  // Branch and bound
+  // ---------------------------------------------------------------------------
+
+  /**
+   * Depth-first branch-and-bound on exact costs.
+   * Items are visited in dependency order so an item is only branched on after
+   * everything it depends on has been decided; excluding a dependency blocks
+   * its dependents. The bound is the fractional relaxation over the remaining
+   * unblocked items, tightened by the top-k values when maxItems binds.
+   * Cyclic dependencies cannot be satisfied in order and are not enforced.
+   */
+  private static branchAndBound(
+    items: OptimizableItem[],
+    budget: number,
+    maxItems: number | undefined,
+    weightOf: (item: OptimizableItem) => number,
+    maxNodes: number
+  ): ExactSolverResult {
+    const order = this.dependencyOrder(items);
+    const ordered = order.map((index) => items[index]);
+    const n = ordered.length;
+
+    const positionById = new Map<string, number>();
+    ordered.forEach((item, position) => positionById.set(item.id, position));
+
+    const costs = new Float64Array(n);
+    const values = new Float64Array(n);
+    const deps: number[][] = [];
+    for (let p = 0; p < n; p++) {
+      costs[p] = ordered[p].cost;
+      values[p] = weightOf(ordered[p]);
+      const depPositions: number[] = [];
+      for (const depId of ordered[p].dependencies ?? []) {
+        const depPosition = positionById.get(depId);
+        if (depPosition !== undefined && depPosition < p) depPositions.push(depPosition);
+      }
+      deps.push(depPositions);
+    }
+
+    const isDependency = new Uint8Array(n);
+    for (const depPositions of deps) {
+      for (const d of depPositions) isDependency[d] = 1;
+    }
+
+    const byRatio = this.ratioOrder(ordered, values);
+    const byValue = Array.from({ length: n }, (_, p) => p).sort((a, b) => values[b] - values[a]);
+    const slotLimit = maxItems !== undefined && maxItems < n ? maxItems : n;
+
+    // 0 = undecided, 1 = included, 2 = excluded
+    const state = new Uint8Array(n);
+    const best = this.greedyIncumbent(costs, values, deps, byRatio, budget, slotLimit);
+    let bestValue = best.value;
+    let bestState = best.state;
+    let nodes = 0;
+    let exhausted = true;
+
+    const blocked = (p: number) => deps[p].some((d) => state[d] === 2);
+
+    const bound = (from: number, capacity: number, slots: number) => {
+      let fractional = 0;
+      let remaining = capacity;
+      for (const p of byRatio) {
+        if (p < from || values[p] <= 0 || blocked(p)) continue;
+        if (costs[p] <= remaining) {
+          fractional += values[p];
+          remaining -= costs[p];
+        } else {
+          fractional += (values[p] * remaining) / costs[p];
+          break;
+        }
+      }
+      if (slots >= n - from) return fractional;
+
+      let topK = 0;
+      let taken = 0;
+      for (const p of byValue) {
+        if (taken >= slots || values[p] <= 0) break;
+        if (p < from || blocked(p)) continue;
+        topK += values[p];
+        taken++;
+      }
+      return Math.min(fractional, topK);
+    };
+
+    const search = (p: number, cost: number, value: number, count: number): void => {
+      if (++nodes > maxNodes) {
+        exhausted = false;
+        return;
+      }
+      if (value > bestValue + EPSILON) {
+        bestValue = value;
+        bestState = state.slice();
+      }
+      if (p >= n || count >= slotLimit) return;
+      if (value + bound(p, budget - cost, slotLimit - count) <= bestValue + EPSILON) return;
+
+      const worthIncluding = values[p] > 0 || isDependency[p] === 1;
+      if (worthIncluding && cost + costs[p] <= budget + EPSILON && deps[p].every((d) => state[d] === 1)) {
+        state[p] = 1;
+        search(p + 1, cost + costs[p], value + values[p], count + 1);
+        state[p] = 0;
+        if (!exhausted) return;
+      }
+
+      state[p] = 2;
+      search(p + 1, cost, value, count);
+      state[p] = 0;
+    };
+
+    search(0, 0, 0, 0);
+
+    const chosen = new Uint8Array(n);
+    for (let p = 0; p < n; p++) chosen[p] = bestState[p] === 1 ? 1 : 0;
+    return this.buildResult(ordered, chosen, values, 'branch-and-bound', 0, exhausted);
+  }
+
+  /**
+   * Dependency-first ordering (Kahn's algorithm over in-set dependencies).
+   * Items left over by a cycle are appended in input order.
+   */
+  private static dependencyOrder(items: OptimizableItem[]): number[] {
+    const indexById = new Map<string, number>();
+    items.forEach((item, index) => indexById.set(item.id, index));
+
+    const inDegree = new Int32Array(items.length);
+    const dependents: number[][] = items.map(() => []);
+    items.forEach((item, index) => {
+      for (const depId of new Set(item.dependencies ?? [])) {
+        const depIndex = indexById.get(depId);
+        if (depIndex === undefined || depIndex === index) continue;
+        dependents[depIndex].push(index);
+        inDegree[index]++;
+      }
+    });
+
+    const order: number[] = [];
+    for (let index = 0; index < items.length; index++) {
+      if (inDegree[index] === 0) order.push(index);
+    }
+    for (let head = 0; head < order.length; head++) {
+      for (const dependent of dependents[order[head]]) {
+        if (--inDegree[dependent] === 0) order.push(dependent);
+      }
+    }
+
+    if (order.length < items.length) {
+      const placed = new Uint8Array(items.length);
+      for (const index of order) placed[index] = 1;
+      for (let index = 0; index < items.length; index++) {
+        if (!placed[index]) order.push(index);
+      }
+    }
+    return order;
+  }
+
+  /**
+   * Dependency-feasible greedy selection used to seed the incumbent.
+   */
+  private static greedyIncumbent(
+    costs: Float64Array,
+    values: Float64Array,
+    deps: number[][],
+    byRatio: number[],
+    budget: number,
+    slotLimit: number
+  ): { value: number; state: Uint8Array } {
+    const state = new Uint8Array(costs.length);
+    let spent = 0;
+    let value = 0;
+    let count = 0;
+    let added = true;
+
+    while (added && count < slotLimit) {
+      added = false;
+      for (const p of byRatio) {
+        if (count >= slotLimit) break;
+        if (state[p] === 1 || values[p] <= 0 || spent + costs[p] > budget + EPSILON) continue;
+        if (!deps[p].every((d) => state[d] === 1)) continue;
+        state[p] = 1;
+        spent += costs[p];
+        value += values[p];
+        count++;
+        added = true;
+      }
+    }
+    return { value, state };
+  }
+
+  // ---------------------------------------------------------------------------
+  // Helpers
+  // ---------------------------------------------------------------------------
+
+  private static emptyResult(): ExactSolverResult {
+    return { selectedItems: [], totalCost: 0, weightedValue: 0, method: 'dp', granularity: 0, provenOptimal: true };
+  }
+
+  private static ratioOrder(items: OptimizableItem[], values: Float64Array): number[] {
+    const ratio = (i: number) =>
+      items[i].cost > 0 ? values[i] / items[i].cost : values[i] > 0 ? Number.MAX_VALUE : 0;
+    return Array.from({ length: items.length }, (_, i) => i).sort((a, b) => ratio(b) - ratio(a));
+  }
+
+  private static buildResult(
+    items: OptimizableItem[],
+    chosen: Uint8Array,
+    values: Float64Array,
+    method: ExactSolverMethod,
+    granularity: number,
+    provenOptimal: boolean
+  ): ExactSolverResult {
+    const selectedItems: OptimizableItem[] = [];
+    let totalCost = 0;
+    let weightedValue = 0;
+    for (let i = 0; i < items.length; i++) {
+      if (!chosen[i]) continue;
+      selectedItems.push(items[i]);
+      totalCost += items[i].cost;
+      weightedValue += values[i];
+    }
+    return { selectedItems, totalCost, weightedValue, method, granularity, provenOptimal };
+  }
+}
+
+// =============================================================================
+// EXPORTS
+// =============================================================================
+
+export type { ExactSolverOptions, ExactSolverResult, ExactSolverMethod, BudgetCurve };
@@ -7,12 +7,17 @@ import {
   BudgetOptimizer,
   OptimizableItem,
   OptimizationResult,
-  OptimizationOptions
+  OptimizationOptions,
+  OptimizationSolver
 } from './budget-optimizer';
 import { 
   ScenarioStrategy,
   ScenarioResult,
   ScenarioGenerationOptions,
+  ScenarioBatchOptions,
+  ScenarioBatchResult,
+  ScenarioComparisonMatrix,
+  EfficiencyFrontierPoint,
   SCENARIO_STRATEGIES,
   ScenarioError
 } from '@/types/scenario';
@@ -21,15 +26,104 @@ import {
 // STRATEGY PRESETS
 // =============================================================================
 
+/**
+ * What a strategy maximizes under the `exact` solver.
+ * Strategies with the same objective and constraints share one solve.
+ */
+type StrategyObjective = 'value' | 'speed' | 'balanced';
+
 /**
  * Configuration for each optimization strategy
  */
 interface StrategyConfig {
   name: string;
   description: string;
-  optimize: (items: OptimizableItem[], options: OptimizationOptions) => OptimizationResult;
+  objective: StrategyObjective;
+  /** Item ordering fed to the per-budget `dp` and `greedy` solvers */
+  order: (items: OptimizableItem[]) => OptimizableItem[];
+  /** Optimizer settings the strategy imposes */
+  constraints: (items: OptimizableItem[]) => Partial<OptimizationOptions>;
 }
 
+/** Scenarios are read off one value-by-budget curve unless a solver is requested */
+const DEFAULT_SOLVER: OptimizationSolver = 'exact';
+
+const PRIORITY_BONUS: Record<OptimizableItem['priority'], number> = {
+  must: 100,
+  should: 75,
+  could: 50,
+  nice: 25
+};
+
+// Estimate duration based on cost (simple heuristic): $1000 per day
+const estimateDays = (item: OptimizableItem): number => Math.ceil(item.cost / 1000);
+
+// Estimate risk penalty (higher cost = higher risk), max 50%
+const riskPenalty = (item: OptimizableItem): number => Math.min(item.cost / 10000, 0.5);
+
+/**
+ * Value multipliers that turn each objective into knapsack values.
+ * `speed` scores value per estimated day; `balanced` rewards priority and
+ * discounts risky (expensive) items, mirroring BY_SPEED and BY_BALANCED_SCORE.
+ */
+const OBJECTIVE_WEIGHTS: Record<StrategyObjective, ((item: OptimizableItem) => number) | undefined> = {
+  value: undefined,
+  speed: item => 1 / Math.max(estimateDays(item), 1),
+  balanced: item => (1 + (PRIORITY_BONUS[item.priority] || 0) / 100) * (1 - riskPenalty(item))
+};
+
+const MUST_HAVES_FIRST = (): Partial<OptimizationOptions> => ({
+  prioritizeMustHaves: true,
+  respectDependencies: true
+});
+
+const SPEED_OVER_MUST_HAVES = (items: OptimizableItem[]): Partial<OptimizationOptions> => ({
+  prioritizeMustHaves: false, // Speed over must-haves
+  respectDependencies: true,
+  maxItems: Math.min(items.length, 10) // Limit items for speed
+});
+
+/**
+ * Sort items by value-to-cost ratio (efficiency)
+ */
+const BY_ROI = (items: OptimizableItem[]): OptimizableItem[] =>
+  [...items].sort((a, b) => {
+    const ratioA = a.cost > 0 ? a.value / a.cost : 0;
+    const ratioB = b.cost > 0 ? b.value / b.cost : 0;
+    return ratioB - ratioA;
+  });
+
+/**
+ * Prioritize items that are quick to complete and high value
+ */
+const BY_SPEED = (items: OptimizableItem[]): OptimizableItem[] =>
+  [...items].sort((a, b) => {
+    const daysA = estimateDays(a);
+    const daysB = estimateDays(b);
+    
+    // Score: value per day (higher is better)
+    const scoreA = daysA > 0 ? a.value / daysA : a.value;
+    const scoreB = daysB > 0 ? b.value / daysB : b.value;
+    
+    return scoreB - scoreA;
+  });
+
+/**
+ * Create a balanced score that considers multiple factors
+ */
+const BY_BALANCED_SCORE = (items: OptimizableItem[]): OptimizableItem[] =>
+  items.map(item => {
+    const efficiency = item.cost > 0 ? item.value / item.cost : 0;
+    const priorityBonus = PRIORITY_BONUS[item.priority] || 0;
+    
+    return {
+      ...item,
+      balancedScore: (efficiency * 100) + priorityBonus - (riskPenalty(item) * 50)
+    };
+  }).sort((a, b) => b.balancedScore - a.balancedScore);
+
+const AS_GIVEN = (items: OptimizableItem[]): OptimizableItem[] => items;
+
 /**
  * Predefined optimization strategies
  */
@@ -37,99 +131,42 @@ const STRATEGY_CONFIGS: Record<ScenarioStrategy, StrategyConfig> = {
   [SCENARIO_STRATEGIES.MAXIMIZE_ROI]: {
     name: 'Maximize ROI',
     description: 'Prioritizes items with highest value-to-cost ratio',
-    optimize: (items: OptimizableItem[], options: OptimizationOptions) => {
-      // Sort items by value-to-cost ratio (efficiency)
-      const sortedItems = [...items].sort((a, b) => {
-        const ratioA = a.cost > 0 ? a.value / a.cost : 0;
-        const ratioB = b.cost > 0 ? b.value / b.cost : 0;
-        return ratioB - ratioA;
-      });
-
-      return BudgetOptimizer.optimize(sortedItems, {
-        ...options,
-        prioritizeMustHaves: true,
-        respectDependencies: true
-      });
-    }
+    objective: 'value',
+    order: BY_ROI,
+    constraints: MUST_HAVES_FIRST
   },
 
   [SCENARIO_STRATEGIES.FASTEST_TIMELINE]: {
     name: 'Fastest Timeline',
     description: 'Focuses on items that minimize total project duration',
-    optimize: (items: OptimizableItem[], options: OptimizationOptions) => {
-      // For fastest timeline, we need to consider item durations
-      // Prioritize items that are quick to complete and high value
-      const sortedItems = [...items].sort((a, b) => {
-        // Estimate duration based on cost (simple heuristic)
-        const daysA = Math.ceil(a.cost / 1000); // Rough estimate: $1000 per day
-        const daysB = Math.ceil(b.cost / 1000);
-        
-        // Score: value per day (higher is better)
-        const scoreA = daysA > 0 ? a.value / daysA : a.value;
-        const scoreB = daysB > 0 ? b.value / daysB : b.value;
-        
-        return scoreB - scoreA;
-      });
-
-      return BudgetOptimizer.optimize(sortedItems, {
-        ...options,
-        prioritizeMustHaves: false, // Speed over must-haves
-        respectDependencies: true,
-        maxItems: Math.min(items.length, 10) // Limit items for speed
-      });
-    }
+    objective: 'speed',
+    order: BY_SPEED,
+    constraints: SPEED_OVER_MUST_HAVES
   },
 
   [SCENARIO_STRATEGIES.ALL_MUST_HAVES]: {
     name: 'All Must-Haves',
     description: 'Ensures all must-have items are included first, then optimizes remaining budget',
-    optimize: (items: OptimizableItem[], options: OptimizationOptions) => {
-      return BudgetOptimizer.optimize(items, {
-        ...options,
-        prioritizeMustHaves: true,
-        respectDependencies: true
-      });
-    }
+    objective: 'value',
+    order: AS_GIVEN,
+    constraints: MUST_HAVES_FIRST
   },
 
   [SCENARIO_STRATEGIES.BALANCED]: {
     name: 'Balanced Approach',
     description: 'Balances cost, value, timeline, and risk considerations',
-    optimize: (items: OptimizableItem[], options: OptimizationOptions) => {
-      // Create a balanced score that considers multiple factors
-      const scoredItems = items.map(item => {
-        const efficiency = item.cost > 0 ? item.value / item.cost : 0;
-        const priorityBonus = {
-          must: 100,
-          should: 75,
-          could: 50,
-          nice: 25
-        }[item.priority] || 0;
-        
-        // Estimate risk penalty (higher cost = higher risk)
-        const riskPenalty = Math.min(item.cost / 10000, 0.5); // Max 50% penalty
-        
-        return {
-          ...item,
-          balancedScore: (efficiency * 100) + priorityBonus - (riskPenalty * 50)
-        };
-      }).sort((a, b) => b.balancedScore - a.balancedScore);
-
-      return BudgetOptimizer.optimize(scoredItems, {
-        ...options,
-        prioritizeMustHaves: true,
-        respectDependencies: true
-      });
-    }
+    objective: 'balanced',
+    order: BY_BALANCED_SCORE,
+    constraints: MUST_HAVES_FIRST
   },
 
   [SCENARIO_STRATEGIES.CUSTOM]: {
     name: 'Custom Selection',
     description: 'User-defined item selection',
-    optimize: (items: OptimizableItem[], options: OptimizationOptions) => {
-      // For custom strategy, just validate the selection
-      return BudgetOptimizer.optimize(items, options);
-    }
+    objective: 'value',
+    order: AS_GIVEN,
+    // For custom strategy without a selection, optimize with the caller's settings
+    constraints: () => ({})
   }
 };
 
@@ -153,7 +190,6 @@ export class ScenarioEngine {
 
     try {
       let optimizationResult: OptimizationResult;
-      let timelineDays = 0;
       let itemsExcluded: OptimizableItem[] = [];
       const warnings: string[] = [];
 
@@ -191,49 +227,17 @@ export class ScenarioEngine {
           throw new ScenarioError(`Unknown strategy: ${strategy}`, 'VALIDATION_ERROR');
         }
 
-        const optimizationOptions: OptimizationOptions = {
-          budget: budgetAmount,
-          respectDependencies,
-          maxItems
-        };
-
-        optimizationResult = strategyConfig.optimize(items, optimizationOptions);
+        [optimizationResult] = this.optimizeStrategy(
+          strategyConfig,
+          items,
+          [budgetAmount],
+          { respectDependencies, maxItems },
+          DEFAULT_SOLVER
+        );
         itemsExcluded = optimizationResult.unselectedItems;
       }
 
-      // Calculate timeline estimate
-      timelineDays = this.estimateTimeline(optimizationResult.selectedItems);
-
-      // Add warnings based on results
-      if (optimizationResult.totalCost > budgetAmount) {
-        warnings.push('Selection exceeds budget');
-      }
-      
-      if (!optimizationResult.summary.mustHavesCovered) {
-        warnings.push('Not all must-have items are included');
-      }
-
-      const mustHaveItems = items.filter(item => item.priority === 'must');
-      const excludedMustHaves = mustHaveItems.filter(must => 
-        !optimizationResult.selectedItems.some(selected => selected.id === must.id)
-      );
-      
-      if (excludedMustHaves.length > 0) {
-        warnings.push(`${excludedMustHaves.length} must-have item(s) excluded due to budget constraints`);
-      }
-
-      return {
-        ...optimizationResult,
-        strategy,
-        budgetAmount,
-        budgetRemaining: budgetAmount - optimizationResult.totalCost,
-        timelineDays,
-        metadata: {
-          generatedAt: new Date().toISOString(),
-          itemsExcluded,
-          warnings
-        }
-      };
+      return this.buildScenarioResult(optimizationResult, items, strategy, budgetAmount, itemsExcluded, warnings);
 
     } catch (error) {
       if (error instanceof ScenarioError) {
@@ -260,18 +264,13 @@ export class ScenarioEngine {
       SCENARIO_STRATEGIES.BALANCED
     ]
   ): Record<ScenarioStrategy, ScenarioResult> {
+    const batch = this.generateScenarioBatch({ items, budgets: [budgetAmount], strategies });
     const results: Record<string, ScenarioResult> = {};
 
     for (const strategy of strategies) {
-      try {
-        results[strategy] = this.generateScenario({
-          budgetAmount,
-          strategy,
-          items,
-          respectDependencies: true
-        });
-      } catch (error) {
-        console.warn(`Failed to generate ${strategy} scenario:`, error);
+      const scenarios = batch.scenarios[strategy];
+      if (scenarios) {
+        results[strategy] = scenarios[0];
       }
     }
 
@@ -286,16 +285,240 @@ export class ScenarioEngine {
     baseStrategy: ScenarioStrategy,
     budgetVariations: number[]
   ): ScenarioResult[] {
-    return budgetVariations.map(budget => 
-      this.generateScenario({
-        budgetAmount: budget,
-        strategy: baseStrategy,
-        items,
-        respectDependencies: true
-      })
+    if (budgetVariations.length === 0) return [];
+
+    const batch = this.generateScenarioBatch({
+      items,
+      budgets: budgetVariations,
+      strategies: [baseStrategy]
+    });
+
+    const scenarios = batch.scenarios[baseStrategy];
+    if (!scenarios) {
+      throw new ScenarioError(
+        `Failed to generate scenario: ${batch.errors[baseStrategy] ?? 'Unknown error'}`,
+        'OPTIMIZATION_ERROR',
+        { strategy: baseStrategy, budgetVariations }
+      );
+    }
+
+    return scenarios;
+  }
+
+  /**
+   * Generate scenarios for every strategy at every budget.
+   * With the default `exact` solver each strategy's objective becomes value
+   * weights, and strategies with the same objective and constraints (Maximize
+   * ROI and All Must-Haves) share one value-by-budget curve that every budget
+   * is read off. `dp` and `greedy` solve each strategy at each budget on its
+   * item ordering. A failing strategy is reported in `errors` without failing
+   * the batch.
+   */
+  static generateScenarioBatch(options: ScenarioBatchOptions): ScenarioBatchResult {
+    const {
+      items,
+      budgets,
+      strategies = [
+        SCENARIO_STRATEGIES.MAXIMIZE_ROI,
+        SCENARIO_STRATEGIES.FASTEST_TIMELINE,
+        SCENARIO_STRATEGIES.ALL_MUST_HAVES,
+        SCENARIO_STRATEGIES.BALANCED
+      ],
+      respectDependencies = true,
+      maxItems,
+      solver = DEFAULT_SOLVER
+    } = options;
+
+    if (budgets.length === 0 || budgets.some(budget => !Number.isFinite(budget) || budget < 0)) {
+      throw new ScenarioError('Budgets must be non-negative numbers', 'VALIDATION_ERROR', { budgets });
+    }
+
+    const scenarios: ScenarioBatchResult['scenarios'] = {};
+    const frontiers: ScenarioBatchResult['frontiers'] = {};
+    const errors: ScenarioBatchResult['errors'] = {};
+    const solved = new Map<string, OptimizationResult[]>();
+
+    for (const strategy of strategies) {
+      try {
+        const strategyConfig = STRATEGY_CONFIGS[strategy];
+        if (!strategyConfig) {
+          throw new ScenarioError(`Unknown strategy: ${strategy}`, 'VALIDATION_ERROR');
+        }
+
+        // Only the curve solver ignores item ordering, so only it can share solves
+        const solveKey = solver === 'exact'
+          ? JSON.stringify([strategyConfig.objective, strategyConfig.constraints(items)])
+          : strategy;
+        let results = solved.get(solveKey);
+        if (!results) {
+          results = this.optimizeStrategy(strategyConfig, items, budgets, { respectDependencies, maxItems }, solver);
+          solved.set(solveKey, results);
+        }
+
+        const strategyScenarios = results.map((result, index) =>
+          this.buildScenarioResult(result, items, strategy, budgets[index], result.unselectedItems, [])
+        );
+        scenarios[strategy] = strategyScenarios;
+        frontiers[strategy] = this.buildFrontier(strategyScenarios);
+      } catch (error) {
+        console.warn(`Failed to generate ${strategy} scenarios:`, error);
+        errors[strategy] = error instanceof Error ? error.message : 'Unknown error';
+      }
+    }
+
+    const columns = strategies.flatMap(strategy =>
+      (scenarios[strategy] ?? []).map(scenario => ({
+        key: `${strategy}@${scenario.budgetAmount}`,
+        selectedItemIds: scenario.selectedItems.map(item => item.id)
+      }))
+    );
+
+    return {
+      budgets,
+      scenarios,
+      frontiers,
+      comparison: this.buildComparisonMatrix(columns, items),
+      errors
+    };
+  }
+
+  /**
+   * Optimize one strategy at each budget, in the order of `budgets`.
+   * `exact` builds a single curve via BudgetOptimizer.optimizeForBudgets;
+   * other solvers run one optimization per budget.
+   */
+  private static optimizeStrategy(
+    strategyConfig: StrategyConfig,
+    items: OptimizableItem[],
+    budgets: number[],
+    settings: Pick<OptimizationOptions, 'respectDependencies' | 'maxItems'>,
+    solver: OptimizationSolver
+  ): OptimizationResult[] {
+    const strategyOptions: Omit<OptimizationOptions, 'budget'> = {
+      ...settings,
+      ...strategyConfig.constraints(items)
+    };
+
+    if (solver === 'exact') {
+      return BudgetOptimizer.optimizeForBudgets(items, budgets, {
+        ...strategyOptions,
+        valueWeight: OBJECTIVE_WEIGHTS[strategyConfig.objective]
+      });
+    }
+
+    const orderedItems = strategyConfig.order(items);
+    return budgets.map(budget =>
+      BudgetOptimizer.optimize(orderedItems, { ...strategyOptions, budget, solver })
     );
   }
 
+  /**
+   * Build an item-by-scenario inclusion matrix.
+   * Rows cover every item selected by at least one scenario, in order of
+   * first appearance; lookups go through an id index rather than list scans.
+   */
+  static buildComparisonMatrix(
+    scenarios: Array<{ key: string; selectedItemIds: string[] }>,
+    items: OptimizableItem[]
+  ): ScenarioComparisonMatrix {
+    const itemsById = new Map(items.map(item => [item.id, item]));
+    const rowIndex = new Map<string, number>();
+    const rows: ScenarioComparisonMatrix['rows'] = [];
+
+    scenarios.forEach((scenario, column) => {
+      for (const itemId of scenario.selectedItemIds) {
+        let rowNumber = rowIndex.get(itemId);
+        if (rowNumber === undefined) {
+          rowNumber = rows.length;
+          rowIndex.set(itemId, rowNumber);
+          rows.push({
+            itemId,
+            item: itemsById.get(itemId),
+            includedIn: new Array(scenarios.length).fill(false),
+            inclusionCount: 0
+          });
+        }
+
+        const row = rows[rowNumber];
+        if (!row.includedIn[column]) {
+          row.includedIn[column] = true;
+          row.inclusionCount++;
+        }
+      }
+    });
+
+    return {
+      scenarioKeys: scenarios.map(scenario => scenario.key),
+      rows,
+      rowIndex
+    };
+  }
+
+  /**
+   * Value-by-budget points in ascending budget order
+   */
+  private static buildFrontier(scenarios: ScenarioResult[]): EfficiencyFrontierPoint[] {
+    const sorted = [...scenarios].sort((a, b) => a.budgetAmount - b.budgetAmount);
+
+    return sorted.map((scenario, index) => {
+      const previous = index > 0 ? sorted[index - 1] : undefined;
+      const costDelta = previous ? scenario.totalCost - previous.totalCost : scenario.totalCost;
+      const valueDelta = previous ? scenario.totalValue - previous.totalValue : scenario.totalValue;
+
+      return {
+        budgetAmount: scenario.budgetAmount,
+        totalCost: scenario.totalCost,
+        totalValue: scenario.totalValue,
+        itemCount: scenario.summary.itemCount,
+        marginalValuePerDollar: costDelta > 0 ? valueDelta / costDelta : 0
+      };
+    });
+  }
+
+  /**
+   * Attach timeline, warnings and metadata to an optimization result
+   */
+  private static buildScenarioResult(
+    optimizationResult: OptimizationResult,
+    items: OptimizableItem[],
+    strategy: ScenarioStrategy,
+    budgetAmount: number,
+    itemsExcluded: OptimizableItem[],
+    warnings: string[]
+  ): ScenarioResult {
+    // Calculate timeline estimate
+    const timelineDays = this.estimateTimeline(optimizationResult.selectedItems);
+
+    // Add warnings based on results
+    if (optimizationResult.totalCost > budgetAmount) {
+      warnings.push('Selection exceeds budget');
+    }
+    
+    if (!optimizationResult.summary.mustHavesCovered) {
+      warnings.push('Not all must-have items are included');
+    }
+
+    const selectedIds = new Set(optimizationResult.selectedItems.map(item => item.id));
+    const excludedMustHaves = items.filter(item => item.priority === 'must' && !selectedIds.has(item.id));
+    
+    if (excludedMustHaves.length > 0) {
+      warnings.push(`${excludedMustHaves.length} must-have item(s) excluded due to budget constraints`);
+    }
+
+    return {
+      ...optimizationResult,
+      strategy,
+      budgetAmount,
+      budgetRemaining: budgetAmount - optimizationResult.totalCost,
+      timelineDays,
+      metadata: {
+        generatedAt: new Date().toISOString(),
+        itemsExcluded,
+        warnings
+      }
+    };
+  }
+
   /**
    * Estimate project timeline based on selected items
    */
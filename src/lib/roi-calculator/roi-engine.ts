@@ -3,8 +3,15 @@ import {
   ROICalculationResult, 
   ROIScenario, 
   CashFlowProjection,
-  ROIComparison 
+  ROIComparison,
+  ROIRiskSimulationResult
 } from './types'
+import { simulateDealRisk } from '@/lib/financing/risk-simulation'
+import type { RiskDealModel, RiskSimulationOptions } from '@/lib/financing/types'
+
+const AIRBNB_SIMULATION_WARNING =
+  'Airbnb risk simulation includes purchase, rehab and holding costs and the sale at ARV; ' +
+  'the ROI figures count short-term rental income only, so the two will differ'
 
 /**
  * Advanced ROI Calculation Engine
@@ -312,7 +319,7 @@ export class ROICalculationEngine {
     }
     
     // Market-based insights
-    const equityPosition = (arv - input.purchasePrice - input.totalRehabCost) / arv
+    const equityPosition = (input.arv - input.purchasePrice - input.totalRehabCost) / input.arv
     if (equityPosition < 0.2) {
       warnings.push("Low equity position - limited safety margin")
     } else if (equityPosition > 0.4) {
@@ -395,6 +402,69 @@ export class ROICalculationEngine {
     }
   }
   
+  /**
+   * Deal model for risk simulation, using the same cost assumptions as calculateROI.
+   * Airbnb is simulated like a rental with short-term income, i.e. including the
+   * costs and the exit that calculateROI leaves out for that strategy.
+   */
+  static toRiskModel(input: ROICalculationInput): RiskDealModel {
+    const {
+      purchasePrice,
+      arv,
+      totalRehabCost,
+      strategy,
+      holdPeriodMonths = 6,
+      monthlyRent = 0,
+      vacancy = 5,
+      propertyManagement = 8,
+      downPayment = 0,
+      loanAmount = 0,
+      interestRate = 7
+    } = input
+    
+    let monthlyIncome = 0
+    if (strategy === 'rental') {
+      monthlyIncome = this.calculateRentalCashFlow(monthlyRent, purchasePrice, vacancy, propertyManagement)
+    } else if (strategy === 'airbnb') {
+      monthlyIncome = this.calculateRentalCashFlow(monthlyRent * 1.5, purchasePrice, vacancy * 1.5, 15)
+    }
+    
+    return {
+      purchasePrice,
+      arv,
+      rehabCost: totalRehabCost,
+      holdMonths: holdPeriodMonths,
+      loanAmount,
+      interestRate,
+      loanTermMonths: 30 * 12,
+      loanPayment: 'amortized',
+      upfrontCosts: purchasePrice * 0.03 + downPayment, // acquisition costs + down payment, as in calculateROI
+      monthlyCarry: this.calculateHoldingCosts(purchasePrice, 0, 0, 1),
+      monthlyIncome,
+      saleShare: strategy === 'wholetail' ? 0.9 : 1,
+      sellingCostsRate: strategy === 'wholetail' ? 0.04 : 0.08,
+      investmentBasis: 'all_in',
+      cashInvested: 0
+    }
+  }
+  
+  /**
+   * Monte Carlo risk analysis: percentile bands, probability of loss and
+   * tornado sensitivities over ARV, rehab overrun, holding months and rate.
+   * The zero-variance base case equals calculateROI except for airbnb, which
+   * is flagged through `matchesCalculateROI` and `warnings`.
+   */
+  static simulateRisk(input: ROICalculationInput, options: RiskSimulationOptions = {}): ROIRiskSimulationResult {
+    const simulation = simulateDealRisk(this.toRiskModel(input), options)
+    const matchesCalculateROI = input.strategy !== 'airbnb'
+    
+    return {
+      ...simulation,
+      matchesCalculateROI,
+      warnings: matchesCalculateROI ? [] : [AIRBNB_SIMULATION_WARNING]
+    }
+  }
+  
   /**
    * Project detailed cash flow month by month
    */
@@ -1,3 +1,5 @@
+import type { RiskSimulationResult } from '@/lib/financing/types'
+
 // ROI Calculation Types
 export interface ROICalculationInput {
   // Property financials
@@ -70,6 +72,12 @@ export interface ROICalculationResult {
   warnings: string[]
 }
 
+export interface ROIRiskSimulationResult extends RiskSimulationResult {
+  // False when the simulated deal is not the one calculateROI prices (airbnb)
+  matchesCalculateROI: boolean
+  warnings: string[]
+}
+
 export interface ROIScenario {
   arv: number
   rehabCost: number
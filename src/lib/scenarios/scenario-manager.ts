@@ -7,7 +7,7 @@
  */
 
 import { v4 as uuidv4 } from 'uuid';
-import { BudgetOptimizer, type OptimizableItem } from '@/lib/priority-engine';
+import { BudgetOptimizer, ScenarioEngine, type OptimizableItem } from '@/lib/priority-engine';
 import type {
   BudgetScenario,
   ScenarioType,
@@ -280,24 +280,17 @@ export class ScenarioManager {
     };
 
     // Generate item comparison
-    const allUniqueItemIds = Array.from(
-      new Set(
-        scenarios.flatMap(scenario => scenario.result.selectedItemIds)
-      )
+    const matrix = ScenarioEngine.buildComparisonMatrix(
+      scenarios.map(scenario => ({ key: scenario.id, selectedItemIds: scenario.result.selectedItemIds })),
+      allItems
     );
+    const allUniqueItemIds = matrix.rows.map(row => row.itemId);
 
-    const itemComparison = allUniqueItemIds.map(itemId => {
-      const item = allItems.find(i => i.id === itemId);
-      const includedInScenarios = scenarios
-        .filter(scenario => scenario.result.selectedItemIds.includes(itemId))
-        .map(scenario => scenario.id);
-
-      return {
-        itemId,
-        itemName: item?.name || 'Unknown Item',
-        includedInScenarios,
-      };
-    });
+    const itemComparison = matrix.rows.map(row => ({
+      itemId: row.itemId,
+      itemName: row.item?.name || 'Unknown Item',
+      includedInScenarios: matrix.scenarioKeys.filter((_, column) => row.includedIn[column]),
+    }));
 
     // Find difference items (items only in one scenario)
     const differenceItems = itemComparison
@@ -353,9 +346,13 @@ export class ScenarioManager {
     this.initialize();
 
     const comparison = this.compareScenarios(scenarioIds, allItems);
+    const itemsById = new Map(allItems.map(item => [item.id, item]));
+    const selectedSets = comparison.scenarios.map(
+      scenario => new Set(scenario.result.selectedItemIds)
+    );
     
     return comparison.allUniqueItemIds.map(itemId => {
-      const item = allItems.find(i => i.id === itemId);
+      const item = itemsById.get(itemId);
       if (!item) {
         return {
           id: itemId,
@@ -368,8 +365,8 @@ export class ScenarioManager {
       }
 
       const includedIn: { [scenarioId: string]: boolean } = {};
-      comparison.scenarios.forEach(scenario => {
-        includedIn[scenario.id] = scenario.result.selectedItemIds.includes(itemId);
+      comparison.scenarios.forEach((scenario, index) => {
+        includedIn[scenario.id] = selectedSets[index].has(itemId);
       });
 
       return {
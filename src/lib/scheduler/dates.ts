@@ -1,4 +1,5 @@
-import { differenceInCalendarDays, format, isValid, parseISO } from "date-fns";
+import { addDays, differenceInCalendarDays, format, isValid, parseISO } from "date-fns";
+import { WorkingCalendar } from "@/lib/timeline/calendar";
 
 /**
  * Date / money / percentage helpers for the scheduler.
@@ -42,6 +43,24 @@ export function daysBetween(aIso: string, bIso: string) {
   return differenceInCalendarDays(toDate(bIso), toDate(aIso));
 }
 
+/**
+ * Mon–Fri calendar shared by the scheduler store and views. Tables are built
+ * once and reused, so working-day math is O(1) per call.
+ */
+export const workCalendar = WorkingCalendar.forHolidays([]);
+
+export function isWorkingDay(date: Date) {
+  return workCalendar.isWorkingDay(date);
+}
+
+/**
+ * Move a date by calendar days (negative moves back). Works in local time so
+ * the result never slips a day across the UTC boundary.
+ */
+export function shiftIso(iso: string, days: number) {
+  return format(addDays(toDate(iso), days), "yyyy-MM-dd");
+}
+
 export function fmtMoney(n?: number, opts?: { compact?: boolean }) {
   if (n === undefined || n === null) return "—";
   if (opts?.compact) {
@@ -2,6 +2,7 @@
 
 import { create } from "zustand";
 import { seedData } from "./seed";
+import { shiftIso } from "./dates";
 import type { Person, Phase, Project, Task, TaskStatus } from "./types";
 
 interface SchedulerState {
@@ -55,12 +56,6 @@ export const useScheduler = create<SchedulerState>((set) => ({
     })),
 }));
 
-function shiftIso(iso: string, days: number) {
-  const dt = new Date(`${iso}T00:00:00`);
-  dt.setDate(dt.getDate() + days);
-  return dt.toISOString().slice(0, 10);
-}
-
 /* ---------- selectors / helpers ---------- */
 
 export function useProject(projectId: string) {
@@ -13,7 +13,7 @@
 import { createClient } from '@/lib/supabase/client'
 import { nanoid } from 'nanoid'
 
-const BUCKET_NAME = 'project-photos'
+export const PHOTO_BUCKET = 'project-photos'
 const MAX_FILE_SIZE = 10 * 1024 * 1024 // 10MB
 const ALLOWED_TYPES = ['image/jpeg', 'image/png', 'image/webp', 'image/gif']
 
@@ -40,6 +40,17 @@ export interface PhotoStorageError extends Error {
   code: 'FILE_TOO_LARGE' | 'INVALID_TYPE' | 'UPLOAD_FAILED' | 'NOT_FOUND' | 'PERMISSION_DENIED'
 }
 
+/**
+ * Image transformation used for thumbnails (also used by server-side reports)
+ */
+export function thumbnailTransform(options?: { width?: number; height?: number }) {
+  return {
+    width: options?.width || 300,
+    height: options?.height || 300,
+    resize: 'cover' as const,
+  }
+}
+
 function createStorageError(code: PhotoStorageError['code'], message: string): PhotoStorageError {
   const error = new Error(message) as PhotoStorageError
   error.code = code
@@ -130,7 +141,7 @@ export const photoStorage = {
 
     // Upload to Supabase Storage
     const { data, error } = await supabase.storage
-      .from(BUCKET_NAME)
+      .from(PHOTO_BUCKET)
       .upload(storagePath, file, {
         cacheControl: '31536000', // 1 year cache
         upsert: false,
@@ -167,7 +178,7 @@ export const photoStorage = {
     }
 
     const { data, error } = await supabase.storage
-      .from(BUCKET_NAME)
+      .from(PHOTO_BUCKET)
       .createSignedUrl(path, expiresIn)
 
     if (error) {
@@ -190,17 +201,10 @@ export const photoStorage = {
       throw createStorageError('NOT_FOUND', 'Supabase client not available')
     }
 
-    const width = options?.width || 300
-    const height = options?.height || 300
-
     const { data, error } = await supabase.storage
-      .from(BUCKET_NAME)
+      .from(PHOTO_BUCKET)
       .createSignedUrl(path, 3600, {
-        transform: {
-          width,
-          height,
-          resize: 'cover',
-        },
+        transform: thumbnailTransform(options),
       })
 
     if (error) {
@@ -222,7 +226,7 @@ export const photoStorage = {
     }
 
     const { error } = await supabase.storage
-      .from(BUCKET_NAME)
+      .from(PHOTO_BUCKET)
       .remove([path])
 
     if (error) {
@@ -241,7 +245,7 @@ export const photoStorage = {
     }
 
     const { error } = await supabase.storage
-      .from(BUCKET_NAME)
+      .from(PHOTO_BUCKET)
       .remove(paths)
 
     if (error) {
@@ -260,7 +264,7 @@ export const photoStorage = {
     }
 
     const { data, error } = await supabase.storage
-      .from(BUCKET_NAME)
+      .from(PHOTO_BUCKET)
       .list(projectId, {
         sortBy: { column: 'created_at', order: 'desc' },
       })
@@ -2,6 +2,190 @@ import { supabase } from './client'
 import { RehabProject, PropertyAssessment, ScopeItem, MarketComparable, Recommendation } from '@/types/rehab'
 import { RehabProject as RehabProjectDB, ProjectStatus } from '@/types/database'
 
+// Bulk writes are split so each request stays well under PostgREST payload limits
+const MAX_ROWS_PER_REQUEST = 500
+const MAX_BYTES_PER_REQUEST = 1_000_000
+// Ids travel in the query string for deletes, so keep those batches smaller
+const MAX_IDS_PER_DELETE = 200
+
+// Projects fetched per round trip when paging through the list
+const PROJECT_PAGE_SIZE = 200
+
+// Explicit projection for list queries (matches RehabProjectDB, leaves out search_text)
+const PROJECT_LIST_COLUMNS = [
+  'id',
+  'user_id',
+  'property_id',
+  'project_name',
+  'address_street',
+  'address_city',
+  'address_state',
+  'address_zip',
+  'address_place_id',
+  'address_formatted',
+  'address_lat',
+  'address_lng',
+  'square_feet',
+  'year_built',
+  'property_type',
+  'bedrooms',
+  'bathrooms',
+  'investment_strategy',
+  'target_buyer',
+  'hold_period_months',
+  'target_roi',
+  'max_budget',
+  'arv',
+  'purchase_price',
+  'neighborhood_comp_avg',
+  'status',
+  'total_estimated_cost',
+  'total_actual_cost',
+  'estimated_days',
+  'priority_score',
+  'roi_score',
+  'deleted_at',
+  'created_at',
+  'updated_at',
+].join(',')
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i
+
+// Split rows into batches bounded by row count and serialized size
+function chunkRows<T>(rows: T[]): T[][] {
+  const chunks: T[][] = []
+  let current: T[] = []
+  let bytes = 0
+
+  for (const row of rows) {
+    const size = JSON.stringify(row).length
+    if (current.length > 0 && (current.length >= MAX_ROWS_PER_REQUEST || bytes + size > MAX_BYTES_PER_REQUEST)) {
+      chunks.push(current)
+      current = []
+      bytes = 0
+    }
+    current.push(row)
+    bytes += size
+  }
+  if (current.length > 0) chunks.push(current)
+  return chunks
+}
+
+// Insert rows in chunks, returning the inserted rows in order
+async function insertRows<T>(table: string, rows: Record<string, unknown>[]): Promise<T[]> {
+  const inserted: T[] = []
+  for (const chunk of chunkRows(rows)) {
+    const { data, error } = await supabase.from(table).insert(chunk).select()
+    if (error) throw error
+    inserted.push(...((data ?? []) as T[]))
+  }
+  return inserted
+}
+
+// Upsert rows that carry a database id; rows without one are inserted.
+// Saved rows are returned in input order.
+async function upsertRows<T>(table: string, rows: Record<string, unknown>[]): Promise<T[]> {
+  const existing: Record<string, unknown>[] = []
+  const created: Record<string, unknown>[] = []
+  const existingIndex = new Map<string, number>()
+  const createdIndexes: number[] = []
+  rows.forEach((row, index) => {
+    if (typeof row.id === 'string' && UUID_PATTERN.test(row.id)) {
+      existing.push(row)
+      existingIndex.set(row.id, index)
+    } else {
+      const { id: _id, ...rest } = row
+      created.push(rest)
+      createdIndexes.push(index)
+    }
+  })
+
+  const saved: (T | undefined)[] = new Array(rows.length)
+  for (const chunk of chunkRows(existing)) {
+    const { data, error } = await supabase.from(table).upsert(chunk, { onConflict: 'id' }).select()
+    if (error) throw error
+    for (const row of (data ?? []) as (T & { id: string })[]) {
+      const index = existingIndex.get(row.id)
+      if (index !== undefined) saved[index] = row
+    }
+  }
+  const inserted = await insertRows<T>(table, created)
+  inserted.forEach((row, position) => (saved[createdIndexes[position]] = row))
+  // Rows the database did not return (e.g. hidden by RLS) are left out
+  return saved.filter((row): row is T => row !== undefined)
+}
+
+// Delete rows by id in chunks, returning how many were removed
+async function deleteRows(table: string, ids: string[]): Promise<number> {
+  let deleted = 0
+  for (let start = 0; start < ids.length; start += MAX_IDS_PER_DELETE) {
+    const { error, count } = await supabase
+      .from(table)
+      .delete({ count: 'exact' })
+      .in('id', ids.slice(start, start + MAX_IDS_PER_DELETE))
+    if (error) throw error
+    deleted += count ?? 0
+  }
+  return deleted
+}
+
+// Escape LIKE wildcards so user input matches literally
+function escapeLikePattern(value: string): string {
+  return value.replace(/[\\%_]/g, (char) => `\\${char}`)
+}
+
+// Row mappers shared by single and bulk writes
+function toScopeItemRow(projectId: string, item: ScopeItem) {
+  return {
+    project_id: projectId,
+    category: item.category,
+    subcategory: item.subcategory,
+    item_name: item.itemName,
+    description: item.description,
+    location: item.location,
+    quantity: item.quantity,
+    unit_of_measure: item.unitOfMeasure,
+    material_cost: item.materialCost,
+    labor_cost: item.laborCost,
+    total_cost: item.totalCost,
+    priority: item.priority,
+    roi_impact: item.roiImpact,
+    days_required: item.daysRequired,
+    depends_on: item.dependsOn,
+    phase: item.phase,
+    included: item.included,
+    completed: item.completed
+  }
+}
+
+function toComparableRow(projectId: string, comparable: MarketComparable) {
+  return {
+    project_id: projectId,
+    address: comparable.address,
+    sale_price: comparable.salePrice,
+    sale_date: comparable.saleDate.toISOString().split('T')[0],
+    square_feet: comparable.squareFeet,
+    features: comparable.features,
+    distance_miles: comparable.distanceMiles,
+    similarity_score: comparable.similarityScore
+  }
+}
+
+function toRecommendationRow(projectId: string, recommendation: Recommendation) {
+  return {
+    project_id: projectId,
+    type: recommendation.type,
+    title: recommendation.title,
+    description: recommendation.description,
+    estimated_cost: recommendation.estimatedCost,
+    roi_impact: recommendation.roiImpact,
+    time_impact_days: recommendation.timeImpactDays,
+    market_data: recommendation.marketData,
+    confidence_score: recommendation.confidenceScore,
+    status: recommendation.status
+  }
+}
+
 // Filter options for projects list
 export interface ProjectFilters {
   status?: ProjectStatus | 'all'
@@ -13,6 +197,87 @@ export interface ProjectFilters {
   includeArchived?: boolean
 }
 
+// Position in the projects list (the last project of the previous page)
+export interface ProjectPageCursor {
+  updatedAt: string
+  id: string
+}
+
+export interface ProjectPage {
+  projects: RehabProjectDB[]
+  nextCursor: ProjectPageCursor | null
+}
+
+// One page of the projects list, keyset-paginated on (updated_at DESC, id DESC)
+async function fetchProjectPage(
+  filters: ProjectFilters | undefined,
+  limit: number,
+  cursor: ProjectPageCursor | null
+): Promise<ProjectPage> {
+  let query = supabase
+    .from('rehab_projects')
+    .select(PROJECT_LIST_COLUMNS)
+
+  // Exclude deleted projects unless explicitly requested
+  if (!filters?.includeDeleted) {
+    query = query.is('deleted_at', null)
+  }
+
+  // Exclude archived projects unless explicitly requested
+  if (!filters?.includeArchived) {
+    query = query.neq('status', 'archived')
+  }
+
+  // Apply status filter
+  if (filters?.status && filters.status !== 'all') {
+    query = query.eq('status', filters.status)
+  }
+
+  // Apply strategy filter
+  if (filters?.strategy && filters.strategy !== 'all') {
+    query = query.eq('investment_strategy', filters.strategy)
+  }
+
+  // Apply date range filter
+  if (filters?.dateFrom) {
+    query = query.gte('created_at', filters.dateFrom)
+  }
+  if (filters?.dateTo) {
+    query = query.lte('created_at', filters.dateTo)
+  }
+
+  // Apply search filter (substring match on name + address via the trigram-indexed search_text column)
+  if (filters?.search && filters.search.trim()) {
+    const searchTerm = escapeLikePattern(filters.search.trim().toLowerCase())
+    query = query.ilike('search_text', `%${searchTerm}%`)
+  }
+
+  // Continue after the last project of the previous page
+  if (cursor) {
+    const { updatedAt, id } = cursor
+    query = query.or(
+      `updated_at.lt."${updatedAt}",and(updated_at.eq."${updatedAt}",id.lt.${id})`
+    )
+  }
+
+  const { data, error } = await query
+    .order('updated_at', { ascending: false })
+    .order('id', { ascending: false })
+    .limit(limit)
+
+  if (error) throw error
+
+  const projects = (data ?? []) as unknown as RehabProjectDB[]
+  const last = projects[projects.length - 1]
+  return {
+    projects,
+    nextCursor:
+      projects.length === limit && last?.updated_at
+        ? { updatedAt: last.updated_at, id: last.id }
+        : null,
+  }
+}
+
 // Project operations
 export const projectService = {
   // Create a new project
@@ -69,55 +334,32 @@ export const projectService = {
     }
   },
 
-  // Get all projects for a user (excludes deleted by default)
+  // Get one page of projects, newest first (pass the returned cursor for the next page)
+  async getPage(
+    filters?: ProjectFilters,
+    options: { limit?: number; cursor?: ProjectPageCursor | null } = {}
+  ): Promise<ProjectPage> {
+    try {
+      return await fetchProjectPage(filters, options.limit ?? PROJECT_PAGE_SIZE, options.cursor ?? null)
+    } catch (error) {
+      console.error('Error getting projects page:', error)
+      return { projects: [], nextCursor: null }
+    }
+  },
+
+  // Get all projects for a user (excludes deleted by default), paging through the list
   async getAll(filters?: ProjectFilters): Promise<RehabProjectDB[]> {
     try {
-      let query = supabase
-        .from('rehab_projects')
-        .select('*')
+      const projects: RehabProjectDB[] = []
+      let cursor: ProjectPageCursor | null = null
 
-      // Exclude deleted projects unless explicitly requested
-      if (!filters?.includeDeleted) {
-        query = query.is('deleted_at', null)
-      }
-
-      // Exclude archived projects unless explicitly requested
-      if (!filters?.includeArchived) {
-        query = query.neq('status', 'archived')
-      }
-
-      // Apply status filter
-      if (filters?.status && filters.status !== 'all') {
-        query = query.eq('status', filters.status)
-      }
-
-      // Apply strategy filter
-      if (filters?.strategy && filters.strategy !== 'all') {
-        query = query.eq('investment_strategy', filters.strategy)
-      }
-
-      // Apply date range filter
-      if (filters?.dateFrom) {
-        query = query.gte('created_at', filters.dateFrom)
-      }
-      if (filters?.dateTo) {
-        query = query.lte('created_at', filters.dateTo)
-      }
-
-      // Apply search filter (uses full-text search on project_name and address)
-      if (filters?.search && filters.search.trim()) {
-        const searchTerm = filters.search.trim()
-        query = query.or(
-          `project_name.ilike.%${searchTerm}%,address_street.ilike.%${searchTerm}%,address_city.ilike.%${searchTerm}%,address_state.ilike.%${searchTerm}%,address_zip.ilike.%${searchTerm}%`
-        )
-      }
-
-      query = query.order('updated_at', { ascending: false })
-
-      const { data, error } = await query
+      do {
+        const page: ProjectPage = await fetchProjectPage(filters, PROJECT_PAGE_SIZE, cursor)
+        projects.push(...page.projects)
+        cursor = page.nextCursor
+      } while (cursor)
 
-      if (error) throw error
-      return data as RehabProjectDB[]
+      return projects
     } catch (error) {
       console.error('Error getting projects:', error)
       return []
@@ -247,38 +489,20 @@ export const projectService = {
     }
   },
 
-  // Duplicate a project
+  // Duplicate a project with its scope items, assessments, comparables and
+  // recommendations in one server-side call (see duplicate_rehab_project)
   async duplicate(id: string): Promise<RehabProjectDB | null> {
     try {
-      // First, get the original project
-      const { data: original, error: fetchError } = await supabase
-        .from('rehab_projects')
-        .select('*')
-        .eq('id', id)
+      const { data, error } = await supabase
+        .rpc('duplicate_rehab_project', { source_project_id: id })
         .single()
 
-      if (fetchError) throw fetchError
-      if (!original) throw new Error('Project not found')
-
-      // Create a copy with modified fields
-      const { id: _id, created_at: _created, updated_at: _updated, deleted_at: _deleted, ...projectData } = original
-
-      const duplicatedProject = {
-        ...projectData,
-        project_name: `${original.project_name} (Copy)`,
-        status: 'draft',
-        created_at: new Date().toISOString(),
-        updated_at: new Date().toISOString(),
-      }
-
-      const { data: newProject, error: insertError } = await supabase
-        .from('rehab_projects')
-        .insert(duplicatedProject)
-        .select()
-        .single()
+      if (error) throw error
+      if (!data) throw new Error('Project not found')
 
-      if (insertError) throw insertError
-      return newProject as RehabProjectDB
+      // The RPC returns the full row; drop the generated search column
+      const { search_text: _searchText, ...project } = data as RehabProjectDB & { search_text?: string }
+      return project as RehabProjectDB
     } catch (error) {
       console.error('Error duplicating project:', error)
       return null
@@ -342,26 +566,7 @@ export const scopeItemService = {
     try {
       const { data, error } = await supabase
         .from('rehab_scope_items')
-        .insert({
-          project_id: projectId,
-          category: item.category,
-          subcategory: item.subcategory,
-          item_name: item.itemName,
-          description: item.description,
-          location: item.location,
-          quantity: item.quantity,
-          unit_of_measure: item.unitOfMeasure,
-          material_cost: item.materialCost,
-          labor_cost: item.laborCost,
-          total_cost: item.totalCost,
-          priority: item.priority,
-          roi_impact: item.roiImpact,
-          days_required: item.daysRequired,
-          depends_on: item.dependsOn,
-          phase: item.phase,
-          included: item.included,
-          completed: item.completed
-        })
+        .insert(toScopeItemRow(projectId, item))
         .select()
         .single()
 
@@ -440,6 +645,43 @@ export const scopeItemService = {
       console.error('Error deleting scope item:', error)
       return false
     }
+  },
+
+  // Insert many scope items in as few requests as the payload limits allow
+  async createMany(projectId: string, items: ScopeItem[]): Promise<ScopeItem[] | null> {
+    try {
+      return await insertRows<ScopeItem>(
+        'rehab_scope_items',
+        items.map((item) => toScopeItemRow(projectId, item))
+      )
+    } catch (error) {
+      console.error('Error creating scope items:', error)
+      return null
+    }
+  },
+
+  // Save many scope items: rows with a database id are updated, the rest inserted
+  async upsertMany(projectId: string, items: ScopeItem[]): Promise<ScopeItem[] | null> {
+    try {
+      return await upsertRows<ScopeItem>(
+        'rehab_scope_items',
+        items.map((item) => ({ id: item.id, ...toScopeItemRow(projectId, item) }))
+      )
+    } catch (error) {
+      console.error('Error upserting scope items:', error)
+      return null
+    }
+  },
+
+  // Delete many scope items by id
+  async deleteMany(ids: string[]): Promise<boolean> {
+    try {
+      await deleteRows('rehab_scope_items', ids)
+      return true
+    } catch (error) {
+      console.error('Error deleting scope items:', error)
+      return false
+    }
   }
 }
 
@@ -450,16 +692,7 @@ export const marketComparableService = {
     try {
       const { data, error } = await supabase
         .from('market_comparables')
-        .insert({
-          project_id: projectId,
-          address: comparable.address,
-          sale_price: comparable.salePrice,
-          sale_date: comparable.saleDate.toISOString().split('T')[0],
-          square_feet: comparable.squareFeet,
-          features: comparable.features,
-          distance_miles: comparable.distanceMiles,
-          similarity_score: comparable.similarityScore
-        })
+        .insert(toComparableRow(projectId, comparable))
         .select()
         .single()
 
@@ -486,6 +719,43 @@ export const marketComparableService = {
       console.error('Error getting market comparables:', error)
       return []
     }
+  },
+
+  // Insert many market comparables in as few requests as the payload limits allow
+  async createMany(projectId: string, comparables: MarketComparable[]): Promise<MarketComparable[] | null> {
+    try {
+      return await insertRows<MarketComparable>(
+        'market_comparables',
+        comparables.map((item) => toComparableRow(projectId, item))
+      )
+    } catch (error) {
+      console.error('Error creating market comparables:', error)
+      return null
+    }
+  },
+
+  // Save many market comparables: rows with a database id are updated, the rest inserted
+  async upsertMany(projectId: string, comparables: MarketComparable[]): Promise<MarketComparable[] | null> {
+    try {
+      return await upsertRows<MarketComparable>(
+        'market_comparables',
+        comparables.map((item) => ({ id: item.id, ...toComparableRow(projectId, item) }))
+      )
+    } catch (error) {
+      console.error('Error upserting market comparables:', error)
+      return null
+    }
+  },
+
+  // Delete many market comparables by id
+  async deleteMany(ids: string[]): Promise<boolean> {
+    try {
+      await deleteRows('market_comparables', ids)
+      return true
+    } catch (error) {
+      console.error('Error deleting market comparables:', error)
+      return false
+    }
   }
 }
 
@@ -496,18 +766,7 @@ export const recommendationService = {
     try {
       const { data, error } = await supabase
         .from('rehab_recommendations')
-        .insert({
-          project_id: projectId,
-          type: recommendation.type,
-          title: recommendation.title,
-          description: recommendation.description,
-          estimated_cost: recommendation.estimatedCost,
-          roi_impact: recommendation.roiImpact,
-          time_impact_days: recommendation.timeImpactDays,
-          market_data: recommendation.marketData,
-          confidence_score: recommendation.confidenceScore,
-          status: recommendation.status
-        })
+        .insert(toRecommendationRow(projectId, recommendation))
         .select()
         .single()
 
@@ -534,5 +793,42 @@ export const recommendationService = {
       console.error('Error getting recommendations:', error)
       return []
     }
+  },
+
+  // Insert many recommendations in as few requests as the payload limits allow
+  async createMany(projectId: string, recommendations: Recommendation[]): Promise<Recommendation[] | null> {
+    try {
+      return await insertRows<Recommendation>(
+        'rehab_recommendations',
+        recommendations.map((item) => toRecommendationRow(projectId, item))
+      )
+    } catch (error) {
+      console.error('Error creating recommendations:', error)
+      return null
+    }
+  },
+
+  // Save many recommendations: rows with a database id are updated, the rest inserted
+  async upsertMany(projectId: string, recommendations: Recommendation[]): Promise<Recommendation[] | null> {
+    try {
+      return await upsertRows<Recommendation>(
+        'rehab_recommendations',
+        recommendations.map((item) => ({ id: item.id, ...toRecommendationRow(projectId, item) }))
+      )
+    } catch (error) {
+      console.error('Error upserting recommendations:', error)
+      return null
+    }
+  },
+
+  // Delete many recommendations by id
+  async deleteMany(ids: string[]): Promise<boolean> {
+    try {
+      await deleteRows('rehab_recommendations', ids)
+      return true
+    } catch (error) {
+      console.error('Error deleting recommendations:', error)
+      return false
+    }
   }
 }
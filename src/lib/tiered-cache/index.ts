@@ -0,0 +1,46 @@
+// Tiered Cache Module - Main Export
+export * from './lru'
+export * from './shared-store'
+export * from './tiered-cache'
+
+import { createSharedStoreFromEnv, type SharedCacheStore } from './shared-store'
+import { TieredCache, type CachePolicy } from './tiered-cache'
+
+let sharedCache: TieredCache | null = null
+
+/**
+ * Process-wide cache used by src/lib/cache.ts and the Google Places client.
+ * Uses Redis when CACHE_REDIS_URL or REDIS_URL is set, otherwise L1 only.
+ */
+export function getSharedCache(): TieredCache {
+  if (!sharedCache) {
+    sharedCache = new TieredCache({
+      store: createSharedStoreFromEnv(),
+      keyPrefix: process.env.REDIS_PREFIX ?? 'rehab-estimator',
+    })
+  }
+  return sharedCache
+}
+
+/**
+ * Replace the process-wide cache's shared tier (e.g. with a
+ * MemorySharedStore in scripts). Pass null for an L1-only cache.
+ */
+export function configureSharedCache(store: SharedCacheStore | null): TieredCache {
+  sharedCache = new TieredCache({
+    store,
+    keyPrefix: process.env.REDIS_PREFIX ?? 'rehab-estimator',
+  })
+  return sharedCache
+}
+
+/**
+ * Wrap a loader with the process-wide cache. The cache is looked up per call,
+ * so module-level wrappers follow configureSharedCache.
+ */
+export function withSharedCache<A extends unknown[], T>(
+  loader: (...args: A) => Promise<T>,
+  policy: CachePolicy<A>
+): (...args: A) => Promise<T> {
+  return (...args: A) => getSharedCache().getOrLoad(args, () => loader(...args), policy)
+}
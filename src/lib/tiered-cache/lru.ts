@@ -0,0 +1,56 @@
+/**
+ * Bounded in-process LRU map
+ *
+ * Relies on Map insertion order: a read re-inserts the key, so the first key
+ * is always the least recently used and is evicted when the map is full.
+ */
+export class LruCache<K, V> {
+  private entries = new Map<K, V>()
+
+  constructor(private readonly maxEntries: number) {
+    if (!(maxEntries > 0)) {
+      throw new Error('LruCache maxEntries must be positive')
+    }
+  }
+
+  get size(): number {
+    return this.entries.size
+  }
+
+  get(key: K): V | undefined {
+    const value = this.entries.get(key)
+    if (value === undefined) return undefined
+
+    // Mark as most recently used
+    this.entries.delete(key)
+    this.entries.set(key, value)
+    return value
+  }
+
+  /** Read without marking the key as recently used */
+  peek(key: K): V | undefined {
+    return this.entries.get(key)
+  }
+
+  /** Keys from least to most recently used */
+  keys(): K[] {
+    return [...this.entries.keys()]
+  }
+
+  set(key: K, value: V): void {
+    this.entries.delete(key)
+    this.entries.set(key, value)
+
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value as K)
+    }
+  }
+
+  delete(key: K): boolean {
+    return this.entries.delete(key)
+  }
+
+  clear(): void {
+    this.entries.clear()
+  }
+}
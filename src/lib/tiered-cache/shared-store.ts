@@ -0,0 +1,245 @@
+/**
+ * Shared (L2) cache stores
+ *
+ * The tiered cache talks to its shared tier through the small SharedCacheStore
+ * interface so the same code runs against Redis in production and against
+ * MemorySharedStore in scripts and local development.
+ */
+
+import type Redis from 'ioredis'
+
+// ============================================================================
+// STORE INTERFACE
+// ============================================================================
+
+export interface SharedCacheStore {
+  get(key: string): Promise<string | null>
+  set(key: string, value: string, ttlMs: number): Promise<void>
+  /** Set only when the key is absent (used as a short-lived fill lock) */
+  setIfAbsent(key: string, value: string, ttlMs: number): Promise<boolean>
+  /** Delete `key` only while it still holds `value` (releases a lock we own) */
+  delIfValue(key: string, value: string): Promise<boolean>
+  del(keys: string[]): Promise<void>
+  /** Add members to a set and extend its expiry to at least `ttlMs` */
+  addToSet(key: string, members: string[], ttlMs: number): Promise<void>
+  setMembers(key: string): Promise<string[]>
+  publish(channel: string, message: string): Promise<void>
+  /** Returns an unsubscribe function */
+  subscribe(channel: string, onMessage: (message: string) => void): Promise<() => void>
+}
+
+// ============================================================================
+// IN-MEMORY STORE
+// ============================================================================
+
+type MemoryEntry = { value: string | Set<string>; expiresAt: number }
+
+/**
+ * In-process stand-in for Redis. Several TieredCache instances can share one
+ * MemorySharedStore to simulate multiple app instances.
+ */
+export class MemorySharedStore implements SharedCacheStore {
+  private entries = new Map<string, MemoryEntry>()
+  private listeners = new Map<string, Set<(message: string) => void>>()
+
+  constructor(private readonly now: () => number = Date.now) {}
+
+  async get(key: string): Promise<string | null> {
+    const entry = this.read(key)
+    return typeof entry?.value === 'string' ? entry.value : null
+  }
+
+  async set(key: string, value: string, ttlMs: number): Promise<void> {
+    this.entries.set(key, { value, expiresAt: this.now() + ttlMs })
+  }
+
+  async setIfAbsent(key: string, value: string, ttlMs: number): Promise<boolean> {
+    if (this.read(key)) return false
+    this.entries.set(key, { value, expiresAt: this.now() + ttlMs })
+    return true
+  }
+
+  async delIfValue(key: string, value: string): Promise<boolean> {
+    if (this.read(key)?.value !== value) return false
+    this.entries.delete(key)
+    return true
+  }
+
+  async del(keys: string[]): Promise<void> {
+    keys.forEach((key) => this.entries.delete(key))
+  }
+
+  async addToSet(key: string, members: string[], ttlMs: number): Promise<void> {
+    const expiresAt = this.now() + ttlMs
+    const entry = this.read(key)
+    if (entry && entry.value instanceof Set) {
+      members.forEach((member) => (entry.value as Set<string>).add(member))
+      entry.expiresAt = Math.max(entry.expiresAt, expiresAt)
+    } else {
+      this.entries.set(key, { value: new Set(members), expiresAt })
+    }
+  }
+
+  async setMembers(key: string): Promise<string[]> {
+    const entry = this.read(key)
+    return entry && entry.value instanceof Set ? [...entry.value] : []
+  }
+
+  async publish(channel: string, message: string): Promise<void> {
+    this.listeners.get(channel)?.forEach((listener) => listener(message))
+  }
+
+  async subscribe(channel: string, onMessage: (message: string) => void): Promise<() => void> {
+    let listeners = this.listeners.get(channel)
+    if (!listeners) {
+      listeners = new Set()
+      this.listeners.set(channel, listeners)
+    }
+    listeners.add(onMessage)
+    return () => {
+      listeners!.delete(onMessage)
+    }
+  }
+
+  private read(key: string): MemoryEntry | undefined {
+    const entry = this.entries.get(key)
+    if (entry && entry.expiresAt <= this.now()) {
+      this.entries.delete(key)
+      return undefined
+    }
+    return entry
+  }
+}
+
+// ============================================================================
+// REDIS STORE
+// ============================================================================
+
+/** A slow shared tier should cost a request no more than this per command */
+const STORE_COMMAND_TIMEOUT_MS = 250
+
+/** Atomic compare-and-delete, so a lock is only released by its owner */
+const DEL_IF_VALUE_SCRIPT = `
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+`
+
+/**
+ * Redis-backed store. Commands time out quickly rather than stalling requests
+ * while Redis is unreachable; the tiered cache treats failures as misses.
+ */
+export class RedisSharedStore implements SharedCacheStore {
+  private client: Promise<Redis> | null = null
+  private subscriber: Promise<Redis> | null = null
+  private listeners = new Map<string, Set<(message: string) => void>>()
+
+  constructor(private readonly url: string) {}
+
+  async get(key: string): Promise<string | null> {
+    const client = await this.getClient()
+    return client.get(key)
+  }
+
+  async set(key: string, value: string, ttlMs: number): Promise<void> {
+    const client = await this.getClient()
+    await client.set(key, value, 'PX', Math.max(1, Math.ceil(ttlMs)))
+  }
+
+  async setIfAbsent(key: string, value: string, ttlMs: number): Promise<boolean> {
+    const client = await this.getClient()
+    const result = await client.set(key, value, 'PX', Math.max(1, Math.ceil(ttlMs)), 'NX')
+    return result === 'OK'
+  }
+
+  async delIfValue(key: string, value: string): Promise<boolean> {
+    const client = await this.getClient()
+    const deleted = await client.eval(DEL_IF_VALUE_SCRIPT, 1, key, value)
+    return deleted === 1
+  }
+
+  async del(keys: string[]): Promise<void> {
+    if (keys.length === 0) return
+    const client = await this.getClient()
+    await client.unlink(...keys)
+  }
+
+  async addToSet(key: string, members: string[], ttlMs: number): Promise<void> {
+    if (members.length === 0) return
+    const client = await this.getClient()
+    // GT only ever extends an existing expiry and NX covers a new set, so a
+    // short-lived entry never cuts a tag set shorter than its longest member
+    await client
+      .multi()
+      .sadd(key, ...members)
+      .pexpire(key, Math.max(1, Math.ceil(ttlMs)), 'GT')
+      .pexpire(key, Math.max(1, Math.ceil(ttlMs)), 'NX')
+      .exec()
+  }
+
+  async setMembers(key: string): Promise<string[]> {
+    const client = await this.getClient()
+    return client.smembers(key)
+  }
+
+  async publish(channel: string, message: string): Promise<void> {
+    const client = await this.getClient()
+    await client.publish(channel, message)
+  }
+
+  async subscribe(channel: string, onMessage: (message: string) => void): Promise<() => void> {
+    const subscriber = await this.getSubscriber()
+    let listeners = this.listeners.get(channel)
+    if (!listeners) {
+      listeners = new Set()
+      this.listeners.set(channel, listeners)
+      await subscriber.subscribe(channel)
+    }
+    listeners.add(onMessage)
+    return () => {
+      listeners!.delete(onMessage)
+    }
+  }
+
+  private getClient(): Promise<Redis> {
+    if (!this.client) {
+      this.client = this.connect()
+    }
+    return this.client
+  }
+
+  private getSubscriber(): Promise<Redis> {
+    if (!this.subscriber) {
+      this.subscriber = this.getClient().then((client) => {
+        const subscriber = client.duplicate()
+        subscriber.on('error', (error) => console.error('Cache subscriber error:', error.message))
+        subscriber.on('message', (channel: string, message: string) => {
+          this.listeners.get(channel)?.forEach((listener) => listener(message))
+        })
+        return subscriber
+      })
+    }
+    return this.subscriber
+  }
+
+  private async connect(): Promise<Redis> {
+    // Loaded lazily so importing the cache never opens a connection
+    const { default: IORedis } = await import('ioredis')
+    const client = new IORedis(this.url, {
+      maxRetriesPerRequest: 1,
+      commandTimeout: STORE_COMMAND_TIMEOUT_MS,
+    })
+    client.on('error', (error) => console.error('Cache store error:', error.message))
+    return client
+  }
+}
+
+/**
+ * Shared store from the environment: CACHE_REDIS_URL, else REDIS_URL. Returns
+ * null (in-process cache only) when neither is set.
+ */
+export function createSharedStoreFromEnv(): SharedCacheStore | null {
+  const url = process.env.CACHE_REDIS_URL || process.env.REDIS_URL
+  return url ? new RedisSharedStore(url) : null
+}
@@ -0,0 +1,505 @@
+/**
+ * Two-tier cache: bounded in-process LRU (L1) in front of a shared store (L2,
+ * Redis in production)
+ *
+ * - Keys are SHA-256 hashes of the namespace and the stable-serialized
+ *   arguments, so long prompts or filters never collide or bloat Redis keys.
+ * - Concurrent misses for a key share one load per process (single-flight),
+ *   and a Redis lock that lives as long as a load may take lets other
+ *   instances wait for that load instead of repeating it. Only the load that
+ *   took the lock releases it.
+ * - Entries stay servable for `staleSeconds` past their TTL while one
+ *   background refresh runs (stale-while-revalidate).
+ * - Entries carry tags; invalidating a tag removes them from Redis and every
+ *   instance's L1 (via pub/sub).
+ *
+ * Values go through JSON in the shared tier, so loaders should return plain
+ * data (Dates come back as strings from L2).
+ */
+
+import { createHash, randomUUID } from 'crypto'
+import { LruCache } from './lru'
+import type { SharedCacheStore } from './shared-store'
+
+// ============================================================================
+// TYPES
+// ============================================================================
+
+export interface CachePolicy<A extends unknown[]> {
+  /** Groups keys and stats, e.g. 'material-prices' */
+  namespace: string
+  /** Seconds an entry is served as fresh */
+  ttlSeconds: number
+  /** Extra seconds a stale entry is served while it refreshes (default 0) */
+  staleSeconds?: number
+  /** Invalidation tags, fixed or derived from the call arguments */
+  tags?: string[] | ((...args: A) => string[])
+}
+
+export interface TieredCacheOptions {
+  /** Shared tier; null keeps the cache in-process only */
+  store?: SharedCacheStore | null
+  /** Maximum L1 entries across all namespaces (default 1000) */
+  l1MaxEntries?: number
+  /** Prefix for shared keys and the invalidation channel */
+  keyPrefix?: string
+  /**
+   * Longest a loader is expected to run (default 30000ms). The shared fill
+   * lock lives this long, so slow loads such as model calls keep it.
+   */
+  loadTimeoutMs?: number
+  /** How long a miss waits for another instance's load (default `loadTimeoutMs`) */
+  lockWaitMs?: number
+  /** Clock, injectable for scripts */
+  now?: () => number
+}
+
+export interface LatencyStats {
+  count: number
+  totalMs: number
+  maxMs: number
+  avgMs: number
+}
+
+export interface CacheNamespaceStats {
+  l1Hits: number
+  l2Hits: number
+  /** Stale entries served while a refresh ran */
+  staleHits: number
+  misses: number
+  /** Loader calls, including background refreshes */
+  loads: number
+  loadErrors: number
+  /** Misses that joined an in-flight load instead of starting one */
+  coalesced: number
+  /** Shared-tier failures, each treated as a miss */
+  storeErrors: number
+  hitRate: number
+  /** Time spent answering get calls, including loads */
+  getLatency: LatencyStats
+  /** Time spent in the loader */
+  loadLatency: LatencyStats
+}
+
+interface CacheEntry<T = unknown> {
+  value: T
+  freshUntil: number
+  staleUntil: number
+  tags: string[]
+}
+
+interface Counters {
+  l1Hits: number
+  l2Hits: number
+  staleHits: number
+  misses: number
+  loads: number
+  loadErrors: number
+  coalesced: number
+  storeErrors: number
+  getLatency: { count: number; totalMs: number; maxMs: number }
+  loadLatency: { count: number; totalMs: number; maxMs: number }
+}
+
+const DEFAULT_L1_MAX_ENTRIES = 1000
+const DEFAULT_LOAD_TIMEOUT_MS = 30_000
+const LOCK_POLL_MS = 50
+
+// ============================================================================
+// TIERED CACHE
+// ============================================================================
+
+export class TieredCache {
+  private readonly store: SharedCacheStore | null
+  private readonly l1: LruCache<string, CacheEntry>
+  private readonly keyPrefix: string
+  private readonly loadTimeoutMs: number
+  private readonly lockWaitMs: number
+  private readonly now: () => number
+  private readonly instanceId = randomUUID()
+  private lockSequence = 0
+
+  private inFlight = new Map<string, Promise<unknown>>()
+  private counters = new Map<string, Counters>()
+  /** Bumped on invalidation so loads that started earlier are not stored */
+  private tagGenerations = new Map<string, number>()
+  private subscription: Promise<void> | null = null
+
+  constructor(options: TieredCacheOptions = {}) {
+    this.store = options.store ?? null
+    this.l1 = new LruCache(options.l1MaxEntries ?? DEFAULT_L1_MAX_ENTRIES)
+    this.keyPrefix = options.keyPrefix ?? 'rehab-estimator'
+    this.loadTimeoutMs = options.loadTimeoutMs ?? DEFAULT_LOAD_TIMEOUT_MS
+    this.lockWaitMs = options.lockWaitMs ?? this.loadTimeoutMs
+    this.now = options.now ?? Date.now
+  }
+
+  /**
+   * Wrap an async loader so calls are served from the cache. The wrapper is
+   * meant to be created once at module level.
+   */
+  wrap<A extends unknown[], T>(
+    loader: (...args: A) => Promise<T>,
+    policy: CachePolicy<A>
+  ): (...args: A) => Promise<T> {
+    return (...args: A) => this.getOrLoad(args, () => loader(...args), policy)
+  }
+
+  /**
+   * Get the value cached for `keyParts`, loading it on a miss
+   */
+  async getOrLoad<A extends unknown[], T>(
+    keyParts: unknown[],
+    loader: () => Promise<T>,
+    policy: CachePolicy<A>
+  ): Promise<T> {
+    const started = performance.now()
+    const counters = this.countersFor(policy.namespace)
+    const key = this.buildKey(policy.namespace, keyParts)
+    const tags =
+      typeof policy.tags === 'function' ? policy.tags(...(keyParts as A)) : policy.tags ?? []
+
+    try {
+      this.ensureSubscribed()
+
+      const local = this.l1.get(key) as CacheEntry<T> | undefined
+      const served = local && this.serve(local, key, loader, policy, tags, counters)
+      if (served) {
+        counters.l1Hits++
+        return served.value
+      }
+
+      const shared = await this.readShared<T>(key, counters)
+      if (shared) {
+        const fromShared = this.serve(shared, key, loader, policy, tags, counters)
+        if (fromShared) {
+          counters.l2Hits++
+          this.l1.set(key, shared)
+          return fromShared.value
+        }
+      }
+
+      counters.misses++
+      return await this.load(key, loader, policy, tags, counters, false)
+    } finally {
+      record(counters.getLatency, performance.now() - started)
+    }
+  }
+
+  /**
+   * Drop every entry carrying any of `tags`, here and on other instances
+   */
+  async invalidateTags(tags: string[]): Promise<void> {
+    if (tags.length === 0) return
+    this.dropLocal(tags)
+
+    if (!this.store) return
+    try {
+      const tagKeys = tags.map((tag) => this.tagKey(tag))
+      const members = await Promise.all(tagKeys.map((tagKey) => this.store!.setMembers(tagKey)))
+      await this.store.del([...new Set(members.flat()), ...tagKeys])
+      await this.store.publish(
+        this.channel(),
+        JSON.stringify({ origin: this.instanceId, tags })
+      )
+    } catch (error) {
+      console.error('Error invalidating shared cache tags:', error)
+    }
+  }
+
+  /**
+   * Hit/miss/latency counters per namespace since start (or the last reset)
+   */
+  stats(): Record<string, CacheNamespaceStats> {
+    const result: Record<string, CacheNamespaceStats> = {}
+    this.counters.forEach((counters, namespace) => {
+      const hits = counters.l1Hits + counters.l2Hits
+      const lookups = hits + counters.misses
+      result[namespace] = {
+        ...counters,
+        hitRate: lookups > 0 ? hits / lookups : 0,
+        getLatency: summarizeLatency(counters.getLatency),
+        loadLatency: summarizeLatency(counters.loadLatency),
+      }
+    })
+    return result
+  }
+
+  resetStats(): void {
+    this.counters.clear()
+  }
+
+  // ==========================================================================
+  // HELPER METHODS
+  // ==========================================================================
+
+  /**
+   * Return the entry if it can be served now, starting a background refresh
+   * when it is stale. Returns null once it is past its stale window.
+   */
+  private serve<A extends unknown[], T>(
+    entry: CacheEntry<T>,
+    key: string,
+    loader: () => Promise<T>,
+    policy: CachePolicy<A>,
+    tags: string[],
+    counters: Counters
+  ): CacheEntry<T> | null {
+    const now = this.now()
+    if (now < entry.freshUntil) return entry
+    if (now >= entry.staleUntil) return null
+
+    counters.staleHits++
+    if (!this.inFlight.has(key)) {
+      this.load(key, loader, policy, tags, counters, true).catch((error) => {
+        console.error(`Background refresh failed for cache '${policy.namespace}':`, error)
+      })
+    }
+    return entry
+  }
+
+  /**
+   * Single-flight load: one loader call per key per process, and while the
+   * shared lock is held elsewhere, wait briefly for that instance's result
+   */
+  private load<A extends unknown[], T>(
+    key: string,
+    loader: () => Promise<T>,
+    policy: CachePolicy<A>,
+    tags: string[],
+    counters: Counters,
+    background: boolean
+  ): Promise<T> {
+    const pending = this.inFlight.get(key)
+    if (pending) {
+      counters.coalesced++
+      return pending as Promise<T>
+    }
+
+    const promise = (async () => {
+      const generations = tags.map((tag) => this.tagGenerations.get(tag) ?? 0)
+      const lockKey = `${key}:lock`
+      // Unique per load, so a release can never remove a lock taken by a later load
+      const lockOwner = `${this.instanceId}:${++this.lockSequence}`
+      let locked = false
+
+      if (this.store) {
+        try {
+          locked = await this.store.setIfAbsent(lockKey, lockOwner, this.loadTimeoutMs)
+          if (!locked && !background) {
+            // A background refresh can leave the work to the lock holder
+            const filled = await this.waitForShared<T>(key, lockKey, counters)
+            if (filled) {
+              this.l1.set(key, filled)
+              return filled.value
+            }
+            // The holder gave up (or we waited long enough): take over the lock if it is free
+            locked = await this.store.setIfAbsent(lockKey, lockOwner, this.loadTimeoutMs)
+          }
+        } catch {
+          counters.storeErrors++
+        }
+      }
+
+      try {
+        if (background && this.store && !locked) {
+          const current = this.l1.peek(key) as CacheEntry<T> | undefined
+          if (current) return current.value
+        }
+
+        const started = performance.now()
+        counters.loads++
+        let value: T
+        try {
+          value = await loader()
+        } catch (error) {
+          counters.loadErrors++
+          throw error
+        } finally {
+          record(counters.loadLatency, performance.now() - started)
+        }
+
+        // An invalidation during the load means the value may predate it
+        const invalidated = tags.some(
+          (tag, index) => (this.tagGenerations.get(tag) ?? 0) !== generations[index]
+        )
+        if (!invalidated) {
+          await this.storeEntry(key, value, policy, tags, counters)
+        }
+        return value
+      } finally {
+        if (locked) {
+          this.store!.delIfValue(lockKey, lockOwner).catch(() => {
+            counters.storeErrors++
+          })
+        }
+      }
+    })()
+
+    this.inFlight.set(key, promise)
+    promise.then(
+      () => this.inFlight.delete(key),
+      () => this.inFlight.delete(key)
+    )
+    return promise
+  }
+
+  private async storeEntry<A extends unknown[], T>(
+    key: string,
+    value: T,
+    policy: CachePolicy<A>,
+    tags: string[],
+    counters: Counters
+  ): Promise<void> {
+    const now = this.now()
+    const entry: CacheEntry<T> = {
+      value,
+      freshUntil: now + policy.ttlSeconds * 1000,
+      staleUntil: now + (policy.ttlSeconds + (policy.staleSeconds ?? 0)) * 1000,
+      tags,
+    }
+    this.l1.set(key, entry)
+
+    if (!this.store) return
+    try {
+      const ttlMs = entry.staleUntil - now
+      await this.store.set(key, JSON.stringify(entry), ttlMs)
+      await Promise.all(tags.map((tag) => this.store!.addToSet(this.tagKey(tag), [key], ttlMs)))
+    } catch {
+      counters.storeErrors++
+    }
+  }
+
+  private async readShared<T>(key: string, counters: Counters): Promise<CacheEntry<T> | null> {
+    if (!this.store) return null
+    try {
+      const raw = await this.store.get(key)
+      return raw ? (JSON.parse(raw) as CacheEntry<T>) : null
+    } catch {
+      counters.storeErrors++
+      return null
+    }
+  }
+
+  /**
+   * Poll the shared tier until another instance's load lands, its lock is
+   * released without a value, or we give up
+   */
+  private async waitForShared<T>(
+    key: string,
+    lockKey: string,
+    counters: Counters
+  ): Promise<CacheEntry<T> | null> {
+    const deadline = performance.now() + this.lockWaitMs
+    while (performance.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, LOCK_POLL_MS))
+      const entry = await this.readShared<T>(key, counters)
+      if (entry && this.now() < entry.freshUntil) return entry
+      if ((await this.store!.get(lockKey)) === null) {
+        // The value may have landed just before the lock was released
+        const landed = await this.readShared<T>(key, counters)
+        return landed && this.now() < landed.freshUntil ? landed : null
+      }
+    }
+    return null
+  }
+
+  private dropLocal(tags: string[]): void {
+    const dropped = new Set(tags)
+    tags.forEach((tag) => this.tagGenerations.set(tag, (this.tagGenerations.get(tag) ?? 0) + 1))
+    for (const key of this.l1.keys()) {
+      if (this.l1.peek(key)!.tags.some((tag) => dropped.has(tag))) {
+        this.l1.delete(key)
+      }
+    }
+  }
+
+  /** Listen for other instances' invalidations (once, on first use) */
+  private ensureSubscribed(): void {
+    if (!this.store || this.subscription) return
+    this.subscription = this.store
+      .subscribe(this.channel(), (message) => {
+        try {
+          const { origin, tags } = JSON.parse(message) as { origin: string; tags: string[] }
+          if (origin !== this.instanceId) this.dropLocal(tags)
+        } catch {
+          // Ignore malformed messages
+        }
+      })
+      .then(
+        () => undefined,
+        (error) => {
+          console.error('Error subscribing to cache invalidations:', error)
+          this.subscription = null
+        }
+      )
+  }
+
+  private buildKey(namespace: string, keyParts: unknown[]): string {
+    const hash = createHash('sha256').update(stableStringify(keyParts)).digest('base64url')
+    return `${this.keyPrefix}:cache:${namespace}:${hash}`
+  }
+
+  private tagKey(tag: string): string {
+    return `${this.keyPrefix}:cache-tag:${tag}`
+  }
+
+  private channel(): string {
+    return `${this.keyPrefix}:cache-invalidate`
+  }
+
+  private countersFor(namespace: string): Counters {
+    let counters = this.counters.get(namespace)
+    if (!counters) {
+      counters = {
+        l1Hits: 0,
+        l2Hits: 0,
+        staleHits: 0,
+        misses: 0,
+        loads: 0,
+        loadErrors: 0,
+        coalesced: 0,
+        storeErrors: 0,
+        getLatency: { count: 0, totalMs: 0, maxMs: 0 },
+        loadLatency: { count: 0, totalMs: 0, maxMs: 0 },
+      }
+      this.counters.set(namespace, counters)
+    }
+    return counters
+  }
+}
+
+// ============================================================================
+// UTILITIES
+// ============================================================================
+
+/**
+ * JSON with object keys sorted at every level, so equal arguments always
+ * produce the same cache key
+ */
+export function stableStringify(value: unknown): string {
+  return JSON.stringify(value, (_key, current) => {
+    if (current && typeof current === 'object' && !Array.isArray(current)) {
+      return Object.keys(current)
+        .sort()
+        .reduce<Record<string, unknown>>((sorted, key) => {
+          sorted[key] = (current as Record<string, unknown>)[key]
+          return sorted
+        }, {})
+    }
+    return current
+  })
+}
+
+function record(latency: Counters['getLatency'], ms: number): void {
+  latency.count++
+  latency.totalMs += ms
+  latency.maxMs = Math.max(latency.maxMs, ms)
+}
+
+function summarizeLatency(latency: Counters['getLatency']): LatencyStats {
+  return {
+    ...latency,
+    avgMs: latency.count > 0 ? latency.totalMs / latency.count : 0,
+  }
+}
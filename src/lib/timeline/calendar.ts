@@ -0,0 +1,222 @@
+/**
+ * Working-Day Calendar
+ *
+ * Precomputes working days (Mon–Fri minus holidays) over a horizon of day
+ * numbers so adding, subtracting and counting working days are O(1) lookups
+ * instead of day-by-day walks. The horizon grows on demand.
+ */
+
+import { isValid, parseISO } from 'date-fns';
+import { TimelineConfig } from './types';
+
+const MS_PER_DAY = 24 * 60 * 60 * 1000;
+
+// Extra days kept on either side of a requested range when (re)building
+const HORIZON_PADDING_DAYS = 366;
+
+// Calendars shared across requests, keyed by their holiday set
+const MAX_SHARED_CALENDARS = 32;
+
+// =============================================================================
+// WORKING CALENDAR
+// =============================================================================
+
+export class WorkingCalendar {
+  private static byHolidays = new Map<string, WorkingCalendar>();
+
+  private readonly holidays: Set<number>;
+  /** First day number covered by the tables */
+  private origin = 0;
+  /** cumulative[i] = working days in [origin, origin + i) */
+  private cumulative = new Int32Array(1);
+  /** Day numbers of the covered working days, ascending */
+  private workingDays = new Int32Array(0);
+
+  constructor(holidayDates: Iterable<Date> = []) {
+    this.holidays = new Set<number>();
+    for (const holiday of holidayDates) {
+      this.holidays.add(toDayNumber(holiday));
+    }
+  }
+
+  /**
+   * Calendar for a timeline config, shared by every config with the same
+   * holidays and sized to the project window
+   */
+  static forConfig(config: TimelineConfig): WorkingCalendar {
+    const calendar = this.forHolidays(config.holidayDates);
+    calendar.ensureRange(
+      toDayNumber(config.projectStartDate),
+      toDayNumber(config.projectEndDate) + Math.max(0, config.bufferDays) * 2
+    );
+    return calendar;
+  }
+
+  /**
+   * Shared calendar for a holiday list, so callers that rebuild their config
+   * per request (API routes, stores) reuse the same tables
+   */
+  static forHolidays(holidayDates: Iterable<Date>): WorkingCalendar {
+    const dayNumbers = [...new Set(Array.from(holidayDates, toDayNumber))].sort((a, b) => a - b);
+    const key = dayNumbers.join(',');
+
+    let calendar = this.byHolidays.get(key);
+    if (!calendar) {
+      calendar = new WorkingCalendar();
+      dayNumbers.forEach(day => calendar!.holidays.add(day));
+
+      if (this.byHolidays.size >= MAX_SHARED_CALENDARS) {
+        const oldest = this.byHolidays.keys().next().value;
+        if (oldest !== undefined) this.byHolidays.delete(oldest);
+      }
+      this.byHolidays.set(key, calendar);
+    }
+    return calendar;
+  }
+
+  isWorkingDay(date: Date): boolean {
+    return this.isWorkingDayNumber(toDayNumber(date));
+  }
+
+  /**
+   * The date `days` working days after `date`, keeping its time of day.
+   * Non-positive counts return a copy of `date`; fractional counts round up.
+   */
+  addWorkingDays(date: Date, days: number): Date {
+    const count = Math.ceil(days);
+    if (!(count > 0)) return new Date(date);
+
+    const from = toDayNumber(date);
+    this.ensureRange(from, from + count * 2 + 7);
+
+    // Working days up to and including `from`, then step `count` further
+    let index = this.cumulative[from + 1 - this.origin] + count - 1;
+    while (index >= this.workingDays.length) {
+      this.ensureRange(from, this.origin + this.cumulative.length * 2);
+      index = this.cumulative[from + 1 - this.origin] + count - 1;
+    }
+    return withDayNumber(date, this.workingDays[index]);
+  }
+
+  /**
+   * The date `days` working days before `date`, keeping its time of day.
+   * Non-positive counts return a copy of `date`; fractional counts round up.
+   */
+  subtractWorkingDays(date: Date, days: number): Date {
+    const count = Math.ceil(days);
+    if (!(count > 0)) return new Date(date);
+
+    const from = toDayNumber(date);
+    this.ensureRange(from - count * 2 - 7, from);
+
+    // Working days strictly before `from`, then step back `count`
+    let index = this.cumulative[from - this.origin] - count;
+    while (index < 0) {
+      this.ensureRange(this.origin - this.cumulative.length, from);
+      index = this.cumulative[from - this.origin] - count;
+    }
+    return withDayNumber(date, this.workingDays[index]);
+  }
+
+  /**
+   * Working days stepped over when walking day by day from `startDate`
+   * while still before `endDate` (0 when `endDate` is not after `startDate`)
+   */
+  countWorkingDays(startDate: Date, endDate: Date): number {
+    const start = toDayNumber(startDate);
+    let end = toDayNumber(endDate);
+    // A later time of day on the end date takes one more step
+    if (timeOfDay(endDate) > timeOfDay(startDate)) end++;
+    if (end <= start) return 0;
+
+    this.ensureRange(start, end);
+    return this.cumulative[end + 1 - this.origin] - this.cumulative[start + 1 - this.origin];
+  }
+
+  /**
+   * Date of a 1-based working-day index counted from `startDate` (day 1 is
+   * the first working day on or after it), as used by day-number schedules
+   */
+  dateForWorkingDay(startDate: Date, day: number): Date {
+    const anchor = this.subtractWorkingDays(startDate, 1);
+    return this.addWorkingDays(anchor, Math.max(1, day));
+  }
+
+  // =========================================================================
+  // HELPER METHODS
+  // =========================================================================
+
+  private isWorkingDayNumber(day: number): boolean {
+    const dayOfWeek = (((day + 4) % 7) + 7) % 7; // Day 0 was a Thursday
+    return dayOfWeek !== 0 && dayOfWeek !== 6 && !this.holidays.has(day);
+  }
+
+  /**
+   * Make the tables cover [first, last] (inclusive day numbers), rebuilding
+   * with padding so repeated extensions stay amortized O(1)
+   */
+  private ensureRange(first: number, last: number): void {
+    const end = this.origin + this.cumulative.length - 1; // exclusive
+    if (this.cumulative.length > 1 && first >= this.origin && last < end) return;
+
+    const covered = this.cumulative.length > 1;
+    const newOrigin = Math.min(first, covered ? this.origin : first) - HORIZON_PADDING_DAYS;
+    const newEnd = Math.max(last + 1, covered ? end : last + 1) + HORIZON_PADDING_DAYS;
+    const span = newEnd - newOrigin;
+
+    const cumulative = new Int32Array(span + 1);
+    const workingDays: number[] = [];
+    for (let i = 0; i < span; i++) {
+      const day = newOrigin + i;
+      const working = this.isWorkingDayNumber(day);
+      cumulative[i + 1] = cumulative[i] + (working ? 1 : 0);
+      if (working) workingDays.push(day);
+    }
+
+    this.origin = newOrigin;
+    this.cumulative = cumulative;
+    this.workingDays = Int32Array.from(workingDays);
+  }
+}
+
+// =============================================================================
+// DAY NUMBERS
+// =============================================================================
+
+/** Days since 1970-01-01 for the local calendar date of `date` */
+export function toDayNumber(date: Date): number {
+  return Math.round(Date.UTC(date.getFullYear(), date.getMonth(), date.getDate()) / MS_PER_DAY);
+}
+
+/** Local midnight of a day number */
+export function fromDayNumber(day: number): Date {
+  const utc = new Date(day * MS_PER_DAY);
+  return new Date(utc.getUTCFullYear(), utc.getUTCMonth(), utc.getUTCDate());
+}
+
+/** Copy of `date` moved to another calendar day, keeping its time of day */
+function withDayNumber(date: Date, day: number): Date {
+  const utc = new Date(day * MS_PER_DAY);
+  const result = new Date(date);
+  result.setFullYear(utc.getUTCFullYear(), utc.getUTCMonth(), utc.getUTCDate());
+  return result;
+}
+
+function timeOfDay(date: Date): number {
+  return (
+    ((date.getHours() * 60 + date.getMinutes()) * 60 + date.getSeconds()) * 1000 +
+    date.getMilliseconds()
+  );
+}
+
+/** Date for an ISO date string from a request body (Invalid Date for anything else) */
+export function parseIsoDate(value: unknown): Date {
+  return typeof value === 'string' ? parseISO(value) : new Date(NaN);
+}
+
+/** Dates for an array of ISO date strings, or null if it is not one */
+export function parseIsoDates(value: unknown): Date[] | null {
+  if (!Array.isArray(value)) return null;
+  const dates = value.map(parseIsoDate);
+  return dates.every(isValid) ? dates : null;
+}
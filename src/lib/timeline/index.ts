@@ -1,6 +1,8 @@
 // Timeline Module - Main Export
 export * from './types';
 export * from './scheduler';
+export * from './calendar';
 
 // Re-export commonly used classes
 export { SchedulingEngine, ScheduleOptimizer } from './scheduler';
+export { WorkingCalendar } from './calendar';
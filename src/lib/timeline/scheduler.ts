@@ -3,6 +3,12 @@
  * 
  * Implements topological sorting for dependency-aware scheduling
  * and critical path method (CPM) for optimization.
+ *
+ * Tasks are indexed by topological position once per schedule; the forward
+ * and backward passes work on adjacency arrays and a running per-phase
+ * maximum, so a full schedule is linear in tasks + dependencies. Working-day
+ * arithmetic goes through a WorkingCalendar built once per config. An
+ * incremental schedule re-dates only the tasks downstream of an edit.
  */
 
 import { 
@@ -11,8 +17,39 @@ import {
   TimelineMilestone,
   TimelineConfig,
   ScheduleResult,
-  ScheduleConflict 
+  ScheduleConflict,
+  TaskScheduleChange,
+  IncrementalSchedule
 } from './types';
+import { WorkingCalendar } from './calendar';
+
+type UnscheduledTask = Omit<TimelineTask, 'startDate' | 'endDate'>;
+
+/**
+ * Task graph indexed by topological position.
+ * Only tasks that survive the topological sort are indexed; tasks caught in
+ * a cycle are left out of the schedule and reported as a conflict.
+ */
+interface TaskGraph {
+  sorted: UnscheduledTask[];
+  positionById: Map<string, number>;
+  /** Dependency positions per task, in declaration order */
+  dependencies: number[][];
+  /** Unique dependent positions per task, ascending */
+  dependents: number[][];
+  /** Rank of each task's phase among the distinct phase numbers */
+  phaseRank: Int32Array;
+  phaseCount: number;
+  hasCycle: boolean;
+  cycleNodes: string[];
+}
+
+/** Mutable per-position schedule state */
+interface ScheduleState {
+  startDates: Date[];
+  endDates: Date[];
+  slack: Int32Array;
+}
 
 // =============================================================================
 // SCHEDULING ENGINE
@@ -23,222 +60,429 @@ export class SchedulingEngine {
    * Main entry point - schedule all tasks respecting dependencies
    */
   static scheduleProject(
-    tasks: Omit<TimelineTask, 'startDate' | 'endDate'>[],
+    tasks: UnscheduledTask[],
     config: TimelineConfig
   ): ScheduleResult {
-    const conflicts: ScheduleConflict[] = [];
-    
     // Step 1: Topological sort for dependency order
-    const { sorted, hasCycle, cycleNodes } = this.topologicalSort(tasks);
-    
-    if (hasCycle) {
-      conflicts.push({
-        type: 'dependency_violation',
-        severity: 'error',
-        affectedTaskIds: cycleNodes,
-        description: 'Circular dependency detected',
-        suggestedFix: 'Remove one of the dependency relationships between these tasks',
-      });
-      // Continue with partial schedule
-    }
-    
+    const graph = this.buildGraph(tasks);
+    const state = this.createState(graph.sorted.length);
+
     // Step 2: Forward pass - calculate earliest start times
-    const scheduledTasks = this.forwardPass(sorted, config);
-    
-    // Step 3: Calculate phases from tasks
-    const phases = this.calculatePhases(scheduledTasks, config);
-    
-    // Step 4: Generate milestones
-    const milestones = this.generateMilestones(scheduledTasks, phases, config);
-    
-    // Step 5: Backward pass for slack calculation
-    const { criticalPath, slack } = this.backwardPass(scheduledTasks, config);
-    
-    // Step 6: Validate schedule
-    const validationConflicts = this.validateSchedule(scheduledTasks, config);
-    conflicts.push(...validationConflicts);
-    
-    // Calculate metrics
-    const totalDays = this.calculateWorkingDays(
-      config.projectStartDate,
-      scheduledTasks.reduce(
-        (latest, task) => task.endDate > latest ? task.endDate : latest,
-        config.projectStartDate
-      ),
-      config
-    );
-    
-    const criticalPathDays = criticalPath.reduce((sum, taskId) => {
-      const task = scheduledTasks.find(t => t.id === taskId);
-      return sum + (task?.durationDays || 0);
-    }, 0);
-    
+    this.forwardPass(graph, state, config, 0);
+
+    // Step 3: Backward pass for slack calculation
+    this.backwardPass(graph, state, config);
+
+    // Steps 4-6: phases, milestones, validation and metrics
+    return this.assembleResult(graph, state, config);
+  }
+
+  /**
+   * Schedule once, then apply single-task edits (duration or dependency
+   * changes) by re-dating only the affected downstream tasks. Every update
+   * yields the same result as a full reschedule of the edited task list.
+   * Library API for callers that hold a live schedule; the app's Gantt
+   * views do not use it yet.
+   */
+  static createIncrementalSchedule(
+    tasks: UnscheduledTask[],
+    config: TimelineConfig
+  ): IncrementalSchedule {
+    const inputTasks = [...tasks];
+    const inputIndexById = new Map<string, number>();
+    inputTasks.forEach((task, index) => inputIndexById.set(task.id, index));
+
+    let graph = this.buildGraph(inputTasks);
+    let state = this.createState(graph.sorted.length);
+    this.forwardPass(graph, state, config, 0);
+    this.backwardPass(graph, state, config);
+    let result = this.assembleResult(graph, state, config);
+    let lastAffected: string[] = graph.sorted.map(task => task.id);
+
+    const updateTask = (taskId: string, change: TaskScheduleChange): ScheduleResult => {
+      const inputIndex = inputIndexById.get(taskId);
+      if (inputIndex === undefined) {
+        lastAffected = [];
+        return result;
+      }
+      // Keys passed as undefined leave the task's current value in place
+      if (change.durationDays === undefined && change.dependencies === undefined) {
+        lastAffected = [];
+        return result;
+      }
+      const edited = { ...inputTasks[inputIndex] };
+      if (change.durationDays !== undefined) edited.durationDays = change.durationDays;
+      if (change.dependencies !== undefined) edited.dependencies = change.dependencies;
+      inputTasks[inputIndex] = edited;
+
+      const previousGraph = graph;
+      const previousState = state;
+      const previousTasks = result.tasks;
+      const previousPosition = previousGraph.positionById.get(taskId);
+
+      // Dependency edits can reorder the topological sort (and with it the
+      // phase rule), so re-index; duration edits keep the graph as-is.
+      if (change.dependencies) {
+        graph = this.buildGraph(inputTasks);
+      } else if (previousPosition !== undefined) {
+        graph.sorted[previousPosition] = inputTasks[inputIndex];
+      }
+
+      const position = graph.positionById.get(taskId);
+      if (
+        position === undefined ||
+        previousPosition === undefined ||
+        graph.sorted.length !== previousGraph.sorted.length
+      ) {
+        // Task entered or left a cycle - schedule from scratch
+        graph = change.dependencies ? graph : this.buildGraph(inputTasks);
+        state = this.createState(graph.sorted.length);
+        this.forwardPass(graph, state, config, 0);
+        this.backwardPass(graph, state, config);
+        result = this.assembleResult(graph, state, config);
+        lastAffected = graph.sorted.map(task => task.id);
+        return result;
+      }
+
+      // Carry dates and task objects over to the (possibly new) positions
+      let firstMoved = graph.sorted.length;
+      let lastMoved = -1;
+      const reusable: (TimelineTask | undefined)[] = new Array(graph.sorted.length);
+      if (graph !== previousGraph) {
+        state = this.createState(graph.sorted.length);
+        graph.sorted.forEach((task, p) => {
+          const q = previousGraph.positionById.get(task.id)!;
+          state.startDates[p] = previousState.startDates[q];
+          state.endDates[p] = previousState.endDates[q];
+          state.slack[p] = previousState.slack[q];
+          reusable[p] = previousTasks[q];
+          if (q !== p) {
+            firstMoved = Math.min(firstMoved, p);
+            lastMoved = p;
+          }
+        });
+      } else {
+        previousTasks.forEach((task, p) => (reusable[p] = task));
+      }
+
+      const previousProjectEnd = this.projectEnd(state, config).getTime();
+      const touched = this.forwardPass(
+        graph,
+        state,
+        config,
+        Math.min(position, firstMoved),
+        position,
+        lastMoved
+      );
+
+      // Slack depends on a task's end and its dependents' starts
+      const slackDirty = new Set<number>(touched);
+      for (const p of touched) {
+        for (const d of graph.dependencies[p]) slackDirty.add(d);
+      }
+      for (const depId of previousGraph.sorted[previousPosition].dependencies) {
+        const d = graph.positionById.get(depId);
+        if (d !== undefined) slackDirty.add(d);
+      }
+      for (const d of graph.dependencies[position]) slackDirty.add(d);
+
+      if (this.projectEnd(state, config).getTime() !== previousProjectEnd) {
+        this.backwardPass(graph, state, config);
+      } else {
+        this.backwardPass(graph, state, config, slackDirty);
+      }
+
+      // Task objects carry dates and dependents, so rebuild those that changed
+      slackDirty.add(position);
+      for (const p of slackDirty) reusable[p] = undefined;
+
+      result = this.assembleResult(graph, state, config, reusable);
+      lastAffected = touched.map(p => graph.sorted[p].id);
+      return result;
+    };
+
     return {
-      tasks: scheduledTasks,
-      phases,
-      milestones,
-      conflicts,
-      metrics: {
-        totalDays,
-        criticalPath,
-        criticalPathDays,
-        slack,
-        utilization: this.calculateUtilization(scheduledTasks, totalDays),
+      get result() {
+        return result;
+      },
+      get lastAffectedTaskIds() {
+        return lastAffected;
       },
+      updateTask,
+    };
+  }
+
+  private static createState(size: number): ScheduleState {
+    return {
+      startDates: new Array(size),
+      endDates: new Array(size),
+      slack: new Int32Array(size),
     };
   }
 
   /**
-   * Topological sort using Kahn's algorithm
+   * Topological sort using Kahn's algorithm, plus the adjacency arrays and
+   * phase ranks the passes index into
    */
-  private static topologicalSort(
-    tasks: Omit<TimelineTask, 'startDate' | 'endDate'>[]
-  ): { sorted: typeof tasks; hasCycle: boolean; cycleNodes: string[] } {
-    const inDegree = new Map<string, number>();
-    const adjacency = new Map<string, string[]>();
-    
-    // Initialize
-    tasks.forEach(task => {
-      inDegree.set(task.id, 0);
-      adjacency.set(task.id, []);
-    });
+  private static buildGraph(tasks: UnscheduledTask[]): TaskGraph {
+    const indexById = new Map<string, number>();
+    tasks.forEach((task, index) => indexById.set(task.id, index));
+
+    const inDegree = new Int32Array(tasks.length);
+    const adjacency: number[][] = tasks.map(() => []);
     
-    // Build graph
-    tasks.forEach(task => {
+    // Build graph. Unknown dependencies still count toward in-degree, so a
+    // task depending on a missing id is never released (reported with cycles).
+    tasks.forEach((task, index) => {
       task.dependencies.forEach(depId => {
-        const deps = adjacency.get(depId);
-        if (deps) deps.push(task.id);
-        inDegree.set(task.id, (inDegree.get(task.id) || 0) + 1);
+        const depIndex = indexById.get(depId);
+        if (depIndex !== undefined) adjacency[depIndex].push(index);
+        inDegree[index]++;
       });
     });
     
     // Find all nodes with no incoming edges
-    const queue: string[] = [];
-    inDegree.forEach((degree, id) => {
-      if (degree === 0) queue.push(id);
-    });
-    
-    const sorted: typeof tasks = [];
-    const taskMap = new Map(tasks.map(t => [t.id, t]));
-    
-    while (queue.length > 0) {
-      const id = queue.shift()!;
-      const task = taskMap.get(id);
-      if (task) sorted.push(task);
-      
-      const neighbors = adjacency.get(id) || [];
-      neighbors.forEach(neighborId => {
-        const newDegree = (inDegree.get(neighborId) || 1) - 1;
-        inDegree.set(neighborId, newDegree);
-        if (newDegree === 0) queue.push(neighborId);
-      });
+    const queue: number[] = [];
+    for (let index = 0; index < tasks.length; index++) {
+      if (inDegree[index] === 0) queue.push(index);
     }
     
+    for (let head = 0; head < queue.length; head++) {
+      for (const neighbor of adjacency[queue[head]]) {
+        if (--inDegree[neighbor] === 0) queue.push(neighbor);
+      }
+    }
+
+    const sorted = queue.map(index => tasks[index]);
+    const positionById = new Map<string, number>();
+    sorted.forEach((task, position) => positionById.set(task.id, position));
+
     // Check for cycle
     const hasCycle = sorted.length !== tasks.length;
     const cycleNodes = hasCycle
-      ? tasks.filter(t => !sorted.some(s => s.id === t.id)).map(t => t.id)
+      ? tasks.filter(task => !positionById.has(task.id)).map(task => task.id)
       : [];
-    
-    return { sorted, hasCycle, cycleNodes };
+
+    const dependencies: number[][] = [];
+    const dependents: number[][] = sorted.map(() => []);
+    sorted.forEach((task, position) => {
+      const depPositions: number[] = [];
+      for (const depId of task.dependencies) {
+        const depPosition = positionById.get(depId);
+        if (depPosition === undefined) continue;
+        depPositions.push(depPosition);
+        // Positions are visited in order, so duplicates can only be the last entry
+        const list = dependents[depPosition];
+        if (list[list.length - 1] !== position) list.push(position);
+      }
+      dependencies.push(depPositions);
+    });
+
+    const phaseNumbers = [...new Set(sorted.map(task => task.phase))].sort((a, b) => a - b);
+    const rankByPhase = new Map(phaseNumbers.map((phase, rank) => [phase, rank]));
+    const phaseRank = Int32Array.from(sorted, task => rankByPhase.get(task.phase)!);
+
+    return {
+      sorted,
+      positionById,
+      dependencies,
+      dependents,
+      phaseRank,
+      phaseCount: phaseNumbers.length,
+      hasCycle,
+      cycleNodes,
+    };
   }
 
   /**
-   * Forward pass - calculate earliest start dates
+   * Forward pass - calculate earliest start dates from position `from` on.
+   * A task starts after its dependencies and after every task in an earlier
+   * phase that precedes it in topological order; the latter is a prefix
+   * maximum over phase ranks kept in a Fenwick tree.
+   *
+   * With `seed`, only the seed, positions up to `forceUntil` (whose set of
+   * predecessors changed) and tasks whose inputs changed are re-dated;
+   * everything else is checked in O(log phases). Returns the positions whose
+   * dates changed (all positions from `from` in a full pass).
    */
   private static forwardPass(
-    sortedTasks: Omit<TimelineTask, 'startDate' | 'endDate'>[],
-    config: TimelineConfig
-  ): TimelineTask[] {
-    const scheduled: TimelineTask[] = [];
-    const earliestStart = new Map<string, Date>();
-    
-    sortedTasks.forEach(task => {
-      // Calculate earliest start based on dependencies
-      let taskStart = config.projectStartDate;
-      
-      if (task.dependencies.length > 0) {
-        task.dependencies.forEach(depId => {
-          const depTask = scheduled.find(t => t.id === depId);
-          if (depTask && depTask.endDate > taskStart) {
-            taskStart = this.addWorkingDays(depTask.endDate, 1, config);
+    graph: TaskGraph,
+    state: ScheduleState,
+    config: TimelineConfig,
+    from: number,
+    seed?: number,
+    forceUntil = -1
+  ): number[] {
+    const { sorted, dependencies, phaseRank } = graph;
+    const { startDates, endDates } = state;
+    const calendar = WorkingCalendar.forConfig(config);
+    const projectStart = config.projectStartDate.getTime();
+    const phaseMax = new PhaseMaxIndex(graph.phaseCount);
+    for (let p = 0; p < from; p++) phaseMax.update(phaseRank[p], endDates[p].getTime());
+
+    const incremental = seed !== undefined;
+    const endChanged = new Uint8Array(sorted.length);
+    let lowestChangedRank = Infinity;
+    const touched: number[] = [];
+
+    for (let p = from; p < sorted.length; p++) {
+      const needsUpdate =
+        !incremental ||
+        p === seed ||
+        p <= forceUntil ||
+        phaseRank[p] > lowestChangedRank ||
+        dependencies[p].some(d => endChanged[d] === 1);
+
+      if (needsUpdate) {
+        let taskStart = config.projectStartDate;
+
+        for (const d of dependencies[p]) {
+          if (endDates[d] > taskStart) {
+            taskStart = calendar.addWorkingDays(endDates[d], 1);
           }
-        });
-      }
-      
-      // Phase-based grouping (later phases start after earlier ones)
-      const earlierPhaseTasks = scheduled.filter(t => t.phase < task.phase);
-      if (earlierPhaseTasks.length > 0) {
-        const latestPhaseEnd = earlierPhaseTasks.reduce(
-          (latest, t) => t.endDate > latest ? t.endDate : latest,
-          config.projectStartDate
-        );
-        if (latestPhaseEnd > taskStart) {
-          taskStart = this.addWorkingDays(latestPhaseEnd, 1, config);
+        }
+
+        // Phase-based grouping (later phases start after earlier ones)
+        const earlierPhaseEnd = phaseMax.query(phaseRank[p]);
+        if (earlierPhaseEnd !== -Infinity) {
+          const latestPhaseEnd = Math.max(earlierPhaseEnd, projectStart);
+          if (latestPhaseEnd > taskStart.getTime()) {
+            taskStart = calendar.addWorkingDays(new Date(latestPhaseEnd), 1);
+          }
+        }
+
+        const taskEnd = calendar.addWorkingDays(taskStart, sorted[p].durationDays);
+
+        const startMoved = !incremental || startDates[p].getTime() !== taskStart.getTime();
+        const endMoved = !incremental || endDates[p].getTime() !== taskEnd.getTime();
+        if (startMoved || endMoved || p === seed) {
+          startDates[p] = taskStart;
+          endDates[p] = taskEnd;
+          touched.push(p);
+        }
+        if (incremental && endMoved) {
+          endChanged[p] = 1;
+          lowestChangedRank = Math.min(lowestChangedRank, phaseRank[p]);
         }
       }
-      
-      earliestStart.set(task.id, taskStart);
-      
-      const taskEnd = this.addWorkingDays(taskStart, task.durationDays, config);
-      
-      scheduled.push({
-        ...task,
-        startDate: taskStart,
-        endDate: taskEnd,
-        dependents: this.findDependents(task.id, sortedTasks),
-      });
-    });
-    
-    return scheduled;
+
+      phaseMax.update(phaseRank[p], endDates[p].getTime());
+    }
+
+    return touched;
   }
 
   /**
-   * Backward pass - calculate latest dates and slack
+   * Backward pass - calculate latest finish and slack.
+   * A task may finish as late as the working day before its earliest
+   * dependent starts (or the project end). Limit to `positions` when only
+   * part of the schedule moved and the project end held.
    */
   private static backwardPass(
-    scheduledTasks: TimelineTask[],
-    config: TimelineConfig
-  ): { criticalPath: string[]; slack: Record<string, number> } {
-    const latestFinish = new Map<string, Date>();
-    const slack: Record<string, number> = {};
-    
-    // Find project end (latest task end)
-    const projectEnd = scheduledTasks.reduce(
-      (latest, task) => task.endDate > latest ? task.endDate : latest,
-      config.projectStartDate
-    );
-    
-    // Process in reverse order
-    const reversed = [...scheduledTasks].reverse();
-    
-    reversed.forEach(task => {
-      // Calculate latest finish based on dependents
+    graph: TaskGraph,
+    state: ScheduleState,
+    config: TimelineConfig,
+    positions?: Iterable<number>
+  ): void {
+    const { dependents } = graph;
+    const { startDates, endDates, slack } = state;
+    const calendar = WorkingCalendar.forConfig(config);
+    const projectEnd = this.projectEnd(state, config);
+
+    const computeSlack = (p: number) => {
       let taskLatestFinish = projectEnd;
-      
-      task.dependents.forEach(depId => {
-        const depTask = scheduledTasks.find(t => t.id === depId);
-        if (depTask) {
-          const depLatestStart = this.subtractWorkingDays(depTask.startDate, 1, config);
-          if (depLatestStart < taskLatestFinish) {
-            taskLatestFinish = depLatestStart;
-          }
+      for (const q of dependents[p]) {
+        const depLatestStart = calendar.subtractWorkingDays(startDates[q], 1);
+        if (depLatestStart < taskLatestFinish) {
+          taskLatestFinish = depLatestStart;
         }
-      });
-      
-      latestFinish.set(task.id, taskLatestFinish);
-      
-      // Calculate slack
-      const taskSlack = this.calculateWorkingDays(task.endDate, taskLatestFinish, config);
-      slack[task.id] = Math.max(0, taskSlack);
+      }
+      slack[p] = Math.max(0, calendar.countWorkingDays(endDates[p], taskLatestFinish));
+    };
+
+    if (positions) {
+      for (const p of positions) computeSlack(p);
+    } else {
+      for (let p = graph.sorted.length - 1; p >= 0; p--) computeSlack(p);
+    }
+  }
+
+  /**
+   * Build the public result. Task objects present in `reusable` are kept
+   * so unchanged rows keep referential identity across incremental updates.
+   */
+  private static assembleResult(
+    graph: TaskGraph,
+    state: ScheduleState,
+    config: TimelineConfig,
+    reusable?: (TimelineTask | undefined)[]
+  ): ScheduleResult {
+    const { sorted, dependents } = graph;
+    const scheduledTasks: TimelineTask[] = sorted.map((task, p) => {
+      const previous = reusable?.[p];
+      if (previous) return previous;
+      return {
+        ...task,
+        startDate: state.startDates[p],
+        endDate: state.endDates[p],
+        dependents: dependents[p].map(q => sorted[q].id),
+      };
     });
+
+    const conflicts: ScheduleConflict[] = [];
+    if (graph.hasCycle) {
+      conflicts.push({
+        type: 'dependency_violation',
+        severity: 'error',
+        affectedTaskIds: graph.cycleNodes,
+        description: 'Circular dependency detected',
+        suggestedFix: 'Remove one of the dependency relationships between these tasks',
+      });
+      // Continue with partial schedule
+    }
+
+    // Calculate phases from tasks
+    const phases = this.calculatePhases(scheduledTasks, config);
     
+    // Generate milestones
+    const milestones = this.generateMilestones(scheduledTasks, phases, config);
+
+    // Validate schedule
+    conflicts.push(...this.validateSchedule(scheduledTasks, graph, config));
+
+    // Slack is keyed in backward-pass order
+    const slack: Record<string, number> = {};
+    for (let p = sorted.length - 1; p >= 0; p--) slack[sorted[p].id] = state.slack[p];
+
     // Critical path = tasks with 0 slack
-    const criticalPath = scheduledTasks
-      .filter(task => slack[task.id] === 0)
-      .map(task => task.id);
+    const criticalPath: string[] = [];
+    let criticalPathDays = 0;
+    sorted.forEach((task, p) => {
+      if (state.slack[p] === 0) {
+        criticalPath.push(task.id);
+        criticalPathDays += task.durationDays || 0;
+      }
+    });
+
+    // Calculate metrics
+    const totalDays = WorkingCalendar.forConfig(config).countWorkingDays(
+      config.projectStartDate,
+      this.projectEnd(state, config)
+    );
     
-    return { criticalPath, slack };
+    return {
+      tasks: scheduledTasks,
+      phases,
+      milestones,
+      conflicts,
+      metrics: {
+        totalDays,
+        criticalPath,
+        criticalPathDays,
+        slack,
+        utilization: this.calculateUtilization(scheduledTasks, totalDays),
+      },
+    };
   }
 
   /**
@@ -248,7 +492,13 @@ export class SchedulingEngine {
     tasks: TimelineTask[],
     config: TimelineConfig
   ): TimelinePhase[] {
-    const phaseNumbers = [...new Set(tasks.map(t => t.phase))].sort();
+    const tasksByPhase = new Map<number, TimelineTask[]>();
+    for (const task of tasks) {
+      const phaseTasks = tasksByPhase.get(task.phase);
+      if (phaseTasks) phaseTasks.push(task);
+      else tasksByPhase.set(task.phase, [task]);
+    }
+    const phaseNumbers = [...tasksByPhase.keys()].sort();
     
     const phaseColors = [
       '#3B82F6', // Blue
@@ -269,7 +519,7 @@ export class SchedulingEngine {
     ];
     
     return phaseNumbers.map((phaseNum, index) => {
-      const phaseTasks = tasks.filter(t => t.phase === phaseNum);
+      const phaseTasks = tasksByPhase.get(phaseNum) || [];
       const startDate = phaseTasks.reduce(
         (earliest, t) => t.startDate < earliest ? t.startDate : earliest,
         phaseTasks[0]?.startDate || config.projectStartDate
@@ -341,6 +591,7 @@ export class SchedulingEngine {
    */
   private static validateSchedule(
     tasks: TimelineTask[],
+    graph: TaskGraph,
     config: TimelineConfig
   ): ScheduleConflict[] {
     const conflicts: ScheduleConflict[] = [];
@@ -359,10 +610,9 @@ export class SchedulingEngine {
     });
     
     // Check for tasks after project end (with buffer)
-    const hardDeadline = this.addWorkingDays(
+    const hardDeadline = WorkingCalendar.forConfig(config).addWorkingDays(
       config.projectEndDate,
-      config.bufferDays,
-      config
+      config.bufferDays
     );
     
     tasks.forEach(task => {
@@ -380,7 +630,8 @@ export class SchedulingEngine {
     // Check for dependency violations
     tasks.forEach(task => {
       task.dependencies.forEach(depId => {
-        const depTask = tasks.find(t => t.id === depId);
+        const depPosition = graph.positionById.get(depId);
+        const depTask = depPosition !== undefined ? tasks[depPosition] : undefined;
         if (depTask && task.startDate < depTask.endDate) {
           conflicts.push({
             type: 'dependency_violation',
@@ -400,86 +651,12 @@ export class SchedulingEngine {
   // HELPER METHODS
   // =========================================================================
 
-  private static findDependents(
-    taskId: string,
-    tasks: Omit<TimelineTask, 'startDate' | 'endDate'>[]
-  ): string[] {
-    return tasks.filter(t => t.dependencies.includes(taskId)).map(t => t.id);
-  }
-
-  private static addWorkingDays(
-    date: Date,
-    days: number,
-    config: TimelineConfig
-  ): Date {
-    const result = new Date(date);
-    let addedDays = 0;
-    
-    while (addedDays < days) {
-      result.setDate(result.getDate() + 1);
-      
-      const dayOfWeek = result.getDay();
-      const isWeekend = dayOfWeek === 0 || dayOfWeek === 6;
-      const isHoliday = config.holidayDates.some(
-        h => h.toDateString() === result.toDateString()
-      );
-      
-      if (!isWeekend && !isHoliday) {
-        addedDays++;
-      }
+  private static projectEnd(state: ScheduleState, config: TimelineConfig): Date {
+    let latest = config.projectStartDate;
+    for (const end of state.endDates) {
+      if (end.getTime() > latest.getTime()) latest = end;
     }
-    
-    return result;
-  }
-
-  private static subtractWorkingDays(
-    date: Date,
-    days: number,
-    config: TimelineConfig
-  ): Date {
-    const result = new Date(date);
-    let subtractedDays = 0;
-    
-    while (subtractedDays < days) {
-      result.setDate(result.getDate() - 1);
-      
-      const dayOfWeek = result.getDay();
-      const isWeekend = dayOfWeek === 0 || dayOfWeek === 6;
-      const isHoliday = config.holidayDates.some(
-        h => h.toDateString() === result.toDateString()
-      );
-      
-      if (!isWeekend && !isHoliday) {
-        subtractedDays++;
-      }
-    }
-    
-    return result;
-  }
-
-  private static calculateWorkingDays(
-    startDate: Date,
-    endDate: Date,
-    config: TimelineConfig
-  ): number {
-    let workingDays = 0;
-    const current = new Date(startDate);
-    
-    while (current < endDate) {
-      current.setDate(current.getDate() + 1);
-      
-      const dayOfWeek = current.getDay();
-      const isWeekend = dayOfWeek === 0 || dayOfWeek === 6;
-      const isHoliday = config.holidayDates.some(
-        h => h.toDateString() === current.toDateString()
-      );
-      
-      if (!isWeekend && !isHoliday) {
-        workingDays++;
-      }
-    }
-    
-    return workingDays;
+    return latest;
   }
 
   private static calculateUtilization(
@@ -493,6 +670,37 @@ export class SchedulingEngine {
   }
 }
 
+// =============================================================================
+// INDEXING HELPERS
+// =============================================================================
+
+/**
+ * Fenwick tree over phase ranks answering "latest end among tasks in an
+ * earlier phase". End dates only ever raise a slot within one pass.
+ */
+class PhaseMaxIndex {
+  private tree: Float64Array;
+
+  constructor(size: number) {
+    this.tree = new Float64Array(size + 1).fill(-Infinity);
+  }
+
+  update(rank: number, value: number): void {
+    for (let i = rank + 1; i < this.tree.length; i += i & -i) {
+      if (value > this.tree[i]) this.tree[i] = value;
+    }
+  }
+
+  /** Max over ranks strictly below `rank` */
+  query(rank: number): number {
+    let result = -Infinity;
+    for (let i = rank; i > 0; i -= i & -i) {
+      if (this.tree[i] > result) result = this.tree[i];
+    }
+    return result;
+  }
+}
+
 // =============================================================================
 // SCHEDULE OPTIMIZER
 // =============================================================================
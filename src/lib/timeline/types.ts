@@ -84,6 +84,21 @@ export interface ScheduleResult {
   };
 }
 
+/**
+ * Single-task edit applied to an incremental schedule
+ */
+export interface TaskScheduleChange {
+  durationDays?: number;
+  dependencies?: string[];
+}
+
+export interface IncrementalSchedule {
+  readonly result: ScheduleResult;
+  /** Task ids re-dated by the most recent update */
+  readonly lastAffectedTaskIds: string[];
+  updateTask(taskId: string, change: TaskScheduleChange): ScheduleResult;
+}
+
 export interface GanttViewOptions {
   viewMode: 'day' | 'week' | 'month';
   showDependencies: boolean;
@@ -0,0 +1,251 @@
+/**
+ * @file benchmark-budget-optimizer.ts
+ * @description Benchmark for BudgetOptimizer solver modes
+ *
+ * Run with: npx tsx src/scripts/benchmark-budget-optimizer.ts
+ *
+ * Compares the cent-level DP (`dp`), ratio greedy (`greedy`) and the
+ * bucketed exact solver (`exact`) across item counts and optional budgets,
+ * reporting wall time, peak memory and the optimality gap relative to the
+ * exact solver. A negative gap means the solver broke a constraint the exact
+ * solver honours (the legacy DP drops dependencies).
+ *
+ * Each solve runs in its own child process so memory freed by an earlier
+ * solve cannot hide the next one's allocations. Solves are synchronous, so a
+ * worker thread polls the process RSS every millisecond while one runs; peak
+ * memory is the highest RSS seen minus the RSS just before the solve, which
+ * includes the DP tables at their largest.
+ */
+
+import { fork } from 'child_process';
+import { Worker } from 'worker_threads';
+import { BudgetOptimizer, type OptimizableItem, type OptimizationSolver } from '../lib/priority-engine';
+
+const ITEM_COUNTS = [20, 60, 150];
+const BUDGETS = [9_000, 50_000, 250_000, 500_000];
+const SOLVERS: OptimizationSolver[] = ['dp', 'greedy', 'exact'];
+const CATEGORIES = ['kitchen', 'bathroom', 'flooring', 'interior', 'exterior', 'roofing', 'hvac'];
+
+// The legacy DP keeps an n × (budget × 100) boolean table; skip runs that would exhaust the heap
+const MAX_LEGACY_DP_CELLS = 60_000_000;
+const SAMPLE_INTERVAL_MS = 1;
+
+interface SolveRun {
+  items: number;
+  budget: number;
+  solver: OptimizationSolver;
+  maxItems?: number;
+  withDependencies: boolean;
+}
+
+interface SolveMeasurement {
+  ms: number;
+  peakBytes: number;
+  value: number;
+  note: string;
+}
+
+interface BenchmarkRow {
+  items: number;
+  budget: number;
+  solver: OptimizationSolver;
+  ms: number;
+  memoryMB: number;
+  value: number;
+  gapPct: number;
+  note: string;
+}
+
+/** Deterministic PRNG so runs are comparable */
+function mulberry32(seed: number) {
+  return () => {
+    seed |= 0;
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function generateItems(count: number, seed: number, withDependencies: boolean): OptimizableItem[] {
+  const random = mulberry32(seed);
+  const priorities: OptimizableItem['priority'][] = ['should', 'could', 'nice'];
+
+  return Array.from({ length: count }, (_, index) => {
+    const cost = Math.round((250 + random() * 24_750) * 100) / 100;
+    const dependencies =
+      withDependencies && index > 0 && random() < 0.2
+        ? [`item-${Math.floor(random() * index)}`]
+        : [];
+    return {
+      id: `item-${index}`,
+      name: `Item ${index}`,
+      cost,
+      value: Math.round(cost * (0.3 + random() * 1.7)),
+      priority: priorities[Math.floor(random() * priorities.length)],
+      category: CATEGORIES[Math.floor(random() * CATEGORIES.length)],
+      dependencies,
+    };
+  });
+}
+
+function collectGarbage() {
+  const gc = (globalThis as { gc?: () => void }).gc;
+  if (gc) gc();
+}
+
+/**
+ * Peak RSS sampler on its own thread, so it keeps polling while the main
+ * thread is busy in a solve. The peak is shared through a BigInt64Array.
+ */
+class PeakMemorySampler {
+  private readonly peak = new BigInt64Array(new SharedArrayBuffer(8));
+  private worker: Worker | null = null;
+
+  async start(): Promise<void> {
+    this.worker = new Worker(
+      `
+      const { parentPort, workerData } = require('worker_threads');
+      const { peak, intervalMs } = workerData;
+      const pause = new Int32Array(new SharedArrayBuffer(4));
+      parentPort.postMessage('sampling');
+      for (;;) {
+        const rss = BigInt(process.memoryUsage.rss());
+        if (rss > Atomics.load(peak, 0)) Atomics.store(peak, 0, rss);
+        Atomics.wait(pause, 0, 0, intervalMs);
+      }
+      `,
+      { eval: true, workerData: { peak: this.peak, intervalMs: SAMPLE_INTERVAL_MS } }
+    );
+    await new Promise((resolve) => this.worker!.once('message', resolve));
+  }
+
+  /** Run `fn` and return its result with the RSS growth at its peak, in bytes */
+  measure<T>(fn: () => T): { result: T; peakBytes: number } {
+    const baseline = process.memoryUsage.rss();
+    Atomics.store(this.peak, 0, BigInt(baseline));
+    const result = fn();
+    const peak = Math.max(Number(Atomics.load(this.peak, 0)), process.memoryUsage.rss());
+    return { result, peakBytes: Math.max(0, peak - baseline) };
+  }
+
+  async stop(): Promise<void> {
+    await this.worker?.terminate();
+  }
+}
+
+/** One solve, measured (runs in a child process) */
+async function measureSolve(run: SolveRun): Promise<SolveMeasurement> {
+  const items = generateItems(run.items, run.items * 7919, run.withDependencies);
+  const sampler = new PeakMemorySampler();
+  await sampler.start();
+  collectGarbage();
+
+  const start = performance.now();
+  const { result, peakBytes } = sampler.measure(() =>
+    BudgetOptimizer.optimize(items, {
+      budget: run.budget,
+      solver: run.solver,
+      maxItems: run.maxItems,
+      respectDependencies: run.withDependencies,
+    })
+  );
+  const ms = performance.now() - start;
+  await sampler.stop();
+
+  let note = '';
+  if (run.solver === 'dp' && run.budget > 10_000) note = 'greedy fallback';
+  if (result.solver) {
+    note = `${result.solver.method}, $${result.solver.granularity || 'exact'} buckets${
+      result.solver.provenOptimal ? ', proven' : ''
+    }`;
+  }
+
+  return { ms, peakBytes, value: result.totalValue, note };
+}
+
+function measureInChild(run: SolveRun): Promise<SolveMeasurement> {
+  return new Promise((resolve, reject) => {
+    const child = fork(process.argv[1], [], {
+      env: { ...process.env, BUDGET_BENCH_RUN: JSON.stringify(run) },
+      execArgv: [...process.execArgv, '--expose-gc'],
+    });
+    child.once('message', (message) => resolve(message as SolveMeasurement));
+    child.once('error', reject);
+    child.once('exit', (code) => {
+      if (code !== 0) reject(new Error(`Solve ${JSON.stringify(run)} exited with code ${code}`));
+    });
+  });
+}
+
+async function runSuite(label: string, withDependencies: boolean, maxItems?: number) {
+  const rows: BenchmarkRow[] = [];
+
+  for (const itemCount of ITEM_COUNTS) {
+    for (const budget of BUDGETS) {
+      const results: BenchmarkRow[] = [];
+
+      for (const solver of SOLVERS) {
+        if (solver === 'dp' && budget <= 10_000 && itemCount * budget * 100 > MAX_LEGACY_DP_CELLS) {
+          results.push({
+            items: itemCount,
+            budget,
+            solver,
+            ms: NaN,
+            memoryMB: NaN,
+            value: NaN,
+            gapPct: NaN,
+            note: 'skipped (keep-table too large)',
+          });
+          continue;
+        }
+
+        const { ms, peakBytes, value, note } = await measureInChild({
+          items: itemCount,
+          budget,
+          solver,
+          maxItems,
+          withDependencies,
+        });
+        results.push({ items: itemCount, budget, solver, ms, memoryMB: peakBytes / 1024 / 1024, value, gapPct: 0, note });
+      }
+
+      const exactValue = results.find((row) => row.solver === 'exact')?.value ?? 0;
+      for (const row of results) {
+        row.gapPct = exactValue > 0 ? ((exactValue - row.value) / exactValue) * 100 : 0;
+      }
+      rows.push(...results);
+    }
+  }
+
+  console.log(`\n${label}`);
+  console.table(
+    rows.map((row) => ({
+      items: row.items,
+      budget: `$${row.budget.toLocaleString()}`,
+      solver: row.solver,
+      'time (ms)': Number.isNaN(row.ms) ? '-' : row.ms.toFixed(1),
+      'peak mem (MB)': Number.isNaN(row.memoryMB) ? '-' : row.memoryMB.toFixed(1),
+      value: Number.isNaN(row.value) ? '-' : row.value,
+      'gap %': Number.isNaN(row.gapPct) ? '-' : row.gapPct.toFixed(2),
+      note: row.note,
+    }))
+  );
+}
+
+async function main() {
+  const run = process.env.BUDGET_BENCH_RUN;
+  if (run) {
+    process.send?.(await measureSolve(JSON.parse(run) as SolveRun));
+    return;
+  }
+
+  await runSuite('Independent items', false);
+  await runSuite('Independent items, maxItems = 10', false, 10);
+  await runSuite('With dependencies', true);
+}
+
+main().catch((err) => {
+  console.error('❌ Benchmark failed:', err);
+  process.exit(1);
+});
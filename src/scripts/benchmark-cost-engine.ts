@@ -0,0 +1,146 @@
+/**
+ * @file benchmark-cost-engine.ts
+ * @description Benchmark for the cost catalog and CostCalculationEngine
+ *
+ * Run with: npx tsx src/scripts/benchmark-cost-engine.ts
+ *
+ * Prices 10k synthetic line items for one location three ways: one
+ * calculateItemCost call per line, a single calculateBatch call, and the
+ * scope builder path (ScopeIntegration.calculateScopeItemCosts, which also
+ * matches each scope item against the catalog). Also times catalog search
+ * with repeated and unique terms.
+ */
+
+import type { ScopeItem } from '../types/rehab';
+import {
+  BASE_COST_DATABASE,
+  CostCalculationEngine,
+  ScopeIntegration,
+  searchCostItems,
+  type CostBatchLine,
+  type CostCalculationInput,
+} from '../lib/cost-calculator';
+
+const LINE_ITEMS = 10_000;
+const SEARCH_QUERIES = 10_000;
+const LOCATIONS = [
+  { label: 'exact zip', location: { zipCode: '90210', state: 'CA' } },
+  { label: 'zip prefix', location: { zipCode: '90299', state: 'CA' } },
+  { label: 'state fallback', location: { zipCode: '45000', state: 'OH' } },
+];
+
+const URGENCY = ['low', 'medium', 'high'] as const;
+const COMPLEXITY = ['simple', 'moderate', 'complex'] as const;
+const ACCESSIBILITY = ['easy', 'moderate', 'difficult'] as const;
+const PRIORITIES: ScopeItem['priority'][] = ['must', 'should', 'could', 'nice'];
+
+/** Deterministic PRNG so runs are comparable */
+function mulberry32(seed: number) {
+  return () => {
+    seed |= 0;
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function pick<T>(random: () => number, values: readonly T[]): T {
+  return values[Math.floor(random() * values.length)];
+}
+
+function generateLines(count: number, seed: number): CostBatchLine[] {
+  const random = mulberry32(seed);
+  return Array.from({ length: count }, () => ({
+    item: pick(random, BASE_COST_DATABASE),
+    quantity: 1 + Math.floor(random() * 400),
+    projectConditions: {
+      urgency: pick(random, URGENCY),
+      complexity: pick(random, COMPLEXITY),
+      accessibility: pick(random, ACCESSIBILITY),
+    },
+  }));
+}
+
+function generateScopeItems(lines: CostBatchLine[], seed: number): ScopeItem[] {
+  const random = mulberry32(seed);
+  return lines.map((line, index) => ({
+    id: `scope-${index}`,
+    projectId: 'benchmark',
+    category: line.item.category,
+    subcategory: line.item.subcategory,
+    itemName: line.item.itemName,
+    quantity: line.quantity,
+    unitOfMeasure: line.item.unit,
+    materialCost: 0,
+    laborCost: 0,
+    totalCost: 0,
+    priority: pick(random, PRIORITIES),
+    roiImpact: 0,
+    daysRequired: 0,
+    dependsOn: [],
+    phase: 1,
+    included: true,
+    completed: false,
+  }));
+}
+
+function time<T>(fn: () => T): { value: T; ms: number } {
+  const start = performance.now();
+  const value = fn();
+  return { value, ms: performance.now() - start };
+}
+
+function perSecond(count: number, ms: number): string {
+  return Math.round((count / ms) * 1000).toLocaleString();
+}
+
+function main() {
+  const lines = generateLines(LINE_ITEMS, 42);
+  const scopeItems = generateScopeItems(lines, 7);
+  const rows: Record<string, string | number>[] = [];
+
+  for (const { label, location } of LOCATIONS) {
+    const qualityTier: CostCalculationInput['qualityTier'] = 'standard';
+
+    const perItem = time(() =>
+      lines.map((line) => CostCalculationEngine.calculateItemCost({ ...line, qualityTier, location }))
+    );
+    const batch = time(() => CostCalculationEngine.calculateBatch(lines, { location, qualityTier }));
+    const scope = time(() => ScopeIntegration.calculateScopeItemCosts(scopeItems, location, qualityTier));
+
+    // Both paths must agree; a mismatch means the batch path drifted
+    const mismatches = perItem.value.filter(
+      (result, index) => result.totalCost !== batch.value.items[index].totalCost
+    ).length;
+
+    rows.push({
+      location: label,
+      'per-item (ms)': perItem.ms.toFixed(1),
+      'batch (ms)': batch.ms.toFixed(1),
+      'batch items/s': perSecond(LINE_ITEMS, batch.ms),
+      'scope integration (ms)': scope.ms.toFixed(1),
+      mismatches,
+    });
+  }
+
+  console.log(`\nPricing ${LINE_ITEMS.toLocaleString()} line items`);
+  console.table(rows);
+
+  const random = mulberry32(99);
+  const names = BASE_COST_DATABASE.map((item) => item.itemName);
+  const repeated = time(() => {
+    for (let i = 0; i < SEARCH_QUERIES; i++) searchCostItems(pick(random, names));
+  });
+  const unique = time(() => {
+    for (let i = 0; i < SEARCH_QUERIES; i++) searchCostItems(`${pick(random, names)} ${i}`);
+  });
+
+  console.log(`\nCatalog search (${BASE_COST_DATABASE.length} items)`);
+  console.table([
+    { queries: 'repeated terms', 'time (ms)': repeated.ms.toFixed(1), 'queries/s': perSecond(SEARCH_QUERIES, repeated.ms) },
+    { queries: 'unique terms', 'time (ms)': unique.ms.toFixed(1), 'queries/s': perSecond(SEARCH_QUERIES, unique.ms) },
+  ]);
+}
+
+main();
@@ -0,0 +1,323 @@
+/**
+ * @file benchmark-report-generation.ts
+ * @description Benchmark for the streaming `reports.generate` pipeline
+ *
+ * Run with: npx tsx src/scripts/benchmark-report-generation.ts
+ *
+ * Generates reports for batches of 1, 50 and 500 synthetic projects (40 scope
+ * items, 6 comparables and 6 photos each) against a simulated data source with
+ * query and thumbnail-download latency, writing PDFs to a temp directory and
+ * caching sections in a MemorySharedStore. Each batch size runs in its own
+ * child process so peak memory is not inherited from a larger run.
+ *
+ * Phases per batch size:
+ * - cold: empty cache and storage, one PDF per project
+ * - re-export: nothing changed, so every PDF is reused from storage
+ * - edited: one scope item changed per project; only its sections re-render
+ * - combined: one PDF for the whole batch from cached sections
+ * - combined, buffered: the same document collected in memory before writing
+ *   (how pdf-lib / jsPDF style generators hold it), for comparison
+ *
+ * Peak RSS and peak live memory (heap + external buffers) are sampled every 5ms.
+ * The section cache's MemorySharedStore (Redis in production) lives in the same
+ * process, so the data it holds is reported alongside.
+ */
+
+import { fork } from 'child_process';
+import { mkdtempSync, rmSync } from 'fs';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { Writable } from 'stream';
+import { MemorySharedStore } from '../lib/tiered-cache';
+import { generateReports } from '../server/reports/generate-reports';
+import { readJpegInfo } from '../server/reports/pdf-writer';
+import { FileReportStore, type ReportStore } from '../server/reports/report-store';
+import { configureReportCache } from '../server/reports/sections';
+import type {
+  ProjectReportData,
+  ReportDataSource,
+  ReportGenerationSummary,
+  ReportTarget,
+} from '../server/reports/types';
+
+const BATCH_SIZES = [1, 50, 500];
+const SCOPE_ITEMS_PER_PROJECT = 40;
+const COMPS_PER_PROJECT = 6;
+const PHOTOS_PER_PROJECT = 6;
+const QUERY_LATENCY_MS = 4;
+const THUMBNAIL_LATENCY_MS = 12;
+// Padding so thumbnails are roughly the size of a 300x300 JPEG
+const THUMBNAIL_BYTES = 16_000;
+const SAMPLE_INTERVAL_MS = 5;
+
+// 2x2 grayscale baseline JPEG
+const BASE_JPEG = Buffer.from(
+  '/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAgGBgcGBQgHBwcJCQgKDBQNDAsLDBkSEw8UHRofHh0aHBwgJC4nICIsIxwcKDcpLDAxNDQ0Hyc5PTgyPC4zNDL/wAALCAACAAIBAREA/8QAHwAAAQUBAQEBAQEAAAAAAAAAAAECAwQFBgcICQoL/8QAtRAAAgEDAwIEAwUFBAQAAAF9AQIDAAQRBRIhMUEGE1FhByJxFDKBkaEII0KxwRVS0fAkM2JyggkKFhcYGRolJicoKSo0NTY3ODk6Q0RFRkdISUpTVFVWV1hZWmNkZWZnaGlqc3R1dnd4eXqDhIWGh4iJipKTlJWWl5iZmqKjpKWmp6ipqrKztLW2t7i5usLDxMXGx8jJytLT1NXW19jZ2uHi4+Tl5ufo6erx8vP09fb3+Pn6/9oACAEBAAA/ACv/2Q==',
+  'base64'
+);
+
+const CATEGORIES = ['Kitchen', 'Bathroom', 'Flooring', 'Exterior', 'Electrical', 'Plumbing', 'HVAC', 'Paint'];
+
+function sleep(ms: number) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+/** Insert a comment segment after SOI so the thumbnail has a realistic size */
+function paddedJpeg(seed: number): Buffer {
+  const length = THUMBNAIL_BYTES - BASE_JPEG.length - 4;
+  const segment = Buffer.alloc(length + 4, seed & 0xff);
+  segment.writeUInt16BE(0xfffe, 0);
+  segment.writeUInt16BE(length + 2, 2);
+  return Buffer.concat([BASE_JPEG.subarray(0, 2), segment, BASE_JPEG.subarray(2)]);
+}
+
+function syntheticProject(index: number, revision: number): ProjectReportData {
+  const id = `project-${index}`;
+  return {
+    project: {
+      id,
+      name: `Project ${index}`,
+      address: `${100 + index} Maple Ave, Minneapolis, MN 55401`,
+      propertyType: 'single_family',
+      squareFeet: 1400 + (index % 20) * 25,
+      yearBuilt: 1950 + (index % 50),
+      bedrooms: 3,
+      bathrooms: 2,
+      strategy: 'flip',
+      holdPeriodMonths: 6,
+      purchasePrice: 240_000 + index * 100,
+      arv: 360_000 + index * 120,
+      maxBudget: 80_000,
+      totalEstimatedCost: null,
+      estimatedDays: 75,
+      status: 'planning',
+    },
+    scopeItems: Array.from({ length: SCOPE_ITEMS_PER_PROJECT }, (_, item) => ({
+      category: CATEGORIES[item % CATEGORIES.length],
+      itemName: `Scope item ${item + 1} for project ${index}`,
+      location: `Room ${(item % 6) + 1}`,
+      quantity: 10 + item,
+      unitOfMeasure: 'sqft',
+      priority: item % 3 === 0 ? 'must' : 'should',
+      phase: (item % 4) + 1,
+      totalCost: 500 + item * 75 + (item === 0 ? revision * 250 : 0),
+      included: item % 9 !== 0,
+    })),
+    comparables: Array.from({ length: COMPS_PER_PROJECT }, (_, comp) => ({
+      address: `${200 + comp} Oak St, Minneapolis, MN`,
+      salePrice: 340_000 + comp * 7_500,
+      saleDate: `2026-0${(comp % 9) + 1}-15`,
+      squareFeet: 1350 + comp * 40,
+      bedrooms: 3,
+      bathrooms: 2,
+      distanceMiles: 0.2 + comp * 0.15,
+      adjustedValue: null,
+    })),
+    photos: Array.from({ length: PHOTOS_PER_PROJECT }, (_, photo) => ({
+      storagePath: `${id}/photo-${photo}.jpg`,
+      caption: `Photo ${photo + 1}`,
+      category: 'before',
+      takenAt: '2026-05-01T12:00:00Z',
+    })),
+  };
+}
+
+function syntheticSource(revision: number): ReportDataSource {
+  return {
+    async loadProject(id) {
+      await sleep(QUERY_LATENCY_MS);
+      return syntheticProject(Number(id.replace('project-', '')), revision);
+    },
+    async loadDeal() {
+      return null;
+    },
+    async loadThumbnail(storagePath) {
+      await sleep(THUMBNAIL_LATENCY_MS);
+      return paddedJpeg(storagePath.length);
+    },
+  };
+}
+
+/** MemorySharedStore that tracks how much it holds, to separate it from generator memory */
+class MeasuredSharedStore extends MemorySharedStore {
+  bytes = 0;
+
+  async set(key: string, value: string, ttlMs: number): Promise<void> {
+    this.bytes += value.length;
+    return super.set(key, value, ttlMs);
+  }
+}
+
+/** Collects the whole document before "uploading" it */
+class BufferedReportStore implements ReportStore {
+  bytes = 0;
+
+  async stat() {
+    return null;
+  }
+
+  openWrite() {
+    const chunks: Buffer[] = [];
+    let resolve!: () => void;
+    const done = new Promise<void>((settle) => (resolve = settle));
+    const stream = new Writable({
+      write: (chunk, _encoding, callback) => {
+        chunks.push(chunk);
+        callback();
+      },
+      final: (callback) => {
+        this.bytes = Buffer.concat(chunks).length;
+        resolve();
+        callback();
+      },
+    });
+    return { stream, done };
+  }
+
+  async list() {
+    return [];
+  }
+
+  async remove() {}
+}
+
+interface PhaseResult {
+  size: number;
+  phase: string;
+  ms: number;
+  peakRssMb: number;
+  peakLiveMb: number;
+  cacheMb: number;
+  pages: number;
+  outputMb: number;
+  reused: number;
+  rendered: number;
+  cached: number;
+}
+
+const mb = (bytes: number) => Math.round((bytes / 1024 / 1024) * 10) / 10;
+
+async function measure(
+  size: number,
+  phase: string,
+  cache: MeasuredSharedStore,
+  run: () => Promise<ReportGenerationSummary>
+): Promise<PhaseResult> {
+  globalThis.gc?.();
+  let peakRss = 0;
+  let peakLive = 0;
+  const sample = () => {
+    const usage = process.memoryUsage();
+    peakRss = Math.max(peakRss, usage.rss);
+    peakLive = Math.max(peakLive, usage.heapUsed + usage.external);
+  };
+  sample();
+  const timer = setInterval(sample, SAMPLE_INTERVAL_MS);
+  const started = performance.now();
+  const summary = await run();
+  const ms = performance.now() - started;
+  clearInterval(timer);
+  sample();
+
+  return {
+    size,
+    phase,
+    ms,
+    peakRssMb: mb(peakRss),
+    peakLiveMb: mb(peakLive),
+    cacheMb: mb(cache.bytes),
+    pages: summary.reports.reduce((sum, report) => sum + (report.pages ?? 0), 0),
+    outputMb: mb(summary.reports.reduce((sum, report) => sum + report.bytes, 0)),
+    reused: summary.reports.filter((report) => report.reused).length,
+    rendered: summary.sectionsRendered,
+    cached: summary.sectionsCached,
+  };
+}
+
+async function runBatch(size: number): Promise<PhaseResult[]> {
+  const dir = mkdtempSync(join(tmpdir(), 'report-bench-'));
+  const store = new FileReportStore(dir);
+  const cache = new MeasuredSharedStore();
+  configureReportCache(cache);
+  const targets: ReportTarget[] = Array.from({ length: size }, (_, index) => ({
+    type: 'project',
+    id: `project-${index}`,
+  }));
+
+  try {
+    const results = [
+      await measure(size, 'cold', cache, () => generateReports(targets, { source: syntheticSource(0), store })),
+      await measure(size, 're-export', cache, () => generateReports(targets, { source: syntheticSource(0), store })),
+      await measure(size, 'edited', cache, () => generateReports(targets, { source: syntheticSource(1), store })),
+      await measure(size, 'combined', cache, () =>
+        generateReports(targets, { source: syntheticSource(1), store }, { mode: 'combined', batchId: 'bench' })
+      ),
+    ];
+    const buffered = new BufferedReportStore();
+    results.push(
+      await measure(size, 'combined, buffered', cache, () =>
+        generateReports(targets, { source: syntheticSource(1), store: buffered }, { mode: 'combined' })
+      )
+    );
+    return results;
+  } finally {
+    rmSync(dir, { recursive: true, force: true });
+  }
+}
+
+async function main() {
+  if (!readJpegInfo(paddedJpeg(0))) {
+    throw new Error('Synthetic thumbnail is not a readable JPEG');
+  }
+
+  const batchArg = process.env.REPORT_BENCH_BATCH;
+  if (batchArg) {
+    process.send?.(await runBatch(Number(batchArg)));
+    return;
+  }
+
+  const rows: Record<string, string | number>[] = [];
+  for (const size of BATCH_SIZES) {
+    const results = await new Promise<PhaseResult[]>((resolve, reject) => {
+      const child = fork(process.argv[1], [], {
+        env: { ...process.env, REPORT_BENCH_BATCH: String(size) },
+        execArgv: [...process.execArgv, '--expose-gc'],
+      });
+      child.once('message', (message) => resolve(message as PhaseResult[]));
+      child.once('error', reject);
+      child.once('exit', (code) => {
+        if (code !== 0) reject(new Error(`Batch ${size} exited with code ${code}`));
+      });
+    });
+
+    for (const result of results) {
+      rows.push({
+        projects: result.size,
+        phase: result.phase,
+        ms: Math.round(result.ms),
+        'ms/project': (result.ms / result.size).toFixed(1),
+        'peak RSS MB': result.peakRssMb,
+        'peak live MB': result.peakLiveMb,
+        'cache MB': result.cacheMb,
+        pages: result.pages,
+        'output MB': result.outputMb,
+        reused: result.reused,
+        'sections rendered': result.rendered,
+        'sections cached': result.cached,
+      });
+    }
+  }
+
+  console.log('\n📄 Report generation (simulated Supabase latency)\n');
+  console.table(rows);
+  console.log(
+    `\nQuery latency ${QUERY_LATENCY_MS}ms per project, thumbnail download ${THUMBNAIL_LATENCY_MS}ms ` +
+      `(${THUMBNAIL_BYTES.toLocaleString()} bytes). "cache MB" is what the in-memory stand-in for ` +
+      'Redis holds; it is part of the live memory measured here.'
+  );
+}
+
+main().catch((err) => {
+  console.error('❌ Benchmark failed:', err);
+  process.exit(1);
+});
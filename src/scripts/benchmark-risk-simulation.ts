@@ -0,0 +1,235 @@
+/**
+ * @file benchmark-risk-simulation.ts
+ * @description Benchmark for the Monte Carlo deal risk simulation
+ *
+ * Run with: npx tsx src/scripts/benchmark-risk-simulation.ts
+ *
+ * Reports draws/sec for:
+ * - the per-draw object path (one calculateFinancing call per sampled deal,
+ *   which builds a month-by-month breakdown)
+ * - the columnar engine in-process at 10k, 100k and 1M draws
+ * - the worker_threads runner at 1M and 5M draws (in-process on one core)
+ *
+ * Also checks that zero-variance simulations reproduce calculateFinancing
+ * and calculateROI (flip, wholetail, rental; airbnb runs must be flagged as
+ * not comparable), and that parallel runs match in-process runs exactly.
+ */
+
+import { availableParallelism } from 'os';
+import {
+  calculateFinancing,
+  estimateMonthlyHoldingCosts,
+  simulateDealRisk,
+  simulateFinancingRisk,
+  toFinancingRiskModel,
+  type FinancingInputs,
+  type RiskDistributions,
+} from '../lib/financing';
+import { runRiskSimulation } from '../lib/financing/risk-simulation-parallel';
+import { ROICalculationEngine, type ROICalculationInput } from '../lib/roi-calculator';
+
+const OBJECT_PATH_DRAWS = 10_000;
+const IN_PROCESS_DRAWS = [10_000, 100_000, 1_000_000];
+const PARALLEL_DRAWS = [1_000_000, 5_000_000];
+
+const FINANCING_INPUTS: FinancingInputs = {
+  purchasePrice: 250_000,
+  arv: 380_000,
+  loanType: 'hard_money',
+  downPaymentPercent: 20,
+  interestRate: 12,
+  loanTermMonths: 12,
+  points: 2,
+  holdingPeriodMonths: 6,
+  rehabBudget: 60_000,
+  closingCostsPercent: 3,
+  sellingCostsPercent: 8,
+};
+
+const ROI_INPUTS: ROICalculationInput[] = (['flip', 'wholetail', 'rental'] as const).map((strategy) => ({
+  purchasePrice: 250_000,
+  arv: 380_000,
+  totalRehabCost: 60_000,
+  holdingCosts: 0,
+  sellingCosts: 0,
+  strategy,
+  holdPeriodMonths: 8,
+  monthlyRent: 2_600,
+  downPayment: 50_000,
+  loanAmount: 200_000,
+  interestRate: 7.5,
+}));
+
+const NO_VARIANCE: RiskDistributions = {
+  arvChange: { type: 'fixed', value: 0 },
+  rehabOverrun: { type: 'fixed', value: 0 },
+  holdMonthsChange: { type: 'fixed', value: 0 },
+  interestRateChange: { type: 'fixed', value: 0 },
+};
+
+/** Deterministic PRNG so runs are comparable */
+function mulberry32(seed: number) {
+  return () => {
+    seed |= 0;
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function perSecond(count: number, ms: number): string {
+  return Math.round((count / ms) * 1000).toLocaleString();
+}
+
+function closeTo(a: number, b: number): boolean {
+  return Math.abs(a - b) <= 1e-6 * Math.max(1, Math.abs(a), Math.abs(b));
+}
+
+function checkParity(): string[] {
+  const failures: string[] = [];
+  const holdingCosts = estimateMonthlyHoldingCosts(FINANCING_INPUTS.purchasePrice);
+
+  for (const loanType of ['cash', 'conventional', 'hard_money'] as const) {
+    const inputs = { ...FINANCING_INPUTS, loanType, loanTermMonths: loanType === 'conventional' ? 360 : 12 };
+    const expected = calculateFinancing(inputs, holdingCosts);
+    const simulated = simulateFinancingRisk(inputs, holdingCosts, { draws: 1, distributions: NO_VARIANCE });
+    if (!closeTo(simulated.profit.mean, expected.estimatedProfit)) {
+      failures.push(`financing ${loanType}: profit ${simulated.profit.mean} != ${expected.estimatedProfit}`);
+    }
+    if (!closeTo(simulated.roi.mean, expected.roi)) {
+      failures.push(`financing ${loanType}: roi ${simulated.roi.mean} != ${expected.roi}`);
+    }
+    if (!closeTo(simulated.totalInterest.mean, expected.totalInterest)) {
+      failures.push(`financing ${loanType}: interest ${simulated.totalInterest.mean} != ${expected.totalInterest}`);
+    }
+  }
+
+  for (const input of ROI_INPUTS) {
+    const expected = ROICalculationEngine.calculateROI(input);
+    const simulated = ROICalculationEngine.simulateRisk(input, { draws: 1, distributions: NO_VARIANCE });
+    if (!closeTo(simulated.profit.mean, expected.netProfit)) {
+      failures.push(`roi ${input.strategy}: profit ${simulated.profit.mean} != ${expected.netProfit}`);
+    }
+    if (!closeTo(simulated.annualizedROI.mean, expected.annualizedROI)) {
+      failures.push(`roi ${input.strategy}: annualized ${simulated.annualizedROI.mean} != ${expected.annualizedROI}`);
+    }
+  }
+
+  const airbnb = ROICalculationEngine.simulateRisk(
+    { ...ROI_INPUTS[0], strategy: 'airbnb' },
+    { draws: 1, distributions: NO_VARIANCE }
+  );
+  if (airbnb.matchesCalculateROI || airbnb.warnings.length === 0) {
+    failures.push('roi airbnb: simulation not flagged as differing from calculateROI');
+  }
+
+  return failures;
+}
+
+/** The pre-columnar approach: one calculateFinancing call per sampled deal */
+function objectPath(draws: number): number {
+  const random = mulberry32(42);
+  const holdingCosts = estimateMonthlyHoldingCosts(FINANCING_INPUTS.purchasePrice);
+  let losses = 0;
+  for (let i = 0; i < draws; i++) {
+    const result = calculateFinancing(
+      {
+        ...FINANCING_INPUTS,
+        arv: FINANCING_INPUTS.arv * (0.85 + random() * 0.25),
+        rehabBudget: FINANCING_INPUTS.rehabBudget * (0.95 + random() * 0.45),
+        holdingPeriodMonths: FINANCING_INPUTS.holdingPeriodMonths + Math.round(random() * 5 - 1),
+        interestRate: FINANCING_INPUTS.interestRate + random() * 3 - 1.5,
+      },
+      holdingCosts
+    );
+    if (result.estimatedProfit < 0) losses++;
+  }
+  return losses;
+}
+
+async function main() {
+  const failures = checkParity();
+  const rows: Record<string, string | number>[] = [];
+  const model = toFinancingRiskModel(FINANCING_INPUTS, estimateMonthlyHoldingCosts(FINANCING_INPUTS.purchasePrice));
+
+  const objectStart = performance.now();
+  objectPath(OBJECT_PATH_DRAWS);
+  const objectMs = performance.now() - objectStart;
+  rows.push({
+    path: 'calculateFinancing per draw',
+    draws: OBJECT_PATH_DRAWS.toLocaleString(),
+    ms: objectMs.toFixed(1),
+    'draws/s': perSecond(OBJECT_PATH_DRAWS, objectMs),
+  });
+
+  // Warm up the JIT before timing
+  simulateDealRisk(model, { draws: 100_000 });
+
+  for (const draws of IN_PROCESS_DRAWS) {
+    const result = simulateDealRisk(model, { draws });
+    rows.push({
+      path: 'columnar, in-process',
+      draws: draws.toLocaleString(),
+      ms: result.elapsedMs.toFixed(1),
+      'draws/s': perSecond(draws, result.elapsedMs),
+      'P(loss)': `${(result.probabilityOfLoss * 100).toFixed(1)}%`,
+      'profit p5': Math.round(result.profit.percentiles.p5),
+      'profit p50': Math.round(result.profit.percentiles.p50),
+      'profit p95': Math.round(result.profit.percentiles.p95),
+    });
+  }
+
+  for (const draws of PARALLEL_DRAWS) {
+    const start = performance.now();
+    const result = await runRiskSimulation(model, { draws });
+    const ms = performance.now() - start;
+    rows.push({
+      path: `columnar, ${Math.max(1, availableParallelism() - 1)} worker(s)`,
+      draws: draws.toLocaleString(),
+      ms: ms.toFixed(1),
+      'draws/s': perSecond(draws, ms),
+      'P(loss)': `${(result.probabilityOfLoss * 100).toFixed(1)}%`,
+      'profit p5': Math.round(result.profit.percentiles.p5),
+      'profit p50': Math.round(result.profit.percentiles.p50),
+      'profit p95': Math.round(result.profit.percentiles.p95),
+    });
+
+    if (draws === IN_PROCESS_DRAWS[IN_PROCESS_DRAWS.length - 1]) {
+      const inProcess = simulateDealRisk(model, { draws });
+      for (const key of ['p5', 'p50', 'p95']) {
+        if (inProcess.profit.percentiles[key] !== result.profit.percentiles[key]) {
+          failures.push(`parallel ${key} ${result.profit.percentiles[key]} != in-process ${inProcess.profit.percentiles[key]}`);
+        }
+      }
+    }
+  }
+
+  console.log('\n📊 Risk simulation throughput\n');
+  console.table(rows);
+
+  console.log('\n🌪️  Sensitivity (1M draws)\n');
+  console.table(
+    simulateDealRisk(model, { draws: 1_000_000 }).sensitivity.map((bar) => ({
+      variable: bar.variable,
+      'low input': bar.lowInput.toFixed(3),
+      'high input': bar.highInput.toFixed(3),
+      'low profit': Math.round(bar.lowProfit),
+      'high profit': Math.round(bar.highProfit),
+      swing: Math.round(bar.swing),
+    }))
+  );
+
+  if (failures.length > 0) {
+    console.error('\n❌ Checks failed:');
+    failures.forEach((failure) => console.error(`  - ${failure}`));
+    process.exitCode = 1;
+  } else {
+    console.log('\n✅ Zero-variance runs match calculateFinancing / calculateROI; parallel matches in-process');
+  }
+}
+
+main().catch((err) => {
+  console.error('❌ Benchmark failed:', err);
+  process.exit(1);
+});
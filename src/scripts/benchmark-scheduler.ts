@@ -0,0 +1,143 @@
+/**
+ * @file benchmark-scheduler.ts
+ * @description Benchmark for the timeline SchedulingEngine
+ *
+ * Run with: npx tsx src/scripts/benchmark-scheduler.ts
+ *
+ * Builds synthetic renovation task graphs (1k / 10k / 50k tasks across six
+ * phases, grouped into ten-task work packages with dependencies inside each
+ * package and from package kick-offs to the previous phase) and reports the
+ * time for a full schedule, plus the time and number of re-dated tasks for
+ * incremental duration and dependency edits like those made by Gantt drags.
+ */
+
+import { SchedulingEngine, type TimelineConfig, type TimelineTask } from '../lib/timeline';
+
+const TASK_COUNTS = [1_000, 10_000, 50_000];
+const PHASES = 6;
+const PACKAGE_SIZE = 10;
+const EDITS_PER_RUN = 20;
+
+type UnscheduledTask = Omit<TimelineTask, 'startDate' | 'endDate'>;
+
+/** Deterministic PRNG so runs are comparable */
+function mulberry32(seed: number) {
+  return () => {
+    seed |= 0;
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function generateTasks(count: number, seed: number): UnscheduledTask[] {
+  const random = mulberry32(seed);
+  const tasks: UnscheduledTask[] = [];
+  const phaseSize = Math.ceil(count / PHASES);
+
+  for (let index = 0; index < count; index++) {
+    const phaseIndex = Math.floor(index / phaseSize);
+    const packageStart = index - (index % PACKAGE_SIZE);
+    const dependencies = new Set<string>();
+
+    if (index > packageStart) {
+      // Sequenced trades within a work package (e.g. one room)
+      const dependencyCount = 1 + Math.floor(random() * 2);
+      for (let d = 0; d < dependencyCount; d++) {
+        dependencies.add(`task-${packageStart + Math.floor(random() * (index - packageStart))}`);
+      }
+    } else if (phaseIndex > 0 && random() < 0.5) {
+      // Package kick-off waits on something from the previous phase
+      const previousPhaseStart = (phaseIndex - 1) * phaseSize;
+      dependencies.add(`task-${previousPhaseStart + Math.floor(random() * phaseSize)}`);
+    }
+
+    tasks.push({
+      id: `task-${index}`,
+      name: `Task ${index}`,
+      durationDays: 1 + Math.floor(random() * 5),
+      phase: phaseIndex + 1,
+      dependencies: [...dependencies],
+      dependents: [],
+      category: 'general',
+      isCriticalPath: false,
+    });
+  }
+
+  return tasks;
+}
+
+function createConfig(): TimelineConfig {
+  return {
+    projectStartDate: new Date(2026, 0, 5),
+    projectEndDate: new Date(2027, 0, 4),
+    workingDaysPerWeek: 5,
+    holidayDates: [new Date(2026, 4, 25), new Date(2026, 6, 3), new Date(2026, 8, 7)],
+    bufferDays: 10,
+  };
+}
+
+function time<T>(fn: () => T): { value: T; ms: number } {
+  const start = performance.now();
+  const value = fn();
+  return { value, ms: performance.now() - start };
+}
+
+function main() {
+  const rows: Record<string, string | number>[] = [];
+
+  for (const count of TASK_COUNTS) {
+    const tasks = generateTasks(count, count * 7919);
+    const config = createConfig();
+    const random = mulberry32(count);
+
+    const full = time(() => SchedulingEngine.scheduleProject(tasks, config));
+
+    const schedule = SchedulingEngine.createIncrementalSchedule(tasks, config);
+    let durationMs = 0;
+    let durationRedated = 0;
+    let dependencyMs = 0;
+    let dependencyRedated = 0;
+
+    for (let edit = 0; edit < EDITS_PER_RUN; edit++) {
+      // Edit tasks in the later half, where most Gantt drags land
+      const target = tasks[Math.floor(count / 2 + random() * (count / 2 - 1))];
+
+      const durationEdit = time(() =>
+        schedule.updateTask(target.id, { durationDays: 1 + Math.floor(random() * 10) })
+      );
+      durationMs += durationEdit.ms;
+      durationRedated += schedule.lastAffectedTaskIds.length;
+
+      // Re-sequence within the target's work package
+      const targetIndex = Number(target.id.slice('task-'.length));
+      const packageStart = targetIndex - (targetIndex % PACKAGE_SIZE);
+      const dependencyEdit = time(() =>
+        schedule.updateTask(target.id, {
+          dependencies:
+            targetIndex > packageStart
+              ? [`task-${packageStart + Math.floor(random() * (targetIndex - packageStart))}`]
+              : [],
+        })
+      );
+      dependencyMs += dependencyEdit.ms;
+      dependencyRedated += schedule.lastAffectedTaskIds.length;
+    }
+
+    rows.push({
+      tasks: count,
+      'full schedule (ms)': full.ms.toFixed(1),
+      'project days': full.value.metrics.totalDays,
+      'duration edit (ms)': (durationMs / EDITS_PER_RUN).toFixed(2),
+      'duration edit re-dated': Math.round(durationRedated / EDITS_PER_RUN),
+      'dependency edit (ms)': (dependencyMs / EDITS_PER_RUN).toFixed(2),
+      'dependency edit re-dated': Math.round(dependencyRedated / EDITS_PER_RUN),
+    });
+  }
+
+  console.log('\nSchedulingEngine (averages over incremental edits)');
+  console.table(rows);
+}
+
+main();
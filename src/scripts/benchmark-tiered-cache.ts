@@ -0,0 +1,127 @@
+/**
+ * @file benchmark-tiered-cache.ts
+ * @description Exercises the two-tier cache against an in-memory Redis stand-in
+ *
+ * Run with: npx tsx src/scripts/benchmark-tiered-cache.ts
+ *
+ * Two TieredCache instances share one MemorySharedStore to play two app
+ * instances. Checks that a burst of concurrent misses makes one loader call
+ * across both instances, that stale entries are served while one refresh
+ * runs, and that tag invalidation clears both instances; then prints the
+ * hit/miss/latency counters and L1 lookup throughput.
+ */
+
+import { MemorySharedStore, TieredCache, type CachePolicy } from '../lib/tiered-cache';
+
+const CONCURRENT_MISSES = 200;
+const LOOKUPS = 200_000;
+const LOAD_DELAY_MS = 30;
+
+let clock = Date.now();
+const now = () => clock;
+
+function sleep(ms: number) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+function check(label: string, ok: boolean) {
+  console.log(`${ok ? 'PASS' : 'FAIL'}  ${label}`);
+  if (!ok) process.exitCode = 1;
+}
+
+async function main() {
+  const store = new MemorySharedStore(now);
+  const instanceA = new TieredCache({ store, now, lockWaitMs: 1000 });
+  const instanceB = new TieredCache({ store, now, lockWaitMs: 1000 });
+
+  let loaderCalls = 0;
+  const loadPrices = async (region: string) => {
+    loaderCalls++;
+    await sleep(LOAD_DELAY_MS);
+    return { region, version: loaderCalls };
+  };
+  const policy: CachePolicy<[string]> = {
+    namespace: 'material-prices',
+    ttlSeconds: 60,
+    staleSeconds: 30,
+    tags: (region) => ['material-prices', `region-${region}`],
+  };
+  const pricesA = instanceA.wrap(loadPrices, policy);
+  const pricesB = instanceB.wrap(loadPrices, policy);
+
+  // Stampede: concurrent misses on both instances
+  const burst = await Promise.all(
+    Array.from({ length: CONCURRENT_MISSES }, (_, i) => (i % 2 ? pricesA : pricesB)('national'))
+  );
+  check(
+    `${CONCURRENT_MISSES} concurrent misses on two instances -> ${loaderCalls} loader call(s)`,
+    loaderCalls === 1 && burst.every((value) => value.version === 1)
+  );
+
+  // Stale-while-revalidate: past the TTL the old value is served once more
+  clock += 70_000;
+  const stale = await pricesA('national');
+  await sleep(LOAD_DELAY_MS * 2);
+  const refreshed = await pricesA('national');
+  check(
+    'stale value served while one background refresh runs',
+    stale.version === 1 && refreshed.version === 2 && loaderCalls === 2
+  );
+
+  // Past the stale window the entry is a miss again
+  clock += 200_000;
+  await pricesB('national');
+  check('entry past its stale window reloads', loaderCalls === 3);
+
+  // Tag invalidation from one instance clears the other's L1
+  await pricesA('midwest');
+  await pricesB('midwest');
+  const beforeInvalidation = loaderCalls;
+  await instanceA.invalidateTags(['region-midwest']);
+  await pricesB('midwest');
+  await pricesA('national');
+  check(
+    'invalidating a tag on A clears only tagged entries on B',
+    loaderCalls === beforeInvalidation + 1
+  );
+
+  // Keys are hashes of the full arguments, so shared prefixes never collide
+  const ai = new TieredCache();
+  const prefix = 'x'.repeat(64);
+  const answer = (prompt: string) =>
+    ai.getOrLoad([prompt], async () => prompt.slice(-1), { namespace: 'ai', ttlSeconds: 60 });
+  check(
+    'prompts sharing a long prefix get distinct entries',
+    (await answer(`${prefix}a`)) === 'a' && (await answer(`${prefix}b`)) === 'b'
+  );
+
+  // L1 lookup throughput
+  const started = performance.now();
+  for (let i = 0; i < LOOKUPS; i++) {
+    await pricesA('national');
+  }
+  const ms = performance.now() - started;
+
+  console.log(`\nL1 hits: ${Math.round((LOOKUPS / ms) * 1000).toLocaleString()} lookups/s`);
+  console.log('\nInstance A');
+  console.table(flatten(instanceA));
+  console.log('Instance B');
+  console.table(flatten(instanceB));
+}
+
+function flatten(cache: TieredCache) {
+  return Object.entries(cache.stats()).map(([namespace, stats]) => ({
+    namespace,
+    l1Hits: stats.l1Hits,
+    l2Hits: stats.l2Hits,
+    staleHits: stats.staleHits,
+    misses: stats.misses,
+    coalesced: stats.coalesced,
+    loads: stats.loads,
+    'hit rate': `${(stats.hitRate * 100).toFixed(1)}%`,
+    'avg get (ms)': stats.getLatency.avgMs.toFixed(3),
+    'avg load (ms)': stats.loadLatency.avgMs.toFixed(1),
+  }));
+}
+
+main();
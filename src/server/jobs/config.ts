@@ -24,6 +24,57 @@ export const JOB_DEFAULT_BACKOFF_DELAY_MS = Number(
 
 export const JOB_CONCURRENCY = Number(process.env.JOB_CONCURRENCY ?? 5);
 
+function queueEnvKey(queueName: string) {
+  return queueName.toUpperCase().replace(/[^A-Z0-9]+/g, "_");
+}
+
+/**
+ * Per-queue concurrency, e.g. `JOB_CONCURRENCY_EMAIL=20` (falls back to `JOB_CONCURRENCY`).
+ */
+export function getQueueConcurrency(queueName: string): number {
+  const value = Number(process.env[`JOB_CONCURRENCY_${queueEnvKey(queueName)}`]);
+  return Number.isFinite(value) && value > 0 ? value : JOB_CONCURRENCY;
+}
+
+/**
+ * Optional per-queue BullMQ rate limit as `<max>/<durationMs>`,
+ * e.g. `JOB_RATE_LIMIT_EMAIL=100/1000` for at most 100 jobs per second.
+ */
+export function getQueueRateLimit(
+  queueName: string
+): { max: number; duration: number } | undefined {
+  const raw = process.env[`JOB_RATE_LIMIT_${queueEnvKey(queueName)}`];
+  const match = raw?.trim().match(/^(\d+)\s*\/\s*(\d+)$/);
+  if (!match) return undefined;
+
+  const max = Number(match[1]);
+  const duration = Number(match[2]);
+  return max > 0 && duration > 0 ? { max, duration } : undefined;
+}
+
+/**
+ * Log every active/completed transition (failures are always logged).
+ * Turn off for high-volume queues.
+ */
+export const JOB_LOG_TRANSITIONS = process.env.JOB_LOG_TRANSITIONS !== "false";
+
+/**
+ * How long shutdown waits for in-flight jobs and tracking writes before exiting.
+ */
+export const JOB_SHUTDOWN_TIMEOUT_MS = Number(process.env.JOB_SHUTDOWN_TIMEOUT_MS ?? 30_000);
+
+/**
+ * Job run tracking is buffered and written in bulk when either threshold is reached.
+ */
+export const JOB_TRACKING_BATCH_SIZE = Number(process.env.JOB_TRACKING_BATCH_SIZE ?? 500);
+export const JOB_TRACKING_FLUSH_INTERVAL_MS = Number(
+  process.env.JOB_TRACKING_FLUSH_INTERVAL_MS ?? 1_000
+);
+/** Bulk upserts allowed in flight at once when writes fall behind. */
+export const JOB_TRACKING_MAX_CONCURRENT_WRITES = Number(
+  process.env.JOB_TRACKING_MAX_CONCURRENT_WRITES ?? 4
+);
+
 /**
  * Optional: if set, workers will try to persist execution status in Supabase.
  * Uses service role key (RLS bypass) or will no-op.
@@ -33,3 +84,7 @@ export const SUPABASE_URL =
 export const SUPABASE_SERVICE_ROLE_KEY =
   process.env.SUPABASE_SERVICE_ROLE_KEY ?? process.env.SUPABASE_SERVICE_KEY;
 
+/**
+ * Supabase Storage bucket that `reports.generate` writes PDFs to.
+ */
+export const REPORTS_BUCKET = process.env.REPORTS_BUCKET ?? "reports";
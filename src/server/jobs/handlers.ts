@@ -1,5 +1,9 @@
 import type { Job } from "bullmq";
 import type { JobName } from "./job-names";
+import { createSupabaseReportDataSource } from "../reports/data-source";
+import { generateReports, resolveReportTargets } from "../reports/generate-reports";
+import { createSupabaseReportStore } from "../reports/report-store";
+import type { ReportJobData } from "../reports/types";
 
 /**
  * NOTE:
@@ -8,6 +12,8 @@ import type { JobName } from "./job-names";
  * that log and return a structured result so the queue/worker/scheduler can be verified.
  *
  * When the property management schema is added, replace these with real queries + actions.
+ *
+ * `reports.generate` is implemented: see src/server/reports.
  */
 
 type HandlerResult = Record<string, unknown>;
@@ -59,11 +65,39 @@ const handlers: Record<JobName, Handler> = {
     message: "License expiration check completed (stub handler).",
     payload: job.data ?? null,
   }),
-  "reports.generate": async (job) => ({
-    ...baseResult(job),
-    message: "Report generated (stub handler).",
-    payload: job.data ?? null,
-  }),
+  "reports.generate": async (job) => {
+    const data = (job.data ?? {}) as ReportJobData;
+    const targets = resolveReportTargets(data);
+    if (targets.length === 0) {
+      return {
+        ...baseResult(job),
+        message: "No report targets (projectIds/dealIds) provided.",
+        payload: job.data ?? null,
+      };
+    }
+
+    const source = createSupabaseReportDataSource();
+    const store = createSupabaseReportStore();
+    if (!source || !store) {
+      throw new Error("Report generation requires SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY.");
+    }
+
+    const summary = await generateReports(
+      targets,
+      { source, store },
+      {
+        mode: data.mode,
+        batchId: job.id,
+        onProgress: (completed, total) => job.updateProgress({ completed, total }),
+      }
+    );
+    const reused = summary.reports.filter((report) => report.reused).length;
+    return {
+      ...baseResult(job),
+      message: `Generated ${summary.reports.length - reused} report(s), reused ${reused}.`,
+      ...summary,
+    };
+  },
 };
 
 export function getJobHandler(jobName: string): Handler | null {
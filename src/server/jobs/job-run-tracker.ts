@@ -1,54 +1,347 @@
-import { createClient } from "@supabase/supabase-js";
 import type { Job } from "bullmq";
-import { SUPABASE_SERVICE_ROLE_KEY, SUPABASE_URL } from "./config";
+import {
+  JOB_TRACKING_BATCH_SIZE,
+  JOB_TRACKING_FLUSH_INTERVAL_MS,
+  JOB_TRACKING_MAX_CONCURRENT_WRITES,
+} from "./config";
+import { getSupabaseAdmin } from "../supabase-admin";
 
 type JobRunStatus = "waiting" | "active" | "completed" | "failed";
 
-function getSupabaseAdmin() {
-  if (!SUPABASE_URL || !SUPABASE_SERVICE_ROLE_KEY) return null;
-  return createClient(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, {
-    auth: { persistSession: false, autoRefreshToken: false },
-  });
-}
-
-/**
- * Best-effort persistence of job run status.
- * If credentials are missing, this becomes a no-op (workers still function).
- */
-export async function upsertJobRun(params: {
+export type JobRunTransition = {
   job: Job;
   status: JobRunStatus;
   startedAt?: Date;
   finishedAt?: Date;
   result?: unknown;
   error?: string | null;
-}): Promise<void> {
+};
+
+/** One row of `background_job_runs` as written by the tracker */
+export type JobRunRow = {
+  bullmq_job_id: string;
+  queue_name: string;
+  job_name: string;
+  status: JobRunStatus;
+  attempts_made: number;
+  payload: unknown;
+  result: unknown;
+  error: string | null;
+  started_at: string | null;
+  finished_at: string | null;
+  updated_at: string;
+};
+
+/** Persists a batch of rows; throws on failure */
+export type JobRunWriter = (rows: JobRunRow[]) => Promise<void>;
+
+export type JobRunTrackerStats = {
+  /** Transitions recorded */
+  recorded: number;
+  /** Rows written (transitions merged per job before writing) */
+  written: number;
+  flushes: number;
+  failedFlushes: number;
+  /** Rows given up on after repeated write failures */
+  dropped: number;
+  pending: number;
+  /** Bulk upserts currently in flight */
+  writing: number;
+  /** Time from a transition being recorded to its row being written */
+  avgLagMs: number;
+  maxLagMs: number;
+};
+
+type PendingRun = {
+  row: JobRunRow;
+  /** When the oldest unwritten transition merged into this row was recorded */
+  recordedAt: number;
+  retries: number;
+};
+
+const MAX_WRITE_RETRIES = 2;
+
+/** How long `started_at` is remembered for a job that never completes or fails */
+const STARTED_AT_TTL_MS = 24 * 60 * 60 * 1000;
+
+/**
+ * Bulk upsert into `background_job_runs`, or null when tracking is not configured.
+ */
+export function createSupabaseJobRunWriter(): JobRunWriter | null {
   const supabase = getSupabaseAdmin();
-  if (!supabase) return;
-
-  const { job, status, startedAt, finishedAt, result, error } = params;
-
-  const payload = {
-    bullmq_job_id: String(job.id),
-    queue_name: job.queueName,
-    job_name: job.name,
-    status,
-    attempts_made: job.attemptsMade ?? 0,
-    payload: job.data ?? null,
-    result: result ?? null,
-    error: error ?? null,
-    started_at: startedAt?.toISOString() ?? null,
-    finished_at: finishedAt?.toISOString() ?? null,
-    updated_at: new Date().toISOString(),
+  if (!supabase) return null;
+
+  return async (rows) => {
+    const { error } = await supabase
+      .from("background_job_runs")
+      .upsert(rows, { onConflict: "bullmq_job_id" });
+    if (error) throw new Error(error.message);
   };
+}
+
+/**
+ * Buffers job status transitions and writes them as bulk upserts once
+ * `batchSize` jobs are pending or every `flushIntervalMs`.
+ *
+ * - Transitions for the same job are merged, so only its latest status is written.
+ * - Up to `maxConcurrentWrites` batches are written at once, so throughput keeps up
+ *   with enqueues when a single round trip would not. A job is never in two
+ *   in-flight batches, so an older status can never land after a newer one.
+ * - `started_at` is remembered while a job runs, so the completed/failed row keeps it
+ *   (for at most a day, so jobs that never finish do not accumulate).
+ *
+ * Tracking stays best-effort: write failures are retried a couple of times and then
+ * dropped with a warning, and never affect job processing. The buffer is only
+ * trimmed to `maxPending` once writes keep failing; a healthy but slow writer
+ * just builds a backlog that the concurrent writes work through.
+ */
+export class JobRunTracker {
+  private readonly writer: JobRunWriter | null;
+  private readonly batchSize: number;
+  private readonly flushIntervalMs: number;
+  private readonly maxPending: number;
+  private readonly maxConcurrentWrites: number;
+
+  private pending = new Map<string, PendingRun>();
+  /** Jobs with a row in an in-flight batch */
+  private inFlight = new Set<string>();
+  /** Insertion order follows when each job became active */
+  private startedAt = new Map<string, { startedAt: string; recordedAt: number }>();
+  private writes = new Set<Promise<void>>();
+  /** Failed flushes since the last successful one */
+  private consecutiveFailures = 0;
+  private timer: ReturnType<typeof setInterval> | null = null;
+
+  private counters = {
+    recorded: 0,
+    written: 0,
+    flushes: 0,
+    failedFlushes: 0,
+    dropped: 0,
+    totalLagMs: 0,
+    maxLagMs: 0,
+  };
+
+  constructor(
+    options: {
+      writer?: JobRunWriter | null;
+      batchSize?: number;
+      flushIntervalMs?: number;
+      /** Pending rows kept once writes keep failing; the oldest beyond this are dropped */
+      maxPending?: number;
+      /** Bulk upserts allowed in flight at once */
+      maxConcurrentWrites?: number;
+    } = {}
+  ) {
+    this.writer = options.writer === undefined ? createSupabaseJobRunWriter() : options.writer;
+    this.batchSize = Math.max(1, options.batchSize ?? JOB_TRACKING_BATCH_SIZE);
+    this.flushIntervalMs = options.flushIntervalMs ?? JOB_TRACKING_FLUSH_INTERVAL_MS;
+    this.maxPending = options.maxPending ?? this.batchSize * 20;
+    this.maxConcurrentWrites = Math.max(
+      1,
+      options.maxConcurrentWrites ?? JOB_TRACKING_MAX_CONCURRENT_WRITES
+    );
+  }
+
+  get enabled() {
+    return this.writer !== null;
+  }
+
+  /**
+   * Buffer a status transition. Synchronous, so event order is preserved.
+   */
+  record(transition: JobRunTransition): void {
+    if (!this.writer) return;
+
+    const { job, status, finishedAt, result, error } = transition;
+    const jobId = String(job.id);
+    const now = new Date();
 
-  const { error: upsertError } = await supabase
-    .from("background_job_runs")
-    .upsert(payload, { onConflict: "bullmq_job_id" });
+    let startedAt = transition.startedAt?.toISOString() ?? null;
+    if (status === "active") {
+      this.startedAt.delete(jobId);
+      if (startedAt) this.startedAt.set(jobId, { startedAt, recordedAt: now.getTime() });
+    } else if (status === "completed" || status === "failed") {
+      startedAt ??= this.startedAt.get(jobId)?.startedAt ?? null;
+      this.startedAt.delete(jobId);
+    }
+    this.forgetStaleStarts(now.getTime());
 
-  if (upsertError) {
-    // Never crash the worker due to tracking failures.
-    console.warn("Job run tracking upsert failed:", upsertError.message);
+    const row: JobRunRow = {
+      bullmq_job_id: jobId,
+      queue_name: job.queueName,
+      job_name: job.name,
+      status,
+      attempts_made: job.attemptsMade ?? 0,
+      payload: job.data ?? null,
+      result: result ?? null,
+      error: error ?? null,
+      started_at: startedAt,
+      finished_at: finishedAt?.toISOString() ?? null,
+      updated_at: now.toISOString(),
+    };
+
+    // Re-insert so Map order follows each job's latest transition
+    const previous = this.pending.get(jobId);
+    this.pending.delete(jobId);
+    this.pending.set(jobId, {
+      row,
+      recordedAt: previous?.recordedAt ?? now.getTime(),
+      retries: 0,
+    });
+    this.counters.recorded++;
+
+    if (this.consecutiveFailures >= MAX_WRITE_RETRIES) {
+      // Writes keep failing: bound memory and leave retries to the timer
+      while (this.pending.size > this.maxPending) {
+        const oldest = this.pending.keys().next().value;
+        if (oldest === undefined) break;
+        this.pending.delete(oldest);
+        this.counters.dropped++;
+      }
+      this.startTimer();
+    } else if (this.pending.size >= this.batchSize) {
+      void this.flush();
+    } else {
+      this.startTimer();
+    }
+  }
+
+  /**
+   * Write everything pending, starting writes up to `maxConcurrentWrites`.
+   * Resolves once every write started so far has settled; each one keeps
+   * taking batches until the buffer is empty or a write fails.
+   */
+  flush(): Promise<void> {
+    while (this.writes.size < this.maxConcurrentWrites && this.pending.size > this.writes.size) {
+      const write: Promise<void> = this.writePending().finally(() => {
+        this.writes.delete(write);
+        if (this.pending.size === 0 && this.writes.size === 0) this.stopTimer();
+      });
+      this.writes.add(write);
+    }
+    return Promise.all(this.writes).then(() => undefined);
+  }
+
+  /**
+   * Stop the timer and write everything pending (call on shutdown, after workers close).
+   */
+  async drain(): Promise<void> {
+    this.stopTimer();
+    // Failing rows are dropped after MAX_WRITE_RETRIES, so this always ends
+    while (this.pending.size > 0 || this.writes.size > 0) {
+      await this.flush();
+    }
+    this.stopTimer();
+  }
+
+  stats(): JobRunTrackerStats {
+    const { totalLagMs, ...counters } = this.counters;
+    return {
+      ...counters,
+      pending: this.pending.size,
+      writing: this.writes.size,
+      avgLagMs: counters.written > 0 ? totalLagMs / counters.written : 0,
+    };
+  }
+
+  private async writePending(): Promise<void> {
+    for (;;) {
+      // Skip jobs whose previous row is still being written; they go in a later batch
+      const batch: [string, PendingRun][] = [];
+      for (const entry of this.pending) {
+        if (this.inFlight.has(entry[0])) continue;
+        batch.push(entry);
+        if (batch.length >= this.batchSize) break;
+      }
+      if (batch.length === 0) return;
+      for (const [jobId] of batch) {
+        this.pending.delete(jobId);
+        this.inFlight.add(jobId);
+      }
+
+      this.counters.flushes++;
+      try {
+        await this.writer!(batch.map(([, run]) => run.row));
+      } catch (err) {
+        this.counters.failedFlushes++;
+        this.consecutiveFailures++;
+        console.warn(
+          `Job run tracking bulk upsert failed (${batch.length} rows):`,
+          err instanceof Error ? err.message : err
+        );
+        batch.forEach(([jobId]) => this.inFlight.delete(jobId));
+        this.requeue(batch);
+        // Leave the retry to the next interval instead of spinning
+        return;
+      }
+      batch.forEach(([jobId]) => this.inFlight.delete(jobId));
+      this.consecutiveFailures = 0;
+
+      const writtenAt = Date.now();
+      for (const [, run] of batch) {
+        const lag = writtenAt - run.recordedAt;
+        this.counters.totalLagMs += lag;
+        this.counters.maxLagMs = Math.max(this.counters.maxLagMs, lag);
+      }
+      this.counters.written += batch.length;
+    }
+  }
+
+  /** Put failed rows back unless the job has a newer transition pending */
+  private requeue(batch: [string, PendingRun][]) {
+    const retained = new Map<string, PendingRun>();
+    for (const [jobId, run] of batch) {
+      if (this.pending.has(jobId)) continue;
+      if (run.retries >= MAX_WRITE_RETRIES) {
+        this.counters.dropped++;
+        continue;
+      }
+      retained.set(jobId, { ...run, retries: run.retries + 1 });
+    }
+    // Failed rows are older than anything recorded since, so they go first
+    this.pending = new Map([...retained, ...this.pending]);
+    this.startTimer();
+  }
+
+  /** Forget start times of jobs that became active too long ago to still be running */
+  private forgetStaleStarts(now: number) {
+    for (const [jobId, { recordedAt }] of this.startedAt) {
+      if (now - recordedAt < STARTED_AT_TTL_MS) break;
+      this.startedAt.delete(jobId);
+    }
+  }
+
+  private startTimer() {
+    if (this.timer) return;
+    this.timer = setInterval(() => void this.flush(), this.flushIntervalMs);
+    // Never keep a process alive just for tracking
+    this.timer.unref?.();
+  }
+
+  private stopTimer() {
+    if (!this.timer) return;
+    clearInterval(this.timer);
+    this.timer = null;
   }
 }
 
+let defaultTracker: JobRunTracker | null = null;
+
+/**
+ * Process-wide tracker writing to Supabase (a no-op when credentials are missing).
+ */
+export function getJobRunTracker(): JobRunTracker {
+  defaultTracker ??= new JobRunTracker();
+  return defaultTracker;
+}
+
+/**
+ * Best-effort persistence of job run status.
+ * If credentials are missing, this becomes a no-op (workers still function).
+ * Transitions are buffered and written in bulk; call `getJobRunTracker().drain()`
+ * before exiting to write what is still pending.
+ */
+export async function upsertJobRun(params: JobRunTransition): Promise<void> {
+  getJobRunTracker().record(params);
+}
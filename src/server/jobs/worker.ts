@@ -1,77 +1,59 @@
-import { Worker } from "bullmq";
-import { JOB_CONCURRENCY, REDIS_PREFIX } from "./config";
-import { getJobHandler } from "./handlers";
-import { upsertJobRun } from "./job-run-tracker";
-import { redisConnectionOptions } from "./redis";
+import { JOB_SHUTDOWN_TIMEOUT_MS, getQueueConcurrency, getQueueRateLimit } from "./config";
+import { getJobRunTracker } from "./job-run-tracker";
 import { QUEUE_NAME, allQueues } from "./queues";
-
-function createWorker(queueName: string) {
-  const worker = new Worker(
-    queueName,
-    async (job) => {
-      const handler = getJobHandler(job.name);
-      if (!handler) {
-        throw new Error(`No handler registered for job name: ${job.name}`);
-      }
-      return await handler(job);
-    },
-    {
-      connection: redisConnectionOptions,
-      prefix: REDIS_PREFIX,
-      concurrency: JOB_CONCURRENCY,
-    }
-  );
-
-  worker.on("active", async (job) => {
-    console.log(`[${job.queueName}] active: ${job.name} (${job.id})`);
-    await upsertJobRun({ job, status: "active", startedAt: new Date() });
-  });
-
-  worker.on("completed", async (job, result) => {
-    console.log(`[${job.queueName}] completed: ${job.name} (${job.id})`);
-    await upsertJobRun({
-      job,
-      status: "completed",
-      finishedAt: new Date(),
-      result,
-      error: null,
-    });
-  });
-
-  worker.on("failed", async (job, err) => {
-    if (!job) return;
-    console.warn(
-      `[${job.queueName}] failed: ${job.name} (${job.id}) attempts=${job.attemptsMade} err=${err?.message}`
-    );
-    await upsertJobRun({
-      job,
-      status: "failed",
-      finishedAt: new Date(),
-      error: err?.message ?? "Unknown error",
-    });
-  });
-
-  return worker;
-}
+import { createQueueWorker } from "./workers";
 
 async function main() {
   // Ensure queues are instantiated early (helps validate Redis connectivity).
   Object.values(allQueues);
 
-  const workers = [
-    createWorker(QUEUE_NAME.Email),
-    createWorker(QUEUE_NAME.Notification),
-    createWorker(QUEUE_NAME.Compliance),
-    createWorker(QUEUE_NAME.Reports),
-  ];
+  const queueNames = Object.values(QUEUE_NAME);
+  const workers = queueNames.map((queueName) => createQueueWorker(queueName));
+  const tracker = getJobRunTracker();
 
   await Promise.all(workers.map((w) => w.waitUntilReady()));
 
-  console.log("✅ Workers started:", Object.values(QUEUE_NAME).join(", "));
+  console.log(
+    "✅ Workers started:",
+    queueNames
+      .map((queueName) => {
+        const limit = getQueueRateLimit(queueName);
+        const rate = limit ? `, ${limit.max}/${limit.duration}ms` : "";
+        return `${queueName} (x${getQueueConcurrency(queueName)}${rate})`;
+      })
+      .join(", ")
+  );
+  if (!tracker.enabled) {
+    console.log("ℹ️  Job run tracking disabled (no Supabase service credentials).");
+  }
 
+  let shuttingDown = false;
   const shutdown = async (signal: string) => {
-    console.log(`\n🛑 ${signal} received, shutting down workers...`);
+    if (shuttingDown) {
+      console.log(`\n🛑 ${signal} received again, exiting immediately.`);
+      process.exit(1);
+    }
+    shuttingDown = true;
+    console.log(`\n🛑 ${signal} received, draining workers...`);
+
+    const forceExit = setTimeout(() => {
+      console.warn(`⚠️ Shutdown timed out after ${JOB_SHUTDOWN_TIMEOUT_MS}ms, exiting.`);
+      process.exit(1);
+    }, JOB_SHUTDOWN_TIMEOUT_MS);
+    forceExit.unref();
+
+    // close() stops taking new jobs and waits for active ones, so their final
+    // transitions are recorded before the tracker buffer is drained.
     await Promise.allSettled(workers.map((w) => w.close()));
+    await tracker.drain();
+    await Promise.allSettled(Object.values(allQueues).map((q) => q.close()));
+
+    const stats = tracker.stats();
+    if (tracker.enabled) {
+      console.log(
+        `📝 Job run tracking flushed: ${stats.written} rows written, ${stats.dropped} dropped.`
+      );
+    }
     process.exit(0);
   };
 
@@ -83,4 +65,3 @@ main().catch((err) => {
   console.error("❌ Worker bootstrap failed:", err);
   process.exitCode = 1;
 });
-
@@ -0,0 +1,83 @@
+import { Worker } from "bullmq";
+import {
+  JOB_LOG_TRANSITIONS,
+  REDIS_PREFIX,
+  getQueueConcurrency,
+  getQueueRateLimit,
+} from "./config";
+import { getJobHandler } from "./handlers";
+import { getJobRunTracker, type JobRunTracker } from "./job-run-tracker";
+import { redisConnectionOptions } from "./redis";
+
+export type QueueWorkerOptions = {
+  /** Defaults to `JOB_CONCURRENCY_<QUEUE>` / `JOB_CONCURRENCY` */
+  concurrency?: number;
+  /** Defaults to `JOB_RATE_LIMIT_<QUEUE>` (no limit when unset) */
+  limiter?: { max: number; duration: number };
+  /** Defaults to the process-wide Supabase tracker */
+  tracker?: JobRunTracker;
+  logTransitions?: boolean;
+};
+
+/**
+ * Worker for one queue that dispatches to the registered job handlers and records
+ * status transitions in the (buffered) job run tracker.
+ */
+export function createQueueWorker(queueName: string, options: QueueWorkerOptions = {}) {
+  const tracker = options.tracker ?? getJobRunTracker();
+  const logTransitions = options.logTransitions ?? JOB_LOG_TRANSITIONS;
+  const limiter = options.limiter ?? getQueueRateLimit(queueName);
+
+  const worker = new Worker(
+    queueName,
+    async (job) => {
+      const handler = getJobHandler(job.name);
+      if (!handler) {
+        throw new Error(`No handler registered for job name: ${job.name}`);
+      }
+      return await handler(job);
+    },
+    {
+      connection: redisConnectionOptions,
+      prefix: REDIS_PREFIX,
+      concurrency: options.concurrency ?? getQueueConcurrency(queueName),
+      ...(limiter ? { limiter } : {}),
+    }
+  );
+
+  // Listeners only buffer (synchronously), so they can't reorder or slow the worker
+  worker.on("active", (job) => {
+    if (logTransitions) console.log(`[${job.queueName}] active: ${job.name} (${job.id})`);
+    tracker.record({ job, status: "active", startedAt: new Date() });
+  });
+
+  worker.on("completed", (job, result) => {
+    if (logTransitions) console.log(`[${job.queueName}] completed: ${job.name} (${job.id})`);
+    tracker.record({
+      job,
+      status: "completed",
+      finishedAt: new Date(),
+      result,
+      error: null,
+    });
+  });
+
+  worker.on("failed", (job, err) => {
+    if (!job) return;
+    console.warn(
+      `[${job.queueName}] failed: ${job.name} (${job.id}) attempts=${job.attemptsMade} err=${err?.message}`
+    );
+    tracker.record({
+      job,
+      status: "failed",
+      finishedAt: new Date(),
+      error: err?.message ?? "Unknown error",
+    });
+  });
+
+  worker.on("error", (err) => {
+    console.error(`[${queueName}] worker error:`, err.message);
+  });
+
+  return worker;
+}
@@ -0,0 +1,180 @@
+import type { SupabaseClient } from "@supabase/supabase-js";
+import { PHOTO_BUCKET, thumbnailTransform } from "@/lib/storage/photo-storage";
+import { getSupabaseAdmin } from "../supabase-admin";
+import { MAX_REPORT_PHOTOS } from "./sections";
+import type { ReportComparable, ReportDataSource, ReportScopeItem } from "./types";
+
+/**
+ * Loads report data with the service-role client (workers have no user session).
+ * Every query has a stable order so section hashes only change with the content.
+ */
+
+type Row = Record<string, any>;
+
+function toNumber(value: unknown): number | null {
+  if (value === null || value === undefined || value === "") return null;
+  const number = Number(value);
+  return Number.isFinite(number) ? number : null;
+}
+
+function toScopeItem(row: Row): ReportScopeItem {
+  return {
+    category: row.category ?? "Other",
+    itemName: row.item_name ?? "",
+    location: row.location ?? null,
+    quantity: toNumber(row.quantity),
+    unitOfMeasure: row.unit_of_measure ?? null,
+    priority: row.priority ?? null,
+    phase: toNumber(row.phase),
+    totalCost: toNumber(row.total_cost) ?? 0,
+    included: row.included !== false,
+  };
+}
+
+function toProjectComparable(row: Row): ReportComparable {
+  return {
+    address: row.address,
+    salePrice: toNumber(row.sale_price) ?? 0,
+    saleDate: row.sale_date,
+    squareFeet: toNumber(row.square_feet),
+    bedrooms: toNumber(row.features?.bedrooms),
+    bathrooms: toNumber(row.features?.bathrooms),
+    distanceMiles: toNumber(row.distance_miles),
+    adjustedValue: null,
+  };
+}
+
+function toDealComp(row: Row): ReportComparable {
+  return {
+    address: row.address,
+    salePrice: toNumber(row.sale_price) ?? 0,
+    saleDate: row.sale_date,
+    squareFeet: toNumber(row.sqft),
+    bedrooms: toNumber(row.bedrooms),
+    bathrooms: toNumber(row.bathrooms),
+    distanceMiles: toNumber(row.distance_miles),
+    adjustedValue: toNumber(row.adjusted_value),
+  };
+}
+
+function formatAddress(...parts: Array<string | null | undefined>): string {
+  return parts.filter(Boolean).join(", ");
+}
+
+export function createSupabaseReportDataSource(
+  supabase: SupabaseClient | null = getSupabaseAdmin()
+): ReportDataSource | null {
+  if (!supabase) return null;
+
+  return {
+    async loadProject(id) {
+      const [project, scopeItems, comparables, photos] = await Promise.all([
+        supabase.from("rehab_projects").select("*").eq("id", id).is("deleted_at", null).maybeSingle(),
+        supabase.from("rehab_scope_items").select("*").eq("project_id", id).order("id"),
+        supabase
+          .from("market_comparables")
+          .select("*")
+          .eq("project_id", id)
+          .order("sale_date", { ascending: false })
+          .order("id"),
+        supabase
+          .from("project_photos")
+          .select("storage_path, caption, category, taken_at")
+          .eq("project_id", id)
+          .order("taken_at", { ascending: true })
+          .order("id")
+          .limit(MAX_REPORT_PHOTOS),
+      ]);
+      for (const result of [project, scopeItems, comparables, photos]) {
+        if (result.error) throw new Error(result.error.message);
+      }
+      const row = project.data as Row | null;
+      if (!row) return null;
+
+      return {
+        project: {
+          id: row.id,
+          name: row.project_name ?? "Untitled project",
+          address:
+            row.address_formatted ??
+            formatAddress(row.address_street, row.address_city, `${row.address_state ?? ""} ${row.address_zip ?? ""}`.trim()),
+          propertyType: row.property_type ?? null,
+          squareFeet: toNumber(row.square_feet),
+          yearBuilt: toNumber(row.year_built),
+          bedrooms: toNumber(row.bedrooms),
+          bathrooms: toNumber(row.bathrooms),
+          strategy: row.investment_strategy ?? null,
+          holdPeriodMonths: toNumber(row.hold_period_months),
+          purchasePrice: toNumber(row.purchase_price),
+          arv: toNumber(row.arv),
+          maxBudget: toNumber(row.max_budget),
+          totalEstimatedCost: toNumber(row.total_estimated_cost),
+          estimatedDays: toNumber(row.estimated_days),
+          status: row.status ?? null,
+        },
+        scopeItems: (scopeItems.data ?? []).map(toScopeItem),
+        comparables: (comparables.data ?? []).map(toProjectComparable),
+        photos: (photos.data ?? []).map((photo: Row) => ({
+          storagePath: photo.storage_path,
+          caption: photo.caption ?? null,
+          category: photo.category ?? null,
+          takenAt: photo.taken_at ?? null,
+        })),
+      };
+    },
+
+    async loadDeal(id) {
+      const [lead, analysis, comps] = await Promise.all([
+        supabase.from("property_leads").select("*").eq("id", id).maybeSingle(),
+        supabase
+          .from("market_analysis")
+          .select("arv_estimate, arv_method, arv_confidence, arv_notes")
+          .eq("lead_id", id)
+          .maybeSingle(),
+        supabase
+          .from("comps")
+          .select("*")
+          .eq("lead_id", id)
+          .order("sale_date", { ascending: false })
+          .order("id"),
+      ]);
+      for (const result of [lead, analysis, comps]) {
+        if (result.error) throw new Error(result.error.message);
+      }
+      const row = lead.data as Row | null;
+      if (!row) return null;
+      const arv = (analysis.data ?? {}) as Row;
+
+      return {
+        deal: {
+          id: row.id,
+          address: formatAddress(row.address, row.city, `${row.state ?? ""} ${row.zip ?? ""}`.trim()),
+          propertyType: row.property_type ?? null,
+          squareFeet: toNumber(row.sqft),
+          yearBuilt: toNumber(row.year_built),
+          bedrooms: toNumber(row.bedrooms),
+          bathrooms: toNumber(row.bathrooms),
+          askingPrice: toNumber(row.asking_price),
+          phase: row.current_phase ?? null,
+          arvEstimate: toNumber(arv.arv_estimate),
+          arvMethod: arv.arv_method ?? null,
+          arvConfidence: toNumber(arv.arv_confidence),
+          arvNotes: arv.arv_notes ?? null,
+        },
+        comps: (comps.data ?? []).map(toDealComp),
+      };
+    },
+
+    async loadThumbnail(storagePath) {
+      // Same transform as the app's thumbnails; keep the original (JPEG) format
+      const { data, error } = await supabase.storage
+        .from(PHOTO_BUCKET)
+        .download(storagePath, { transform: { ...thumbnailTransform(), format: "origin" } });
+      if (error || !data) {
+        console.warn(`Report thumbnail unavailable for ${storagePath}:`, error?.message);
+        return null;
+      }
+      return new Uint8Array(await data.arrayBuffer());
+    },
+  };
+}
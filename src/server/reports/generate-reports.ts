@@ -0,0 +1,261 @@
+import { randomUUID } from "crypto";
+import { renderFooter } from "./layout";
+import { StreamingPdfWriter } from "./pdf-writer";
+import type { ReportStore } from "./report-store";
+import {
+  REPORT_RENDER_VERSION,
+  dealSections,
+  getRenderedSection,
+  hashContent,
+  projectSections,
+  sectionHash,
+  type SectionSpec,
+  type SectionStats,
+} from "./sections";
+import type {
+  GeneratedReport,
+  ReportDataSource,
+  ReportGenerationSummary,
+  ReportJobData,
+  ReportMode,
+  ReportTarget,
+} from "./types";
+
+/**
+ * Server-side report generation for the `reports.generate` job.
+ *
+ * Targets are processed in order (the next one's data loads while the current
+ * one is written) and each page is streamed to storage as soon as it is written,
+ * so memory is bounded by two targets' data and one section's pages regardless
+ * of batch size. Sections come from the render cache when their content is
+ * unchanged, and in `separate` mode a report whose content hash already exists
+ * in storage is not rewritten at all. When a report's content changes, the new
+ * file replaces the previous versions in its folder, so storage keeps only the
+ * latest PDF per project or deal.
+ */
+
+export interface ReportGenerationDeps {
+  source: ReportDataSource;
+  store: ReportStore;
+}
+
+export interface ReportGenerationOptions {
+  mode?: ReportMode;
+  /** Names the combined PDF (defaults to a random id) */
+  batchId?: string;
+  onProgress?: (completed: number, total: number) => void | Promise<void>;
+}
+
+interface PreparedTarget {
+  target: ReportTarget;
+  title: string;
+  sections: Array<{ spec: SectionSpec; hash: string }>;
+  /** Hash of every section hash, i.e. of the whole report's content */
+  reportHash: string;
+}
+
+/**
+ * Targets from job data, de-duplicated in request order.
+ */
+export function resolveReportTargets(data: ReportJobData | null | undefined): ReportTarget[] {
+  const seen = new Set<string>();
+  const targets: ReportTarget[] = [];
+  const add = (type: ReportTarget["type"], ids: unknown) => {
+    if (!Array.isArray(ids)) return;
+    for (const id of ids) {
+      if (typeof id !== "string" || !id || seen.has(`${type}:${id}`)) continue;
+      seen.add(`${type}:${id}`);
+      targets.push({ type, id });
+    }
+  };
+  add("project", data?.projectIds);
+  add("deal", data?.dealIds);
+  return targets;
+}
+
+async function prepareTarget(target: ReportTarget, source: ReportDataSource): Promise<PreparedTarget | null> {
+  let title: string;
+  let specs: SectionSpec[];
+  if (target.type === "project") {
+    const data = await source.loadProject(target.id);
+    if (!data) return null;
+    title = `${data.project.name} - ${data.project.address}`;
+    specs = projectSections(data);
+  } else {
+    const data = await source.loadDeal(target.id);
+    if (!data) return null;
+    title = `Deal analysis - ${data.deal.address}`;
+    specs = dealSections(data);
+  }
+
+  const sections = specs.map((spec) => ({ spec, hash: sectionHash(spec) }));
+  return {
+    target,
+    title,
+    sections,
+    reportHash: hashContent([REPORT_RENDER_VERSION, title, sections.map((section) => section.hash)]),
+  };
+}
+
+/**
+ * Prepare targets in order, loading the next one while the caller writes the
+ * current one (so at most two targets' data are held at once).
+ */
+async function* prepareInOrder(
+  targets: ReportTarget[],
+  source: ReportDataSource
+): AsyncGenerator<[ReportTarget, PreparedTarget | null]> {
+  let next = targets.length > 0 ? prepareTarget(targets[0], source) : null;
+  for (let index = 0; index < targets.length; index++) {
+    const current = next!;
+    next = index + 1 < targets.length ? prepareTarget(targets[index + 1], source) : null;
+    // Rejections surface when the prefetched target is awaited
+    next?.catch(() => undefined);
+    yield [targets[index], await current];
+  }
+}
+
+function reportPath(prepared: PreparedTarget): string {
+  const { type, id } = prepared.target;
+  return `${type}s/${id}/${prepared.reportHash}.pdf`;
+}
+
+/**
+ * Remove earlier versions of a report once its current content is stored.
+ * Best-effort: a leftover file is harmless, so failures only warn.
+ */
+async function removeSuperseded(store: ReportStore, path: string): Promise<void> {
+  const slash = path.lastIndexOf("/");
+  const folder = path.slice(0, slash);
+  const current = path.slice(slash + 1);
+  try {
+    const superseded = (await store.list(folder))
+      .filter((name) => name !== current && name.endsWith(".pdf"))
+      .map((name) => `${folder}/${name}`);
+    await store.remove(superseded);
+  } catch (error) {
+    console.warn(`Could not remove superseded reports in ${folder}:`, error instanceof Error ? error.message : error);
+  }
+}
+
+async function writeSections(
+  writer: StreamingPdfWriter,
+  prepared: PreparedTarget,
+  source: ReportDataSource,
+  stats: SectionStats
+): Promise<void> {
+  for (const { spec, hash } of prepared.sections) {
+    const section = await getRenderedSection(spec, hash, source, stats);
+    for (const page of section.pages) {
+      await writer.addPage(page, renderFooter(prepared.title, `Page ${writer.pageCount + 1}`));
+    }
+  }
+}
+
+/**
+ * Stream a PDF into the store; the upload is aborted if writing fails.
+ */
+async function writeReport(
+  store: ReportStore,
+  path: string,
+  title: string,
+  fill: (writer: StreamingPdfWriter) => Promise<void>
+): Promise<{ pages: number; bytes: number }> {
+  const upload = store.openWrite(path);
+  const writer = new StreamingPdfWriter(upload.stream, { title });
+  try {
+    await writer.begin();
+    await fill(writer);
+    const written = await writer.end();
+    await upload.done;
+    return written;
+  } catch (error) {
+    upload.stream.destroy(error as Error);
+    await upload.done.catch(() => undefined);
+    throw error;
+  }
+}
+
+export async function generateReports(
+  targets: ReportTarget[],
+  { source, store }: ReportGenerationDeps,
+  options: ReportGenerationOptions = {}
+): Promise<ReportGenerationSummary> {
+  const started = performance.now();
+  const stats: SectionStats = { rendered: 0, cached: 0 };
+  const reports: GeneratedReport[] = [];
+  const missing: ReportTarget[] = [];
+  let completed = 0;
+
+  const progress = async () => {
+    completed++;
+    await options.onProgress?.(completed, targets.length);
+  };
+
+  if (options.mode === "combined") {
+    const prepared = prepareInOrder(targets, source);
+
+    // Only open the upload once a target resolves, so a batch of missing targets writes nothing
+    let first: PreparedTarget | null = null;
+    while (!first) {
+      const next = await prepared.next();
+      if (next.done) break;
+      if (next.value[1]) {
+        first = next.value[1];
+      } else {
+        missing.push(next.value[0]);
+        await progress();
+      }
+    }
+
+    if (first) {
+      const included: ReportTarget[] = [];
+      const path = `batches/${options.batchId ?? randomUUID()}.pdf`;
+      const written = await writeReport(store, path, `Report batch (${targets.length})`, async (writer) => {
+        await writeSections(writer, first, source, stats);
+        included.push(first.target);
+        await progress();
+
+        for await (const [target, next] of prepared) {
+          if (next) {
+            await writeSections(writer, next, source, stats);
+            included.push(target);
+          } else {
+            missing.push(target);
+          }
+          await progress();
+        }
+      });
+      reports.push({ targets: included, path, reused: false, ...written });
+    }
+  } else {
+    for await (const [target, prepared] of prepareInOrder(targets, source)) {
+      if (!prepared) {
+        missing.push(target);
+        await progress();
+        continue;
+      }
+
+      const path = reportPath(prepared);
+      const existing = await store.stat(path);
+      if (existing) {
+        reports.push({ targets: [target], path, reused: true, pages: null, bytes: existing.bytes });
+      } else {
+        const written = await writeReport(store, path, prepared.title, (writer) =>
+          writeSections(writer, prepared, source, stats)
+        );
+        await removeSuperseded(store, path);
+        reports.push({ targets: [target], path, reused: false, ...written });
+      }
+      await progress();
+    }
+  }
+
+  return {
+    reports,
+    missing,
+    sectionsRendered: stats.rendered,
+    sectionsCached: stats.cached,
+    elapsedMs: performance.now() - started,
+  };
+}
@@ -0,0 +1,289 @@
+import { deflateSync } from "zlib";
+import { PAGE_HEIGHT, PAGE_WIDTH, encodePdfText, type JpegInfo } from "./pdf-writer";
+import type { RenderedImage, RenderedPage, RenderedSection } from "./types";
+
+/**
+ * Page layout for report sections: text measurement, tables and image grids,
+ * composed into deflated content streams with automatic page breaks.
+ */
+
+export const PAGE_MARGIN = 48;
+const CONTENT_WIDTH = PAGE_WIDTH - PAGE_MARGIN * 2;
+const CONTENT_TOP = PAGE_HEIGHT - PAGE_MARGIN;
+// Leaves room for the footer drawn by the writer
+const CONTENT_BOTTOM = PAGE_MARGIN + 12;
+const FOOTER_Y = 28;
+
+export type FontStyle = "regular" | "bold";
+
+// Helvetica advance widths (1/1000 em) for ASCII 32-126
+const HELVETICA_WIDTHS = [
+  278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+  556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+  1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+  667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+  333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+  556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+];
+// Helvetica-Bold is close to 5% wider on average; good enough for fitting text
+const BOLD_WIDTH_FACTOR = 1.05;
+const DEFAULT_CHAR_WIDTH = 556;
+
+const currencyFormat = new Intl.NumberFormat("en-US", {
+  style: "currency",
+  currency: "USD",
+  minimumFractionDigits: 0,
+  maximumFractionDigits: 0,
+});
+
+export function formatMoney(value: number | null | undefined): string {
+  return value === null || value === undefined || !Number.isFinite(value) ? "-" : currencyFormat.format(value);
+}
+
+export function formatNumber(value: number | null | undefined, digits = 0): string {
+  return value === null || value === undefined || !Number.isFinite(value)
+    ? "-"
+    : value.toLocaleString("en-US", { maximumFractionDigits: digits });
+}
+
+export function formatDate(value: string | null | undefined): string {
+  return value ? value.slice(0, 10) : "-";
+}
+
+export function textWidth(text: string, size: number, style: FontStyle = "regular"): number {
+  let units = 0;
+  for (let i = 0; i < text.length; i++) {
+    const code = text.charCodeAt(i);
+    units += code >= 32 && code <= 126 ? HELVETICA_WIDTHS[code - 32] : DEFAULT_CHAR_WIDTH;
+  }
+  return (units * size * (style === "bold" ? BOLD_WIDTH_FACTOR : 1)) / 1000;
+}
+
+/**
+ * Truncate text with an ellipsis so it fits `width`.
+ */
+export function fitText(text: string, width: number, size: number, style: FontStyle = "regular"): string {
+  if (textWidth(text, size, style) <= width) return text;
+  let end = text.length;
+  while (end > 0 && textWidth(`${text.slice(0, end)}...`, size, style) > width) end--;
+  return end > 0 ? `${text.slice(0, end).trimEnd()}...` : "";
+}
+
+/**
+ * Greedy word wrap; words longer than a line are truncated.
+ */
+export function wrapText(text: string, width: number, size: number, style: FontStyle = "regular"): string[] {
+  const lines: string[] = [];
+  let line = "";
+  for (const word of text.split(/\s+/).filter(Boolean)) {
+    const candidate = line ? `${line} ${word}` : word;
+    if (textWidth(candidate, size, style) <= width) {
+      line = candidate;
+    } else {
+      if (line) lines.push(line);
+      line = fitText(word, width, size, style);
+    }
+  }
+  if (line) lines.push(line);
+  return lines;
+}
+
+function textOp(text: string, x: number, y: number, size: number, style: FontStyle): string {
+  const font = style === "bold" ? "F2" : "F1";
+  return `BT /${font} ${size} Tf ${x.toFixed(2)} ${y.toFixed(2)} Td (${encodePdfText(text)}) Tj ET`;
+}
+
+/**
+ * Footer content drawn by the writer on every page (not cached, since page
+ * numbers depend on where the section lands in the report).
+ */
+export function renderFooter(left: string, right: string): string {
+  const size = 8;
+  const rightX = PAGE_WIDTH - PAGE_MARGIN - textWidth(right, size);
+  const leftText = fitText(left, rightX - PAGE_MARGIN - 12, size);
+  return [
+    "0.45 g",
+    textOp(leftText, PAGE_MARGIN, FOOTER_Y, size, "regular"),
+    textOp(right, rightX, FOOTER_Y, size, "regular"),
+  ].join("\n");
+}
+
+export interface TableColumn<Row> {
+  header: string;
+  /** Fraction of the content width */
+  width: number;
+  align?: "left" | "right";
+  value: (row: Row) => string;
+}
+
+export interface GridImage {
+  info: JpegInfo;
+  /** Base64 JPEG bytes */
+  data: string;
+  caption: string;
+}
+
+/**
+ * Builds a section's pages top to bottom, starting a new page (with a
+ * "continued" title) whenever the next block does not fit.
+ */
+export class SectionComposer {
+  private readonly title: string;
+  private readonly pages: RenderedPage[] = [];
+  private ops: string[] = [];
+  private images: RenderedImage[] = [];
+  private y = CONTENT_TOP;
+
+  constructor(title: string) {
+    this.title = title;
+    this.startPage();
+  }
+
+  heading(text: string): void {
+    this.ensureSpace(28);
+    this.y -= 18;
+    this.ops.push(textOp(text, PAGE_MARGIN, this.y, 12, "bold"));
+    this.y -= 8;
+  }
+
+  paragraph(text: string, size = 10): void {
+    for (const line of wrapText(text, CONTENT_WIDTH, size)) {
+      this.ensureSpace(size + 4);
+      this.y -= size + 4;
+      this.ops.push(textOp(line, PAGE_MARGIN, this.y, size, "regular"));
+    }
+    this.y -= 4;
+  }
+
+  /**
+   * Label/value pairs laid out in two columns.
+   */
+  keyValues(pairs: Array<[string, string]>): void {
+    const columnWidth = CONTENT_WIDTH / 2;
+    const labelWidth = columnWidth * 0.45;
+    for (let i = 0; i < pairs.length; i += 2) {
+      this.ensureSpace(16);
+      this.y -= 16;
+      pairs.slice(i, i + 2).forEach(([label, value], column) => {
+        const x = PAGE_MARGIN + column * columnWidth;
+        this.ops.push(
+          "0.4 g",
+          textOp(fitText(label, labelWidth - 6, 9), x, this.y, 9, "regular"),
+          "0 g",
+          textOp(fitText(value, columnWidth - labelWidth - 12, 10, "bold"), x + labelWidth, this.y, 10, "bold")
+        );
+      });
+    }
+    this.y -= 8;
+  }
+
+  /**
+   * A table with a shaded header row, repeated after page breaks.
+   */
+  table<Row>(columns: TableColumn<Row>[], rows: Row[], footer?: string[]): void {
+    const size = 8.5;
+    const rowHeight = 15;
+    const widths = columns.map((column) => column.width * CONTENT_WIDTH);
+
+    const drawRow = (cells: string[], style: FontStyle) => {
+      let x = PAGE_MARGIN;
+      cells.forEach((cell, index) => {
+        const width = widths[index];
+        const text = fitText(cell, width - 8, size, style);
+        const textX = columns[index].align === "right" ? x + width - 4 - textWidth(text, size, style) : x + 4;
+        this.ops.push(textOp(text, textX, this.y + 4.5, size, style));
+        x += width;
+      });
+    };
+
+    const drawHeader = () => {
+      this.y -= rowHeight;
+      this.ops.push(`0.92 g ${PAGE_MARGIN} ${this.y.toFixed(2)} ${CONTENT_WIDTH} ${rowHeight} re f`, "0 g");
+      drawRow(
+        columns.map((column) => column.header),
+        "bold"
+      );
+    };
+
+    this.ensureSpace(rowHeight * 2);
+    drawHeader();
+    for (const row of rows) {
+      if (this.ensureSpace(rowHeight)) drawHeader();
+      this.y -= rowHeight;
+      this.ops.push(
+        `0.85 G 0.5 w ${PAGE_MARGIN} ${this.y.toFixed(2)} m ${PAGE_MARGIN + CONTENT_WIDTH} ${this.y.toFixed(2)} l S`
+      );
+      drawRow(
+        columns.map((column) => column.value(row)),
+        "regular"
+      );
+    }
+    if (footer) {
+      if (this.ensureSpace(rowHeight)) drawHeader();
+      this.y -= rowHeight;
+      drawRow(footer, "bold");
+    }
+    this.y -= 10;
+  }
+
+  /**
+   * JPEG thumbnails in a grid, each scaled to fit its cell with a caption.
+   */
+  imageGrid(images: GridImage[], perRow = 3): void {
+    const gap = 12;
+    const cellWidth = (CONTENT_WIDTH - gap * (perRow - 1)) / perRow;
+    const cellHeight = cellWidth + 16;
+
+    for (let i = 0; i < images.length; i += perRow) {
+      this.ensureSpace(cellHeight + gap);
+      this.y -= cellHeight;
+      images.slice(i, i + perRow).forEach((image, column) => {
+        const name = `Im${this.images.length + 1}`;
+        this.images.push({ name, ...image.info, data: image.data });
+
+        const scale = Math.min(cellWidth / image.info.width, cellWidth / image.info.height);
+        const width = image.info.width * scale;
+        const height = image.info.height * scale;
+        const x = PAGE_MARGIN + column * (cellWidth + gap) + (cellWidth - width) / 2;
+        const y = this.y + 16 + (cellWidth - height) / 2;
+        this.ops.push(`q ${width.toFixed(2)} 0 0 ${height.toFixed(2)} ${x.toFixed(2)} ${y.toFixed(2)} cm /${name} Do Q`);
+        this.ops.push(
+          textOp(fitText(image.caption, cellWidth, 8), PAGE_MARGIN + column * (cellWidth + gap), this.y + 4, 8, "regular")
+        );
+      });
+      this.y -= gap;
+    }
+  }
+
+  finish(): RenderedSection {
+    this.flushPage();
+    return { pages: this.pages };
+  }
+
+  private startPage(): void {
+    const title = this.pages.length === 0 ? this.title : `${this.title} (continued)`;
+    this.y = CONTENT_TOP - 16;
+    this.ops.push(
+      textOp(fitText(title, CONTENT_WIDTH, 16, "bold"), PAGE_MARGIN, this.y, 16, "bold"),
+      `0.2 G 1 w ${PAGE_MARGIN} ${this.y - 8} m ${PAGE_MARGIN + CONTENT_WIDTH} ${this.y - 8} l S`
+    );
+    this.y -= 16;
+  }
+
+  private flushPage(): void {
+    this.pages.push({
+      content: deflateSync(Buffer.from(this.ops.join("\n"), "latin1")).toString("base64"),
+      images: this.images,
+    });
+    this.ops = [];
+    this.images = [];
+  }
+
+  /** Start a new page when `height` does not fit; returns true if it did */
+  private ensureSpace(height: number): boolean {
+    if (this.y - height >= CONTENT_BOTTOM) return false;
+    this.flushPage();
+    this.startPage();
+    return true;
+  }
+}
@@ -0,0 +1,232 @@
+import { once } from "events";
+import type { Writable } from "stream";
+import type { RenderedPage } from "./types";
+
+/**
+ * Minimal streaming PDF writer.
+ *
+ * pdf-lib, jsPDF and @react-pdf/renderer all build the whole document in memory
+ * before serializing it, which does not scale to batch exports. This writer emits
+ * each object as soon as it is added and only keeps object offsets and page ids,
+ * so memory stays flat no matter how many pages a report has. The page tree,
+ * cross-reference table and trailer are written by `end()`.
+ *
+ * Text uses the standard Helvetica fonts (WinAnsi encoding); images must be JPEG
+ * and are embedded as-is with DCTDecode.
+ */
+
+export const PAGE_WIDTH = 612; // US Letter, in points
+export const PAGE_HEIGHT = 792;
+
+const CATALOG_ID = 1;
+const PAGES_ID = 2;
+const FONT_REGULAR_ID = 3;
+const FONT_BOLD_ID = 4;
+const FIRST_FREE_ID = 5;
+
+const FONT_RESOURCES = `/Font << /F1 ${FONT_REGULAR_ID} 0 R /F2 ${FONT_BOLD_ID} 0 R >>`;
+
+// Characters outside Latin-1 that WinAnsi still has a code for
+const WIN_ANSI_EXTRAS: Record<string, number> = {
+  "•": 0x95, // bullet
+  "–": 0x96, // en dash
+  "—": 0x97, // em dash
+  "‘": 0x91,
+  "’": 0x92,
+  "“": 0x93,
+  "”": 0x94,
+  "…": 0x85, // ellipsis
+  "€": 0x80, // euro
+};
+
+/**
+ * Encode text as a PDF literal string body (WinAnsi, as a latin1 JS string).
+ * Unsupported characters become `?`.
+ */
+export function encodePdfText(text: string): string {
+  let encoded = "";
+  for (const char of text) {
+    const code = char.codePointAt(0)!;
+    if (char === "(" || char === ")" || char === "\\") {
+      encoded += `\\${char}`;
+    } else if (code === 0x0a || code === 0x0d || code === 0x09) {
+      encoded += " ";
+    } else if ((code >= 0x20 && code < 0x7f) || (code >= 0xa0 && code <= 0xff)) {
+      encoded += char;
+    } else if (WIN_ANSI_EXTRAS[char] !== undefined) {
+      encoded += String.fromCharCode(WIN_ANSI_EXTRAS[char]);
+    } else {
+      encoded += "?";
+    }
+  }
+  return encoded;
+}
+
+export interface JpegInfo {
+  width: number;
+  height: number;
+  components: number;
+}
+
+/**
+ * Read dimensions and component count from a JPEG's SOF marker, or null when
+ * the bytes are not a JPEG this writer can embed.
+ */
+export function readJpegInfo(bytes: Uint8Array): JpegInfo | null {
+  if (bytes.length < 4 || bytes[0] !== 0xff || bytes[1] !== 0xd8) return null;
+
+  let offset = 2;
+  while (offset + 9 < bytes.length) {
+    if (bytes[offset] !== 0xff) return null;
+    const marker = bytes[offset + 1];
+    if (marker === 0xff) {
+      offset++;
+      continue;
+    }
+    const length = (bytes[offset + 2] << 8) | bytes[offset + 3];
+    // SOF0-SOF15, except DHT (C4), JPG (C8) and DAC (CC)
+    if (marker >= 0xc0 && marker <= 0xcf && marker !== 0xc4 && marker !== 0xc8 && marker !== 0xcc) {
+      const components = bytes[offset + 9];
+      const info = {
+        height: (bytes[offset + 5] << 8) | bytes[offset + 6],
+        width: (bytes[offset + 7] << 8) | bytes[offset + 8],
+        components,
+      };
+      return info.width > 0 && info.height > 0 && [1, 3, 4].includes(components) ? info : null;
+    }
+    offset += 2 + length;
+  }
+  return null;
+}
+
+function colorSpace(components: number): string {
+  if (components === 1) return "/DeviceGray";
+  if (components === 4) return "/DeviceCMYK";
+  return "/DeviceRGB";
+}
+
+export class StreamingPdfWriter {
+  private readonly out: Writable;
+  private readonly title: string | undefined;
+  /** Byte offset of each object, indexed by object id */
+  private readonly offsets: number[] = [];
+  private readonly pageIds: number[] = [];
+  private nextId = FIRST_FREE_ID;
+  private bytesWritten = 0;
+
+  constructor(out: Writable, options: { title?: string } = {}) {
+    this.out = out;
+    this.title = options.title;
+  }
+
+  get pageCount(): number {
+    return this.pageIds.length;
+  }
+
+  /**
+   * Write the header, catalog and fonts.
+   */
+  async begin(): Promise<void> {
+    await this.write(Buffer.from("%PDF-1.4\n%\xe2\xe3\xcf\xd3\n", "latin1"));
+    await this.writeObject(CATALOG_ID, `<< /Type /Catalog /Pages ${PAGES_ID} 0 R >>`);
+    await this.writeObject(
+      FONT_REGULAR_ID,
+      "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    );
+    await this.writeObject(
+      FONT_BOLD_ID,
+      "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>"
+    );
+  }
+
+  /**
+   * Write one pre-rendered page. `overlay` is extra (uncompressed) content drawn
+   * on top, e.g. a footer with the page number.
+   */
+  async addPage(page: RenderedPage, overlay?: string): Promise<void> {
+    const xObjects: string[] = [];
+    for (const image of page.images) {
+      const id = this.nextId++;
+      const data = Buffer.from(image.data, "base64");
+      await this.writeStream(
+        id,
+        `/Type /XObject /Subtype /Image /Width ${image.width} /Height ${image.height} ` +
+          `/ColorSpace ${colorSpace(image.components)} /BitsPerComponent 8 /Filter /DCTDecode`,
+        data
+      );
+      xObjects.push(`/${image.name} ${id} 0 R`);
+    }
+
+    const contentIds: number[] = [];
+    const contentId = this.nextId++;
+    await this.writeStream(contentId, "/Filter /FlateDecode", Buffer.from(page.content, "base64"));
+    contentIds.push(contentId);
+
+    if (overlay) {
+      const overlayId = this.nextId++;
+      await this.writeStream(overlayId, "", Buffer.from(overlay, "latin1"));
+      contentIds.push(overlayId);
+    }
+
+    const pageId = this.nextId++;
+    const resources = xObjects.length > 0 ? `${FONT_RESOURCES} /XObject << ${xObjects.join(" ")} >>` : FONT_RESOURCES;
+    await this.writeObject(
+      pageId,
+      `<< /Type /Page /Parent ${PAGES_ID} 0 R /MediaBox [0 0 ${PAGE_WIDTH} ${PAGE_HEIGHT}] ` +
+        `/Resources << ${resources} >> /Contents [${contentIds.map((id) => `${id} 0 R`).join(" ")}] >>`
+    );
+    this.pageIds.push(pageId);
+  }
+
+  /**
+   * Write the page tree, info dictionary, xref table and trailer, then end the stream.
+   */
+  async end(): Promise<{ pages: number; bytes: number }> {
+    await this.writeObject(
+      PAGES_ID,
+      `<< /Type /Pages /Count ${this.pageIds.length} /Kids [${this.pageIds.map((id) => `${id} 0 R`).join(" ")}] >>`
+    );
+
+    const infoId = this.nextId++;
+    const title = this.title ? ` /Title (${encodePdfText(this.title)})` : "";
+    await this.writeObject(infoId, `<< /Producer (Rehab Planner Pro)${title} >>`);
+
+    const xrefOffset = this.bytesWritten;
+    const lines = [`xref\n0 ${this.nextId}\n`, "0000000000 65535 f \n"];
+    for (let id = 1; id < this.nextId; id++) {
+      lines.push(`${String(this.offsets[id] ?? 0).padStart(10, "0")} 00000 n \n`);
+    }
+    lines.push(
+      `trailer\n<< /Size ${this.nextId} /Root ${CATALOG_ID} 0 R /Info ${infoId} 0 R >>\n` +
+        `startxref\n${xrefOffset}\n%%EOF\n`
+    );
+    await this.write(Buffer.from(lines.join(""), "latin1"));
+
+    await new Promise<void>((resolve, reject) => {
+      this.out.once("error", reject);
+      this.out.end(resolve);
+    });
+    return { pages: this.pageIds.length, bytes: this.bytesWritten };
+  }
+
+  private async writeObject(id: number, body: string): Promise<void> {
+    this.offsets[id] = this.bytesWritten;
+    await this.write(Buffer.from(`${id} 0 obj\n${body}\nendobj\n`, "latin1"));
+  }
+
+  private async writeStream(id: number, dictionary: string, data: Buffer): Promise<void> {
+    this.offsets[id] = this.bytesWritten;
+    const entries = dictionary ? `${dictionary} ` : "";
+    await this.write(Buffer.from(`${id} 0 obj\n<< ${entries}/Length ${data.length} >>\nstream\n`, "latin1"));
+    await this.write(data);
+    await this.write(Buffer.from("\nendstream\nendobj\n", "latin1"));
+  }
+
+  /** Write with backpressure so slow uploads do not buffer the whole file */
+  private async write(chunk: Buffer): Promise<void> {
+    this.bytesWritten += chunk.length;
+    if (!this.out.write(chunk)) {
+      await once(this.out, "drain");
+    }
+  }
+}
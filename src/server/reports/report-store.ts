@@ -0,0 +1,122 @@
+import { createWriteStream } from "fs";
+import { mkdir, readdir, rm, stat } from "fs/promises";
+import { dirname, join } from "path";
+import { PassThrough, Readable, type Writable } from "stream";
+import { finished } from "stream/promises";
+import type { SupabaseClient } from "@supabase/supabase-js";
+import { REPORTS_BUCKET } from "../jobs/config";
+import { getSupabaseAdmin } from "../supabase-admin";
+
+/**
+ * Where generated PDFs are written. Writes are streamed: the writer pushes
+ * bytes into `stream` as pages are produced and `done` settles once the
+ * object is stored.
+ */
+
+export interface ReportUpload {
+  stream: Writable;
+  done: Promise<void>;
+}
+
+export interface ReportStore {
+  /** Size of an existing report, or null if there is none */
+  stat(path: string): Promise<{ bytes: number } | null>;
+  openWrite(path: string): ReportUpload;
+  /** File names directly inside `folder` (empty if it does not exist) */
+  list(folder: string): Promise<string[]>;
+  remove(paths: string[]): Promise<void>;
+}
+
+/**
+ * Supabase Storage, uploading from a stream so the PDF is never held in memory.
+ */
+export function createSupabaseReportStore(
+  supabase: SupabaseClient | null = getSupabaseAdmin(),
+  bucket = REPORTS_BUCKET
+): ReportStore | null {
+  if (!supabase) return null;
+
+  return {
+    async stat(path) {
+      const slash = path.lastIndexOf("/");
+      const folder = slash === -1 ? "" : path.slice(0, slash);
+      const name = path.slice(slash + 1);
+      const { data, error } = await supabase.storage.from(bucket).list(folder, { search: name, limit: 1 });
+      if (error) throw new Error(error.message);
+      const file = data?.find((entry) => entry.name === name);
+      return file ? { bytes: Number(file.metadata?.size ?? 0) } : null;
+    },
+
+    openWrite(path) {
+      const stream = new PassThrough();
+      const done = supabase.storage
+        .from(bucket)
+        .upload(path, Readable.toWeb(stream) as ReadableStream, {
+          contentType: "application/pdf",
+          upsert: true,
+          duplex: "half",
+        })
+        .then(({ error }) => {
+          if (error) throw new Error(error.message);
+        });
+      // A failed upload stops reading; fail the writer instead of waiting on "drain"
+      done.catch((error) => stream.destroy(error));
+      return { stream, done };
+    },
+
+    async list(folder) {
+      const { data, error } = await supabase.storage.from(bucket).list(folder, { limit: 1000 });
+      if (error) throw new Error(error.message);
+      return (data ?? []).map((entry) => entry.name);
+    },
+
+    async remove(paths) {
+      if (paths.length === 0) return;
+      const { error } = await supabase.storage.from(bucket).remove(paths);
+      if (error) throw new Error(error.message);
+    },
+  };
+}
+
+/**
+ * Local directory, used by scripts and for local development.
+ */
+export class FileReportStore implements ReportStore {
+  private readonly root: string;
+
+  constructor(root: string) {
+    this.root = root;
+  }
+
+  async stat(path: string) {
+    try {
+      return { bytes: (await stat(join(this.root, path))).size };
+    } catch {
+      return null;
+    }
+  }
+
+  openWrite(path: string): ReportUpload {
+    const target = join(this.root, path);
+    const stream = new PassThrough();
+    const done = mkdir(dirname(target), { recursive: true }).then(async () => {
+      const file = createWriteStream(target);
+      stream.pipe(file);
+      await finished(file);
+    });
+    done.catch((error) => stream.destroy(error));
+    return { stream, done };
+  }
+
+  async list(folder: string) {
+    try {
+      return await readdir(join(this.root, folder));
+    } catch {
+      return [];
+    }
+  }
+
+  async remove(paths: string[]) {
+    await Promise.all(paths.map((path) => rm(join(this.root, path), { force: true })));
+  }
+}
@@ -0,0 +1,353 @@
+import { createHash } from "crypto";
+import {
+  TieredCache,
+  createSharedStoreFromEnv,
+  stableStringify,
+  type CachePolicy,
+  type SharedCacheStore,
+} from "@/lib/tiered-cache";
+import { SectionComposer, formatDate, formatMoney, formatNumber, type GridImage } from "./layout";
+import { readJpegInfo } from "./pdf-writer";
+import type {
+  DealReportData,
+  ProjectReportData,
+  RenderedSection,
+  ReportComparable,
+  ReportDataSource,
+  ReportDeal,
+  ReportPhoto,
+  ReportProject,
+  ReportScopeItem,
+} from "./types";
+
+/**
+ * Report sections and their render cache.
+ *
+ * Each section is rendered from a plain input object and cached under a hash of
+ * that input, so re-exporting an unchanged project reuses the rendered pages
+ * (including downloaded photo thumbnails) instead of rebuilding them.
+ */
+
+// Bump when section layout changes so old renders are not reused
+export const REPORT_RENDER_VERSION = 1;
+
+export const MAX_REPORT_PHOTOS = 12;
+const THUMBNAIL_FETCH_CONCURRENCY = 4;
+
+// Content-addressed, so entries never go stale; the TTL only bounds storage
+const SECTION_CACHE_POLICY: CachePolicy<[string]> = {
+  namespace: "report-sections",
+  ttlSeconds: 60 * 60 * 24 * 7,
+};
+
+// Rendered sections can hold thumbnails, so keep few of them in-process
+const SECTION_CACHE_L1_ENTRIES = 64;
+
+export type SectionSpec =
+  | { kind: "project-summary"; project: ReportProject; scopeItems: ReportScopeItem[] }
+  | { kind: "scope-items"; items: ReportScopeItem[] }
+  | { kind: "comparables"; title: string; comps: ReportComparable[]; adjusted: boolean }
+  | { kind: "photos"; photos: ReportPhoto[] }
+  | { kind: "deal-summary"; deal: ReportDeal; comps: ReportComparable[] };
+
+export interface SectionStats {
+  rendered: number;
+  cached: number;
+}
+
+let reportCache: TieredCache | null = null;
+
+/**
+ * Cache for rendered sections: small L1, shared tier from the environment
+ * (Redis when CACHE_REDIS_URL or REDIS_URL is set).
+ */
+export function getReportCache(): TieredCache {
+  if (!reportCache) {
+    reportCache = configureReportCache(createSharedStoreFromEnv());
+  }
+  return reportCache;
+}
+
+/**
+ * Replace the report cache's shared tier (e.g. with a MemorySharedStore in
+ * scripts). Pass null for an L1-only cache.
+ */
+export function configureReportCache(store: SharedCacheStore | null): TieredCache {
+  reportCache = new TieredCache({
+    store,
+    keyPrefix: process.env.REDIS_PREFIX ?? "rehab-estimator",
+    l1MaxEntries: SECTION_CACHE_L1_ENTRIES,
+  });
+  return reportCache;
+}
+
+export function hashContent(value: unknown): string {
+  return createHash("sha256").update(stableStringify(value)).digest("hex");
+}
+
+export function sectionHash(spec: SectionSpec): string {
+  return hashContent([REPORT_RENDER_VERSION, spec]);
+}
+
+// ============================================================================
+// SECTION PLANS
+// ============================================================================
+
+export function projectSections(data: ProjectReportData): SectionSpec[] {
+  const sections: SectionSpec[] = [
+    { kind: "project-summary", project: data.project, scopeItems: data.scopeItems },
+    { kind: "scope-items", items: data.scopeItems },
+  ];
+  if (data.comparables.length > 0) {
+    sections.push({ kind: "comparables", title: "Market Comparables", comps: data.comparables, adjusted: false });
+  }
+  if (data.photos.length > 0) {
+    sections.push({ kind: "photos", photos: data.photos.slice(0, MAX_REPORT_PHOTOS) });
+  }
+  return sections;
+}
+
+export function dealSections(data: DealReportData): SectionSpec[] {
+  const sections: SectionSpec[] = [{ kind: "deal-summary", deal: data.deal, comps: data.comps }];
+  if (data.comps.length > 0) {
+    sections.push({ kind: "comparables", title: "Comparable Sales", comps: data.comps, adjusted: true });
+  }
+  return sections;
+}
+
+/**
+ * Rendered pages for a section, from the cache when its content is unchanged.
+ */
+export async function getRenderedSection(
+  spec: SectionSpec,
+  hash: string,
+  source: ReportDataSource,
+  stats: SectionStats
+): Promise<RenderedSection> {
+  let rendered = false;
+  const section = await getReportCache().getOrLoad(
+    [hash],
+    async () => {
+      rendered = true;
+      return renderSection(spec, source);
+    },
+    SECTION_CACHE_POLICY
+  );
+  if (rendered) {
+    stats.rendered++;
+  } else {
+    stats.cached++;
+  }
+  return section;
+}
+
+export async function renderSection(spec: SectionSpec, source: ReportDataSource): Promise<RenderedSection> {
+  switch (spec.kind) {
+    case "project-summary":
+      return renderProjectSummary(spec.project, spec.scopeItems);
+    case "scope-items":
+      return renderScopeItems(spec.items);
+    case "comparables":
+      return renderComparables(spec.title, spec.comps, spec.adjusted);
+    case "photos":
+      return renderPhotos(spec.photos, source);
+    case "deal-summary":
+      return renderDealSummary(spec.deal, spec.comps);
+  }
+}
+
+// ============================================================================
+// RENDERERS
+// ============================================================================
+
+function renderProjectSummary(project: ReportProject, scopeItems: ReportScopeItem[]): RenderedSection {
+  const composer = new SectionComposer(project.name);
+  composer.paragraph(project.address, 11);
+
+  const included = scopeItems.filter((item) => item.included);
+  const scopeTotal = included.reduce((sum, item) => sum + item.totalCost, 0);
+  const rehabCost = project.totalEstimatedCost ?? scopeTotal;
+  const allIn = (project.purchasePrice ?? 0) + rehabCost;
+  const profit = project.arv !== null ? project.arv - allIn : null;
+
+  composer.heading("Property");
+  composer.keyValues([
+    ["Type", project.propertyType ?? "-"],
+    ["Status", project.status ?? "-"],
+    ["Square feet", formatNumber(project.squareFeet)],
+    ["Year built", project.yearBuilt !== null ? String(project.yearBuilt) : "-"],
+    ["Bedrooms", formatNumber(project.bedrooms)],
+    ["Bathrooms", formatNumber(project.bathrooms, 1)],
+  ]);
+
+  composer.heading("Investment");
+  composer.keyValues([
+    ["Strategy", project.strategy ?? "-"],
+    ["Hold period", project.holdPeriodMonths !== null ? `${project.holdPeriodMonths} months` : "-"],
+    ["Purchase price", formatMoney(project.purchasePrice)],
+    ["ARV", formatMoney(project.arv)],
+    ["Rehab estimate", formatMoney(rehabCost)],
+    ["Max budget", formatMoney(project.maxBudget)],
+    ["All-in cost", formatMoney(allIn)],
+    ["Gross profit", formatMoney(profit)],
+    ["Estimated days", formatNumber(project.estimatedDays)],
+    ["Scope items", `${included.length} of ${scopeItems.length} included`],
+  ]);
+
+  const byCategory = new Map<string, { count: number; total: number }>();
+  for (const item of included) {
+    const entry = byCategory.get(item.category) ?? { count: 0, total: 0 };
+    entry.count++;
+    entry.total += item.totalCost;
+    byCategory.set(item.category, entry);
+  }
+  if (byCategory.size > 0) {
+    composer.heading("Budget by category");
+    composer.table(
+      [
+        { header: "Category", width: 0.5, value: ([category]) => category },
+        { header: "Items", width: 0.2, align: "right", value: ([, entry]) => String(entry.count) },
+        { header: "Total", width: 0.3, align: "right", value: ([, entry]) => formatMoney(entry.total) },
+      ],
+      [...byCategory].sort((a, b) => b[1].total - a[1].total),
+      ["Total", String(included.length), formatMoney(scopeTotal)]
+    );
+  }
+
+  return composer.finish();
+}
+
+function renderScopeItems(items: ReportScopeItem[]): RenderedSection {
+  const composer = new SectionComposer("Scope of Work");
+  if (items.length === 0) {
+    composer.paragraph("No scope items have been added yet.");
+    return composer.finish();
+  }
+
+  const sorted = [...items].sort(
+    (a, b) => (a.phase ?? 0) - (b.phase ?? 0) || a.category.localeCompare(b.category) || a.itemName.localeCompare(b.itemName)
+  );
+  composer.table(
+    [
+      { header: "Ph", width: 0.05, align: "right", value: (item) => (item.phase !== null ? String(item.phase) : "-") },
+      { header: "Category", width: 0.16, value: (item) => item.category },
+      { header: "Item", width: 0.3, value: (item) => (item.included ? item.itemName : `${item.itemName} (excluded)`) },
+      { header: "Location", width: 0.14, value: (item) => item.location ?? "-" },
+      {
+        header: "Qty",
+        width: 0.11,
+        align: "right",
+        value: (item) => `${formatNumber(item.quantity, 2)} ${item.unitOfMeasure ?? ""}`.trim(),
+      },
+      { header: "Priority", width: 0.1, value: (item) => item.priority ?? "-" },
+      { header: "Total", width: 0.14, align: "right", value: (item) => formatMoney(item.totalCost) },
+    ],
+    sorted,
+    ["", "", "Included total", "", "", "", formatMoney(items.reduce((sum, item) => sum + (item.included ? item.totalCost : 0), 0))]
+  );
+  return composer.finish();
+}
+
+function renderComparables(title: string, comps: ReportComparable[], adjusted: boolean): RenderedSection {
+  const composer = new SectionComposer(title);
+  const perSqft = comps
+    .filter((comp) => comp.squareFeet)
+    .map((comp) => comp.salePrice / comp.squareFeet!);
+  if (perSqft.length > 0) {
+    const average = perSqft.reduce((sum, value) => sum + value, 0) / perSqft.length;
+    composer.paragraph(
+      `${comps.length} comparable sale${comps.length === 1 ? "" : "s"}, average ${formatMoney(average)} per square foot.`
+    );
+  }
+
+  composer.table(
+    [
+      { header: "Address", width: adjusted ? 0.3 : 0.34, value: (comp) => comp.address },
+      { header: "Sold", width: 0.12, value: (comp) => formatDate(comp.saleDate) },
+      { header: "Price", width: 0.13, align: "right", value: (comp) => formatMoney(comp.salePrice) },
+      { header: "Sq ft", width: 0.09, align: "right", value: (comp) => formatNumber(comp.squareFeet) },
+      {
+        header: "$/sq ft",
+        width: 0.09,
+        align: "right",
+        value: (comp) => (comp.squareFeet ? formatMoney(comp.salePrice / comp.squareFeet) : "-"),
+      },
+      {
+        header: "Bd/Ba",
+        width: 0.09,
+        align: "right",
+        value: (comp) => `${formatNumber(comp.bedrooms)}/${formatNumber(comp.bathrooms, 1)}`,
+      },
+      adjusted
+        ? { header: "Adjusted", width: 0.18, align: "right", value: (comp) => formatMoney(comp.adjustedValue) }
+        : {
+            header: "Distance",
+            width: 0.14,
+            align: "right",
+            value: (comp) => (comp.distanceMiles !== null ? `${formatNumber(comp.distanceMiles, 2)} mi` : "-"),
+          },
+    ],
+    comps
+  );
+  return composer.finish();
+}
+
+async function renderPhotos(photos: ReportPhoto[], source: ReportDataSource): Promise<RenderedSection> {
+  const composer = new SectionComposer("Photos");
+  const images: GridImage[] = [];
+  let skipped = 0;
+
+  for (let start = 0; start < photos.length; start += THUMBNAIL_FETCH_CONCURRENCY) {
+    const batch = photos.slice(start, start + THUMBNAIL_FETCH_CONCURRENCY);
+    const thumbnails = await Promise.all(batch.map((photo) => source.loadThumbnail(photo.storagePath)));
+    thumbnails.forEach((bytes, index) => {
+      const info = bytes && readJpegInfo(bytes);
+      if (!bytes || !info) {
+        skipped++;
+        return;
+      }
+      const photo = batch[index];
+      images.push({
+        info,
+        data: Buffer.from(bytes).toString("base64"),
+        caption: [photo.category, photo.caption ?? formatDate(photo.takenAt)].filter(Boolean).join(": "),
+      });
+    });
+  }
+
+  if (images.length > 0) composer.imageGrid(images);
+  if (skipped > 0) {
+    composer.paragraph(`${skipped} photo(s) could not be included (only JPEG thumbnails are embedded).`, 9);
+  }
+  return composer.finish();
+}
+
+function renderDealSummary(deal: ReportDeal, comps: ReportComparable[]): RenderedSection {
+  const composer = new SectionComposer(deal.address);
+
+  composer.heading("Property");
+  composer.keyValues([
+    ["Type", deal.propertyType ?? "-"],
+    ["Phase", deal.phase ?? "-"],
+    ["Square feet", formatNumber(deal.squareFeet)],
+    ["Year built", deal.yearBuilt !== null ? String(deal.yearBuilt) : "-"],
+    ["Bedrooms", formatNumber(deal.bedrooms)],
+    ["Bathrooms", formatNumber(deal.bathrooms, 1)],
+    ["Asking price", formatMoney(deal.askingPrice)],
+    ["Comparables", String(comps.length)],
+  ]);
+
+  composer.heading("After-repair value");
+  composer.keyValues([
+    ["ARV estimate", formatMoney(deal.arvEstimate)],
+    ["Confidence", deal.arvConfidence !== null ? `${deal.arvConfidence}%` : "-"],
+    ["Method", deal.arvMethod ?? "-"],
+    [
+      "Spread to asking",
+      deal.arvEstimate !== null && deal.askingPrice !== null ? formatMoney(deal.arvEstimate - deal.askingPrice) : "-",
+    ],
+  ]);
+  if (deal.arvNotes) composer.paragraph(deal.arvNotes);
+
+  return composer.finish();
+}
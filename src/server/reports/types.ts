@@ -0,0 +1,160 @@
+/**
+ * Report generation types shared by the data source, section renderers and
+ * the `reports.generate` job.
+ */
+
+export type ReportTargetType = "project" | "deal";
+
+export interface ReportTarget {
+  type: ReportTargetType;
+  id: string;
+}
+
+/**
+ * `separate` writes one PDF per target (reused when unchanged);
+ * `combined` writes every target into a single PDF.
+ */
+export type ReportMode = "separate" | "combined";
+
+export interface ReportJobData {
+  projectIds?: string[];
+  /** `property_leads` ids */
+  dealIds?: string[];
+  mode?: ReportMode;
+}
+
+// ============================================================================
+// SOURCE DATA
+// ============================================================================
+
+export interface ReportProject {
+  id: string;
+  name: string;
+  address: string;
+  propertyType: string | null;
+  squareFeet: number | null;
+  yearBuilt: number | null;
+  bedrooms: number | null;
+  bathrooms: number | null;
+  strategy: string | null;
+  holdPeriodMonths: number | null;
+  purchasePrice: number | null;
+  arv: number | null;
+  maxBudget: number | null;
+  totalEstimatedCost: number | null;
+  estimatedDays: number | null;
+  status: string | null;
+}
+
+export interface ReportScopeItem {
+  category: string;
+  itemName: string;
+  location: string | null;
+  quantity: number | null;
+  unitOfMeasure: string | null;
+  priority: string | null;
+  phase: number | null;
+  totalCost: number;
+  included: boolean;
+}
+
+export interface ReportComparable {
+  address: string;
+  salePrice: number;
+  saleDate: string;
+  squareFeet: number | null;
+  bedrooms: number | null;
+  bathrooms: number | null;
+  distanceMiles: number | null;
+  /** Adjusted value for deal comps */
+  adjustedValue: number | null;
+}
+
+export interface ReportPhoto {
+  storagePath: string;
+  caption: string | null;
+  category: string | null;
+  takenAt: string | null;
+}
+
+export interface ProjectReportData {
+  project: ReportProject;
+  scopeItems: ReportScopeItem[];
+  comparables: ReportComparable[];
+  photos: ReportPhoto[];
+}
+
+export interface ReportDeal {
+  id: string;
+  address: string;
+  propertyType: string | null;
+  squareFeet: number | null;
+  yearBuilt: number | null;
+  bedrooms: number | null;
+  bathrooms: number | null;
+  askingPrice: number | null;
+  phase: string | null;
+  arvEstimate: number | null;
+  arvMethod: string | null;
+  arvConfidence: number | null;
+  arvNotes: string | null;
+}
+
+export interface DealReportData {
+  deal: ReportDeal;
+  comps: ReportComparable[];
+}
+
+export interface ReportDataSource {
+  loadProject(id: string): Promise<ProjectReportData | null>;
+  loadDeal(id: string): Promise<DealReportData | null>;
+  /** JPEG thumbnail bytes, or null when unavailable */
+  loadThumbnail(storagePath: string): Promise<Uint8Array | null>;
+}
+
+// ============================================================================
+// RENDERED OUTPUT
+// ============================================================================
+
+export interface RenderedImage {
+  /** Resource name used by the page content, e.g. `Im1` */
+  name: string;
+  width: number;
+  height: number;
+  components: number;
+  /** Base64 JPEG bytes (embedded as-is with DCTDecode) */
+  data: string;
+}
+
+export interface RenderedPage {
+  /** Base64 deflated content stream */
+  content: string;
+  images: RenderedImage[];
+}
+
+/**
+ * A section's pages, cached by content hash. Values go through JSON,
+ * so binary data is base64.
+ */
+export interface RenderedSection {
+  pages: RenderedPage[];
+}
+
+export interface GeneratedReport {
+  targets: ReportTarget[];
+  path: string;
+  /** True when an identical report already existed in storage */
+  reused: boolean;
+  /** Unknown (null) for reused reports */
+  pages: number | null;
+  bytes: number;
+}
+
+export interface ReportGenerationSummary {
+  reports: GeneratedReport[];
+  /** Targets that no longer exist */
+  missing: ReportTarget[];
+  sectionsRendered: number;
+  sectionsCached: number;
+  elapsedMs: number;
+}
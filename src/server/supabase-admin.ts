@@ -0,0 +1,24 @@
+import { createClient, type SupabaseClient } from "@supabase/supabase-js";
+import { SUPABASE_SERVICE_ROLE_KEY, SUPABASE_URL } from "./jobs/config";
+
+/**
+ * Service-role Supabase client for server-side code without a user session
+ * (background jobs, report generation).
+ */
+
+let supabaseAdmin: SupabaseClient | null | undefined;
+
+/**
+ * One service-role client per process (null when credentials are missing).
+ */
+export function getSupabaseAdmin() {
+  if (supabaseAdmin === undefined) {
+    supabaseAdmin =
+      SUPABASE_URL && SUPABASE_SERVICE_ROLE_KEY
+        ? createClient(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, {
+            auth: { persistSession: false, autoRefreshToken: false },
+          })
+        : null;
+  }
+  return supabaseAdmin;
+}
@@ -3,7 +3,7 @@
  * @description TypeScript interfaces for What-If Scenario Comparison system
  */
 
-import type { OptimizableItem, OptimizationResult } from "@/lib/priority-engine/budget-optimizer";
+import type { OptimizableItem, OptimizationResult, OptimizationSolver } from "@/lib/priority-engine/budget-optimizer";
 
 // =============================================================================
 // ENUMS & CONSTANTS
@@ -117,6 +117,40 @@ export interface ScenarioGenerationOptions {
   maxItems?: number;
 }
 
+/**
+ * Options for batched scenario generation across strategies and budgets
+ */
+export interface ScenarioBatchOptions {
+  items: OptimizableItem[];
+  budgets: number[];
+  strategies?: ScenarioStrategy[];
+  respectDependencies?: boolean;
+  maxItems?: number;
+  solver?: OptimizationSolver; // defaults to 'exact', which reads every budget off one curve
+}
+
+/**
+ * One point on a strategy's value-by-budget curve
+ */
+export interface EfficiencyFrontierPoint {
+  budgetAmount: number;
+  totalCost: number;
+  totalValue: number;
+  itemCount: number;
+  marginalValuePerDollar: number; // vs. the previous (lower) budget point
+}
+
+/**
+ * Results from batched scenario generation
+ */
+export interface ScenarioBatchResult {
+  budgets: number[];
+  scenarios: Partial<Record<ScenarioStrategy, ScenarioResult[]>>; // aligned with budgets
+  frontiers: Partial<Record<ScenarioStrategy, EfficiencyFrontierPoint[]>>; // ascending budget
+  comparison: ScenarioComparisonMatrix; // columns keyed `${strategy}@${budget}`
+  errors: Partial<Record<ScenarioStrategy, string>>; // strategies that failed, by message
+}
+
 // =============================================================================
 // COMPARISON INTERFACES
 // =============================================================================
@@ -162,6 +196,22 @@ export interface ScenarioItemComparison {
   impact: 'high' | 'medium' | 'low'; // Impact level if toggled
 }
 
+/**
+ * Item-by-scenario inclusion matrix, indexed by item id
+ */
+export interface ScenarioComparisonMatrix {
+  scenarioKeys: string[];
+  rows: ScenarioComparisonRow[]; // items selected by at least one scenario
+  rowIndex: Map<string, number>; // item id -> row
+}
+
+export interface ScenarioComparisonRow {
+  itemId: string;
+  item?: OptimizableItem;
+  includedIn: boolean[]; // aligned with scenarioKeys
+  inclusionCount: number;
+}
+
 /**
  * Trade-off analysis between scenarios
  */
@@ -0,0 +1,210 @@
+-- ============================================================================
+-- PROJECT LIST, SEARCH, BULK WRITE AND DUPLICATE PATHS
+-- ============================================================================
+-- Supports the batched data-service paths in src/lib/supabase/database.ts:
+--   * keyset pagination of the projects list (updated_at DESC, id DESC)
+--   * substring search through one trigram-indexed search column instead of
+--     a five-column ILIKE OR
+--   * per-project lookups on the child tables (scope items, assessments,
+--     comparables, recommendations)
+--   * duplicate_rehab_project(): copies a project and its children in a
+--     single call
+--
+-- The child tables are not created by the migrations in this repo, so their
+-- indexes are only added when the tables exist.
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ============================================================================
+-- KEYSET PAGINATION
+-- ============================================================================
+
+-- Keyset cursors compare updated_at, so it must never be NULL
+UPDATE rehab_projects
+  SET updated_at = COALESCE(created_at, NOW())
+  WHERE updated_at IS NULL;
+
+ALTER TABLE rehab_projects
+  ALTER COLUMN updated_at SET DEFAULT NOW(),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+-- Matches the list order; RLS adds user_id = auth.uid()
+CREATE INDEX IF NOT EXISTS idx_rehab_projects_user_keyset
+  ON rehab_projects(user_id, updated_at DESC, id DESC)
+  WHERE deleted_at IS NULL;
+
+-- ============================================================================
+-- SEARCH COLUMN
+-- ============================================================================
+
+-- Lower-cased name + address, kept in sync by Postgres
+ALTER TABLE rehab_projects
+  ADD COLUMN IF NOT EXISTS search_text TEXT
+  GENERATED ALWAYS AS (
+    lower(
+      COALESCE(project_name, '') || ' ' ||
+      COALESCE(address_street, '') || ' ' ||
+      COALESCE(address_city, '') || ' ' ||
+      COALESCE(address_state, '') || ' ' ||
+      COALESCE(address_zip, '')
+    )
+  ) STORED;
+
+-- Trigram index serves ILIKE '%term%' on the search column
+CREATE INDEX IF NOT EXISTS idx_rehab_projects_search_trgm
+  ON rehab_projects USING GIN (search_text gin_trgm_ops);
+
+-- The expression tsvector index was never matched by any query; the trigram
+-- index above replaces it
+DROP INDEX IF EXISTS idx_rehab_projects_search;
+
+-- ============================================================================
+-- CHILD TABLE INDEXES
+-- ============================================================================
+
+DO $$
+BEGIN
+  IF to_regclass('public.rehab_scope_items') IS NOT NULL THEN
+    CREATE INDEX IF NOT EXISTS idx_rehab_scope_items_project_phase
+      ON public.rehab_scope_items(project_id, phase);
+  END IF;
+
+  IF to_regclass('public.property_assessments') IS NOT NULL THEN
+    CREATE INDEX IF NOT EXISTS idx_property_assessments_project
+      ON public.property_assessments(project_id);
+  END IF;
+
+  IF to_regclass('public.market_comparables') IS NOT NULL THEN
+    CREATE INDEX IF NOT EXISTS idx_market_comparables_project_sale_date
+      ON public.market_comparables(project_id, sale_date DESC);
+  END IF;
+
+  IF to_regclass('public.rehab_recommendations') IS NOT NULL THEN
+    CREATE INDEX IF NOT EXISTS idx_rehab_recommendations_project_confidence
+      ON public.rehab_recommendations(project_id, confidence_score DESC);
+  END IF;
+END $$;
+
+-- ============================================================================
+-- FUNCTION: duplicate_rehab_project
+-- ============================================================================
+-- Copies a project (as a draft named "<name> (Copy)") with its scope items,
+-- assessments, comparables and recommendations in one transaction.
+-- Columns are discovered at run time, so columns added later are copied too.
+-- Scope item depends_on references are remapped to the copied items.
+-- SECURITY INVOKER: RLS still decides what the caller may read and write.
+
+CREATE OR REPLACE FUNCTION duplicate_rehab_project(source_project_id UUID)
+RETURNS rehab_projects
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+  v_project rehab_projects;
+  v_columns TEXT;
+  v_select TEXT;
+  v_table TEXT;
+  v_id_map JSONB;
+  v_depends_on_type TEXT;
+BEGIN
+  -- Project row: copy every column except identity, timestamps and lifecycle
+  SELECT string_agg(quote_ident(column_name), ', ' ORDER BY ordinal_position)
+    INTO v_columns
+    FROM information_schema.columns
+    WHERE table_schema = 'public'
+      AND table_name = 'rehab_projects'
+      AND is_generated = 'NEVER'
+      AND column_name NOT IN ('id', 'project_name', 'status', 'deleted_at', 'created_at', 'updated_at');
+
+  EXECUTE format(
+    'INSERT INTO rehab_projects (project_name, status, %1$s)
+     SELECT project_name || '' (Copy)'', ''draft'', %1$s
+     FROM rehab_projects WHERE id = $1
+     RETURNING *',
+    v_columns
+  )
+  INTO v_project
+  USING source_project_id;
+
+  IF v_project.id IS NULL THEN
+    RAISE EXCEPTION 'Project % not found', source_project_id USING ERRCODE = 'P0002';
+  END IF;
+
+  -- Scope items get ids up front so depends_on can point at the copies
+  IF to_regclass('public.rehab_scope_items') IS NOT NULL THEN
+    SELECT jsonb_object_agg(id::text, gen_random_uuid()::text)
+      INTO v_id_map
+      FROM rehab_scope_items
+      WHERE project_id = source_project_id;
+
+    SELECT format_type(atttypid, atttypmod)
+      INTO v_depends_on_type
+      FROM pg_attribute
+      WHERE attrelid = 'public.rehab_scope_items'::regclass
+        AND attname = 'depends_on'
+        AND NOT attisdropped;
+
+    SELECT
+      string_agg(quote_ident(column_name), ', ' ORDER BY ordinal_position),
+      string_agg(
+        CASE
+          WHEN column_name = 'depends_on' THEN format(
+            'CASE WHEN depends_on IS NULL THEN NULL ELSE ARRAY(SELECT COALESCE($3 ->> dep, dep) FROM unnest(depends_on::text[]) WITH ORDINALITY AS d(dep, n) ORDER BY n)::%s END',
+            v_depends_on_type
+          )
+          ELSE quote_ident(column_name)
+        END,
+        ', ' ORDER BY ordinal_position
+      )
+      INTO v_columns, v_select
+      FROM information_schema.columns
+      WHERE table_schema = 'public'
+        AND table_name = 'rehab_scope_items'
+        AND is_generated = 'NEVER'
+        AND column_name NOT IN ('id', 'project_id', 'created_at', 'updated_at');
+
+    IF v_id_map IS NOT NULL THEN
+      EXECUTE format(
+        'INSERT INTO rehab_scope_items (id, project_id, %s)
+         SELECT ($3 ->> id::text)::uuid, $1, %s
+         FROM rehab_scope_items WHERE project_id = $2',
+        v_columns,
+        v_select
+      )
+      USING v_project.id, source_project_id, v_id_map;
+    END IF;
+  END IF;
+
+  -- Remaining children: straight copies with fresh ids
+  FOREACH v_table IN ARRAY ARRAY['property_assessments', 'market_comparables', 'rehab_recommendations']
+  LOOP
+    CONTINUE WHEN to_regclass('public.' || v_table) IS NULL;
+
+    SELECT string_agg(quote_ident(column_name), ', ' ORDER BY ordinal_position)
+      INTO v_columns
+      FROM information_schema.columns
+      WHERE table_schema = 'public'
+        AND table_name = v_table
+        AND is_generated = 'NEVER'
+        AND column_name NOT IN ('id', 'project_id', 'created_at', 'updated_at');
+
+    EXECUTE format(
+      'INSERT INTO %1$I (project_id, %2$s) SELECT $1, %2$s FROM %1$I WHERE project_id = $2',
+      v_table,
+      v_columns
+    )
+    USING v_project.id, source_project_id;
+  END LOOP;
+
+  RETURN v_project;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION duplicate_rehab_project(UUID) TO authenticated;
+GRANT EXECUTE ON FUNCTION duplicate_rehab_project(UUID) TO service_role;
+
+-- ============================================================================
+-- END OF MIGRATION
+-- ============================================================================
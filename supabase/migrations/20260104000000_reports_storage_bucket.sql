@@ -0,0 +1,22 @@
+-- ============================================================================
+-- REPORTS STORAGE BUCKET
+-- ============================================================================
+-- Private bucket for PDFs written by the `reports.generate` background job
+-- (src/server/reports). The worker uploads with the service role key; users
+-- get access through signed URLs, so no storage policies are added here.
+--
+-- Layout:
+--   reports/
+--     projects/{projectId}/{contentHash}.pdf
+--     deals/{leadId}/{contentHash}.pdf
+--     batches/{jobId}.pdf
+--
+-- Only the latest {contentHash}.pdf is kept per project or deal; older versions
+-- are removed when a report is regenerated with changed content.
+--
+-- The bucket name can be changed with REPORTS_BUCKET.
+-- ============================================================================
+
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('reports', 'reports', false)
+ON CONFLICT (id) DO NOTHING;